@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Retry, backoff and quota budget for Google API calls.
+Every request goes through one per-process token bucket sized to the Sheets
+per-user quota, so a bulk run slows down instead of getting throttled. When
+a call fails anyway with a throttling or transient error, it is retried with
+exponential backoff and full jitter, and a Retry-After header from the server
+takes precedence over the computed delay.
+
+Retrying is only safe because the wave scripts write with values().batchUpdate
+over explicit ranges computed from a snapshot: re-sending a batch whose
+response was lost writes the same cells again. A run that gives up after
+max_attempts leaves the sheet either fully updated or untouched, and the
+scripts recompute their edits from the sheet, so re-running them resumes
+cleanly. `--local` checks both claims against a copy of a local sheet.
+
+Usage:
+    result = execute(service.spreadsheets().values().get(...))
+    python3 api_retry.py --local /tmp/waves [steps...]   # Replay check
+
+Fault injection against the local backend (see fake_sheets.py):
+    WAVE_SHEETS_LOCAL=/tmp/waves WAVE_SHEETS_FAULTS=429:1,503,timeout python3 wave_maintenance.py sort
+"""
+
+import email.utils
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+SHEETS_REQUESTS_PER_MINUTE = 60        # Per-user read and write request quota
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+# Transport errors from requests and httplib2 worth retrying, by class name so
+# neither has to be imported (the built-in ConnectionError/TimeoutError also are)
+TRANSIENT_ERRORS = {'ConnectionError', 'Timeout', 'ReadTimeout', 'ConnectTimeout',
+                    'ChunkedEncodingError', 'ServerNotFoundError'}
+
+class TokenBucket:
+    """
+    Allows `capacity` requests at once, refilled at `rate` per second.
+    acquire() blocks until a token is free; thread-safe.
+    """
+
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests: int) -> 'TokenBucket':
+        return cls(rate=requests / 60.0, capacity=requests)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, waiting for them if needed; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                wait = (tokens - self.tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+    def drain(self) -> None:
+        """Spend every token, e.g. after the server reported we are over quota."""
+        with self._lock:
+            self._refill()
+            self.tokens = 0.0
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 6
+    base_delay: float = 1.0
+    max_delay: float = 64.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None,
+              rand: Callable[[], float] = random.random) -> float:
+        """Seconds to wait before retry number `attempt` (1-based)."""
+        backoff = rand() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if retry_after is not None:
+            return max(retry_after, backoff)
+        return backoff
+
+DEFAULT_POLICY = RetryPolicy()
+SHEETS_BUCKET = TokenBucket.per_minute(SHEETS_REQUESTS_PER_MINUTE)
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or an HTTP date)."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+def retry_info(error: BaseException) -> Tuple[bool, Optional[int], Optional[float]]:
+    """(retryable, HTTP status, Retry-After seconds) for an exception from an API call."""
+    status = None
+    headers = None
+    resp = getattr(error, 'resp', None)              # googleapiclient HttpError
+    if resp is not None and hasattr(resp, 'status'):
+        status, headers = int(resp.status), resp
+    response = getattr(error, 'response', None)      # requests HTTPError
+    if status is None and response is not None and hasattr(response, 'status_code'):
+        status, headers = int(response.status_code), response.headers
+
+    if status is not None:
+        retry_after = None
+        if headers is not None:
+            retry_after = parse_retry_after(headers.get('retry-after') or headers.get('Retry-After'))
+        return status in RETRY_STATUSES, status, retry_after
+    transient = isinstance(error, (ConnectionError, TimeoutError)) or type(error).__name__ in TRANSIENT_ERRORS
+    return transient, None, None
+
+def log_retry(attempt: int, error: BaseException, delay: float,
+              max_attempts: Optional[int] = None) -> None:
+    """Default on_retry: one line on stderr, so stdout stays clean for script output."""
+    status = retry_info(error)[1]
+    print(f"⚠️  {status or type(error).__name__}: retrying in {delay:.1f}s "
+          f"(attempt {attempt + 1}/{max_attempts or DEFAULT_POLICY.max_attempts})", file=sys.stderr)
+
+def call_with_retry(call: Callable[[], Any], policy: Optional[RetryPolicy] = None,
+                    bucket: Optional[TokenBucket] = SHEETS_BUCKET,
+                    sleep: Callable[[float], None] = time.sleep,
+                    on_retry: Optional[Callable[[int, BaseException, float], None]] = log_retry) -> Any:
+    """
+    Run call(), taking a quota token before each attempt and retrying
+    transient failures. The last error is re-raised once attempts run out.
+    Retries are reported through on_retry (stderr by default; None is quiet).
+    """
+    policy = policy or DEFAULT_POLICY
+    attempt = 1
+    while True:
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            return call()
+        except Exception as error:
+            retryable, status, retry_after = retry_info(error)
+            if not retryable or attempt >= policy.max_attempts:
+                raise
+            if status == 429 and bucket is not None:
+                bucket.drain()
+            delay = policy.delay(attempt, retry_after)
+            if on_retry is log_retry:
+                log_retry(attempt, error, delay, policy.max_attempts)
+            elif on_retry is not None:
+                on_retry(attempt, error, delay)
+            sleep(delay)
+            attempt += 1
+
+def execute(request, policy: Optional[RetryPolicy] = None,
+            bucket: Optional[TokenBucket] = SHEETS_BUCKET) -> Any:
+    """request.execute() with quota budgeting and retries."""
+    return call_with_retry(request.execute, policy, bucket)
+
+def verify_replay(directory: Path, steps: List[str], sheet_name: str = 'Sheet1') -> List[str]:
+    """
+    Run wave_maintenance steps on copies of a local sheet and check that a
+    batchUpdate whose response is lost leaves the same sheet as a clean run:
+    once when a retry re-sends it, and once when every attempt is lost and
+    the steps are re-run from the sheet as written. Returns the mismatches.
+    """
+    import shutil
+    import tempfile
+    import api_retry  # The module wave_sheets uses, also when this file runs as a script
+    from fake_sheets import LocalSheetsService
+    from wave_maintenance import STEPS
+    from wave_sheets import WaveSheet
+
+    def run(target: Path, lost_responses: int = 0) -> LocalSheetsService:
+        service = LocalSheetsService(target)
+        sheet = WaveSheet(sheet_name, service=service)
+        for step in steps:
+            STEPS[step](sheet)
+        # "timeout" applies the write and then loses the response
+        service.book.faults = [('timeout', None, None)] * lost_responses
+        sheet.flush()
+        return service
+
+    # Nothing to wait for on a local sheet
+    saved_policy = api_retry.DEFAULT_POLICY
+    api_retry.DEFAULT_POLICY = RetryPolicy(max_attempts=saved_policy.max_attempts, base_delay=0.0)
+    problems = []
+    try:
+        with tempfile.TemporaryDirectory() as temp:
+            copies = {}
+            for name in ('clean', 'retried', 'resumed'):
+                copies[name] = Path(temp) / name
+                shutil.copytree(directory, copies[name])
+
+            service = run(copies['clean'])
+            if 'batchUpdate' not in service.book.calls:
+                return ["clean: the steps wrote nothing, so there is nothing to replay"]
+            expected = service.book.load(sheet_name)
+
+            service = run(copies['retried'], lost_responses=1)
+            if service.book.calls.count('batchUpdate') != 2:
+                problems.append("retried: the lost batchUpdate was not re-sent")
+            if service.book.load(sheet_name) != expected:
+                problems.append("retried: re-sending the batch changed the result")
+
+            try:
+                run(copies['resumed'], lost_responses=saved_policy.max_attempts)
+                problems.append("resumed: the run did not give up")
+            except TimeoutError:
+                pass
+            if run(copies['resumed']).book.load(sheet_name) != expected:
+                problems.append("resumed: re-running the steps did not converge on the clean result")
+    finally:
+        api_retry.DEFAULT_POLICY = saved_policy
+    return problems
+
+def main():
+    """Check that lost batchUpdate responses replay safely against a local sheet."""
+    import argparse
+    from wave_maintenance import STEPS
+
+    parser = argparse.ArgumentParser(description="Replay check for retried sheet writes")
+    parser.add_argument('--local', metavar='DIR', required=True,
+                        help='Local sheet directory to copy (see fake_sheets.py seed)')
+    parser.add_argument('--sheet', default='Sheet1', help='Sheet (tab) name')
+    parser.add_argument('steps', nargs='*', help=f"wave_maintenance steps to run (default: {' '.join(STEPS)})")
+    args = parser.parse_args()
+    steps = args.steps or list(STEPS)
+    unknown = [step for step in steps if step not in STEPS]
+    if unknown:
+        parser.error(f"unknown step(s): {', '.join(unknown)}")
+
+    print(f"🔍 Replaying {' '.join(steps)} with lost batchUpdate responses...")
+    print("=" * 60)
+    problems = verify_replay(Path(args.local), steps, args.sheet)
+    print("=" * 60)
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        return 1
+    print("✅ Re-sent and resumed writes match a clean run")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
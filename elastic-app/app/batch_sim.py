@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""
+Lockstep battle batches over struct-of-arrays gremlin tables.
+battle_sim.Battle resolves hits one gremlin at a time, as SimpleEffectProcessor
+does on gremlin nodes (receive_damage -> DamagePacket per target). Here a batch
+of copies of one battle shares a GremlinTable: every gremlin stat (hp, armor,
+shields, barriers, damage_cap, poison, burn, ...) is a battles x slots NumPy
+array, and targeting (top, bottom, all, random, weakest, strongest) and
+Damageable.receive_damage (damage cap, barrier, armor, shields and pop,
+pierce, execute thresholds) are array kernels over the whole batch.
+
+BatchBattle advances all copies beat by beat in lockstep: each gear and each
+gremlin slot is one set of masked array operations for every battle, and a
+battle that is decided stops changing. Per battle the rules are battle_sim's,
+so a layout and wave without random targets or drains give exactly Battle's
+result in every row (--check verifies it). Random choices come from a NumPy
+generator, so those battles agree with Battle in distribution only. Summons
+would have to insert gremlins into the slot order, so waves with summoners
+are rejected, as are layouts with complex_<name> effects; battle_sim.py
+handles both.
+
+Usage:
+    python3 batch_sim.py --wave wave_3a --layout-file layout.txt --battles 20000 --seed 7
+    python3 batch_sim.py --wave wave_1e --layout starter_chronometer,starter_red_gen --check
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from battle_sim import (BEATS_PER_TICK, CAP_RESET_MAX, DEFAULT_MAX_TICKS, FORCE_MAX, HERO_HP, MAX_GREMLIN_SLOTS,
+                        Battle, BattleData, BattleResult, Gremlin, layout_grid, load_layout, move_caps,
+                        parse_layout, print_grid, summarise)
+from effect_compiler import (COLOR_INDEXES, DAMAGE_TARGETS, DIRECTION_OFFSETS, DRAIN_ALL, DRAIN_LARGEST,
+                             DRAIN_RANDOM, FORCE_INDEXES, FORCE_NAMES, MOVE_ATTACK, MOVE_DRAIN, MOVE_SUMMON,
+                             OP_ACTIVATE, OP_BURN, OP_COMPLEX, OP_CONSUME, OP_CONSUME_LARGEST, OP_CONSUME_SMALLEST,
+                             OP_DAMAGE, OP_DRAW, OP_EXECUTE, OP_GENERATE, OP_MOMENTARY, OP_PIERCE_DAMAGE,
+                             OP_POISON, OP_POP_DAMAGE, OP_SELF_DESTRUCT, TRIGGERED_MOVE_OPS, Move)
+from wave_difficulty import DATA_PATH
+
+TARGET_INDEX = {name: i for i, name in enumerate(DAMAGE_TARGETS)}
+TOP, ALL, RANDOM, WEAKEST, STRONGEST, BOTTOM = (TARGET_INDEX[name] for name in
+                                                ('top', 'all', 'random', 'weakest', 'strongest', 'bottom'))
+OUTCOMES = ('timeout', 'win', 'loss')
+TIMEOUT, WIN, LOSS = range(len(OUTCOMES))
+NO_CAP = np.iinfo(np.int64).max // 4
+DEFAULT_BATTLES = 10000
+
+def _pick_nth(mask: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Per row, the column of a uniformly chosen True entry; rows need at least one."""
+    counts = mask.sum(axis=1)
+    nth = (rng.random(len(mask)) * counts).astype(np.int64)
+    return (mask.cumsum(axis=1) > nth[:, None]).argmax(axis=1)
+
+class GremlinTable:
+    """Gremlin stats as (battles, slots) arrays: one row per battle, one column per gremlin slot."""
+
+    def __init__(self, gremlins: List[Gremlin], battles: int):
+        def column(values, dtype=np.int64):
+            return np.tile(np.array(values, dtype=dtype).reshape(1, len(gremlins)), (battles, 1))
+        self.battles = battles
+        self.slots = len(gremlins)
+        self.template_ids = [g.template_id for g in gremlins]
+        self.hp = column([g.hp for g in gremlins])
+        self.max_hp = column([g.max_hp for g in gremlins])
+        self.armor = column([g.armor for g in gremlins])
+        self.shields = column([g.shields for g in gremlins])
+        self.barriers = column([g.barriers for g in gremlins])
+        self.damage_cap = column([g.damage_cap for g in gremlins])
+        self.execute_immunity = column([g.execute_immunity for g in gremlins])
+        self.invulnerable = column([g.invulnerable for g in gremlins], bool)
+        self.alive = np.ones((battles, self.slots), dtype=bool)
+        self.poison = np.zeros((battles, self.slots), dtype=np.int64)
+        self.poison_timer = np.full((battles, self.slots), BEATS_PER_TICK, dtype=np.int64)
+        self.burn_until = np.zeros((battles, self.slots), dtype=np.int64)
+
+    # --- Targeting -------------------------------------------------------
+
+    def target(self, target: int, rows: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Mask of the gremlins an effect with this DAMAGE_TARGETS index hits in each of `rows`."""
+        alive = self.alive & rows[:, None]
+        if target == ALL:
+            return alive
+        mask = np.zeros_like(alive)
+        r = np.nonzero(alive.any(axis=1))[0]
+        if not len(r):
+            return mask
+        alive = alive[r]
+        if target == TOP:
+            col = alive.argmax(axis=1)
+        elif target == BOTTOM:
+            col = self.slots - 1 - alive[:, ::-1].argmax(axis=1)
+        elif target == RANDOM:
+            col = _pick_nth(alive, rng)
+        elif target == WEAKEST:
+            col = np.where(alive, self.hp[r], NO_CAP).argmin(axis=1)
+        else:
+            col = np.where(alive, self.hp[r], -NO_CAP).argmax(axis=1)
+        mask[r, col] = True
+        return mask
+
+    # --- Damage kernels --------------------------------------------------
+
+    def receive_damage(self, mask: np.ndarray, amount, pierce: bool = False, pop: bool = False,
+                       poison: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Damageable.receive_damage for every masked gremlin at once: cap, barrier,
+        armor, shields (doubled by pop), then HP. `amount` broadcasts against
+        the table. Returns (HP damage dealt, gremlins defeated).
+        """
+        hit = mask & ~self.invulnerable
+        damage = np.broadcast_to(np.asarray(amount, dtype=np.int64), hit.shape)
+        damage = np.where(self.damage_cap > 0, np.minimum(damage, self.damage_cap), damage)
+        if not pierce:
+            blocked = hit & (self.barriers > 0)
+            self.barriers -= blocked
+            hit &= ~blocked
+            if not poison:
+                damage = damage - np.minimum(self.armor, damage)
+            shielded = hit & (self.shields > 0)
+            lost = np.where(shielded, np.minimum(self.shields, damage * 2 if pop else damage), 0)
+            self.shields -= lost
+            damage = damage - lost
+            if pop:
+                damage = np.where(shielded & (damage > 0), damage * 2, damage)
+        dealt = np.where(hit & (damage > 0), damage, 0)
+        self.hp -= dealt
+        defeated = (dealt > 0) & (self.hp <= 0)
+        self.alive &= ~defeated
+        return dealt, defeated
+
+    def execute(self, mask: np.ndarray, threshold: int) -> np.ndarray:
+        """Damageable.execute on masked gremlins at or below both thresholds; returns those defeated."""
+        executed = (mask & ~self.invulnerable & (self.hp <= self.execute_immunity) & (self.hp <= threshold))
+        self.hp[executed] = 0
+        self.alive &= ~executed
+        return executed
+
+    def apply_poison(self, mask: np.ndarray, stacks: int) -> None:
+        fresh = mask & (self.poison <= 0)
+        self.poison_timer[fresh] = BEATS_PER_TICK
+        self.poison += stacks * mask
+
+    def apply_burn(self, mask: np.ndarray, until_beat: int) -> None:
+        self.burn_until = np.where(mask, np.maximum(self.burn_until, until_beat), self.burn_until)
+
+class BatchBattle:
+    """`battles` copies of one layout against one wave, stepped one beat at a time in lockstep."""
+
+    def __init__(self, data: BattleData, layout: List[Optional[str]], gremlin_ids: List[str], battles: int,
+                 rng: Optional[np.random.Generator] = None, hero_hp: int = HERO_HP):
+        self.data = data
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.battles = battles
+        self.beat = 0
+
+        # Battle validates the layout and builds the grid; gears are indexed in Escapement Order
+        grid = Battle(data, layout, [], hero_hp=hero_hp).grid
+        gears = sorted(grid.values(), key=lambda g: (g.y, g.x))
+        index = {(g.x, g.y): i for i, g in enumerate(gears)}
+        self.card_ids = [g.card_id for g in gears]
+        self.intervals = [g.interval for g in gears]
+        self.effects = [g.effects for g in gears]
+        self.neighbours = [[index.get((g.x + dx, g.y + dy)) for dx, dy in DIRECTION_OFFSETS] for g in gears]
+        self.advancing = [i for i, g in enumerate(gears) if g.interval > 0]
+        for g in gears:
+            if OP_COMPLEX in g.effects[::3]:
+                raise ValueError(f"{g.card_id} has a complex effect; battle_sim.py plays those")
+        shape = (battles, len(gears))
+        self.gear_beats = np.zeros(shape, dtype=np.int64)
+        self.fires = np.zeros(shape, dtype=np.int64)
+        self.removed = np.zeros(shape, dtype=bool)
+        self.firing = np.zeros(shape, dtype=bool)
+
+        self.forces = np.zeros((battles, len(FORCE_NAMES)), dtype=np.int64)
+        self.force_max = np.full((battles, len(FORCE_NAMES)), FORCE_MAX, dtype=np.int64)
+        self.hero_hp = np.full(battles, hero_hp, dtype=np.int64)
+        self.damage_dealt = np.zeros(battles, dtype=np.int64)
+        self.damage_taken = np.zeros(battles, dtype=np.int64)
+        self.defeated = np.zeros(battles, dtype=np.int64)
+        self.cards_drawn = np.zeros(battles, dtype=np.int64)
+        self.forces_generated = np.zeros(battles, dtype=np.int64)
+        self.outcome = np.full(battles, TIMEOUT, dtype=np.int8)
+        self.end_beat = np.zeros(battles, dtype=np.int64)
+        self.running = np.ones(battles, dtype=bool)
+
+        gremlins = []
+        for template_id in [g for g in gremlin_ids if g in data.mobs][:MAX_GREMLIN_SLOTS]:
+            gremlin = Gremlin(template_id, data.mobs[template_id], data.mob_moves[template_id])
+            if any(move[0] == MOVE_SUMMON for move in gremlin.moves + gremlin.background):
+                raise ValueError(f"{template_id} summons; batch battles keep a fixed slot order")
+            gremlins.append(gremlin)
+        self.table = GremlinTable(gremlins, battles)
+        self.moves: List[Tuple[Move, ...]] = [g.moves for g in gremlins]
+        self.background_caps = [self._cap_row(move_caps(move) for move in g.background) for g in gremlins]
+        self.move_caps = [[self._cap_row([move_caps(move)]) for move in g.moves] for g in gremlins]
+        self.move_index = np.zeros((battles, len(gremlins)), dtype=np.int64)
+        self.beats_left = np.zeros((battles, len(gremlins)), dtype=np.int64)
+        everyone = np.ones(battles, dtype=bool)
+        for s in range(len(gremlins)):
+            self.apply_caps(everyone, self.background_caps[s])
+            if self.moves[s]:
+                self.load_move(s, 0, everyone)
+        self._decide()
+
+    @staticmethod
+    def _cap_row(caps) -> np.ndarray:
+        row = np.full(len(FORCE_NAMES), NO_CAP, dtype=np.int64)
+        for cap in caps:
+            for force, value in cap.items():
+                row[force] = min(row[force], value)
+        return row
+
+    # --- Beat loop -------------------------------------------------------
+
+    def run(self, max_ticks: int = DEFAULT_MAX_TICKS) -> 'BatchBattle':
+        max_beats = max_ticks * BEATS_PER_TICK
+        while self.beat < max_beats and self.running.any():
+            self.step()
+        self.end_beat[self.running] = self.beat
+        return self
+
+    def step(self) -> None:
+        self.beat += 1
+        running = self.running
+        for g in self.advancing:
+            active = running & ~self.removed[:, g]
+            self.gear_beats[:, g] += active
+            ready = active & (self.gear_beats[:, g] >= self.intervals[g])
+            if ready.any():
+                ready = self.can_satisfy(self.effects[g], ready)
+                if ready.any():
+                    self.fire(g, ready)
+        table = self.table
+        for s in range(table.slots):
+            rows = running & table.alive[:, s]
+            if not rows.any():
+                continue
+            poisoned = rows & (table.poison[:, s] > 0)
+            if poisoned.any():
+                table.poison_timer[:, s] -= poisoned
+                ticking = poisoned & (table.poison_timer[:, s] <= 0)
+                if ticking.any():
+                    mask = np.zeros_like(table.alive)
+                    mask[:, s] = ticking
+                    self._hit(table.receive_damage(mask, table.poison[:, s:s + 1], pierce=True, poison=True))
+                    table.poison[:, s] -= ticking
+                    table.poison_timer[ticking, s] = BEATS_PER_TICK
+                    rows &= table.alive[:, s]
+            counting = rows & (self.beats_left[:, s] > 0)
+            if counting.any():
+                self.beats_left[:, s] -= counting
+                done = counting & (self.beats_left[:, s] == 0)
+                if done.any():
+                    self.complete_move(s, done)
+        self._decide()
+
+    def _decide(self) -> None:
+        loss = self.running & (self.hero_hp <= 0)
+        win = self.running & ~loss & ~self.table.alive.any(axis=1)
+        self.outcome[loss] = LOSS
+        self.outcome[win] = WIN
+        decided = loss | win
+        self.end_beat[decided] = self.beat
+        self.running &= ~decided
+
+    # --- Gears -----------------------------------------------------------
+
+    def can_satisfy(self, code: Tuple[float, ...], rows: np.ndarray) -> np.ndarray:
+        ok = rows.copy()
+        forces = self.forces
+        it = iter(code)
+        for op, operand, value in zip(it, it, it):
+            if op == OP_CONSUME:
+                ok &= forces[:, operand] >= int(value)
+            elif op == OP_CONSUME_LARGEST:
+                ok &= forces[:, COLOR_INDEXES].max(axis=1) >= value
+            elif op == OP_CONSUME_SMALLEST:
+                colors = forces[:, COLOR_INDEXES]
+                positive = colors > 0
+                ok &= positive.any(axis=1) & (np.where(positive, colors, NO_CAP).min(axis=1) >= value)
+        return ok
+
+    def fire(self, g: int, rows: np.ndarray) -> None:
+        self.firing[:, g] |= rows
+        self.fires[:, g] += rows
+        self.apply_effects(self.effects[g], g, rows)
+        self.firing[:, g] &= ~rows
+        self.gear_beats[rows, g] = 0
+
+    def trigger(self, g: int, rows: np.ndarray) -> np.ndarray:
+        """Mainplate.trigger_card_activation in the given rows; returns the rows where gear g fired."""
+        if self.intervals[g] <= 0 or not self.effects[g]:
+            return np.zeros_like(rows)
+        rows = self.can_satisfy(self.effects[g], rows & ~self.removed[:, g] & ~self.firing[:, g])
+        if rows.any():
+            self.fire(g, rows)
+        return rows
+
+    def apply_effects(self, code: Tuple[float, ...], g: int, rows: np.ndarray) -> None:
+        forces = self.forces
+        table = self.table
+        it = iter(code)
+        for op, operand, value in zip(it, it, it):
+            if op == OP_GENERATE:
+                before = forces[:, operand].copy()
+                forces[:, operand] = np.where(rows, np.minimum(self.force_max[:, operand],
+                                                               forces[:, operand] + int(value)), forces[:, operand])
+                self.forces_generated += np.maximum(0, forces[:, operand] - before)
+            elif op == OP_CONSUME:
+                forces[:, operand] -= int(value) * (rows & (forces[:, operand] >= int(value)))
+            elif op == OP_DAMAGE or op == OP_PIERCE_DAMAGE or op == OP_POP_DAMAGE:
+                mask = table.target(operand, rows, self.rng)
+                self._hit(table.receive_damage(mask, int(value), op == OP_PIERCE_DAMAGE, op == OP_POP_DAMAGE))
+            elif op == OP_POISON:
+                table.apply_poison(table.target(ALL if operand else TOP, rows, self.rng), int(value))
+            elif op == OP_EXECUTE:
+                executed = table.execute(table.target(ALL if operand else TOP, rows, self.rng), int(value))
+                self._defeat(executed)
+            elif op == OP_BURN:
+                table.apply_burn(table.target(ALL if operand else TOP, rows, self.rng),
+                                 self.beat + int(value) * BEATS_PER_TICK)
+            elif op == OP_CONSUME_LARGEST:
+                colors = forces[:, COLOR_INDEXES]
+                self._consume_pool(rows, colors.argmax(axis=1), value)
+            elif op == OP_CONSUME_SMALLEST:
+                colors = forces[:, COLOR_INDEXES]
+                positive = colors > 0
+                chosen = np.where(positive, colors, NO_CAP).argmin(axis=1)
+                self._consume_pool(rows & positive.any(axis=1), chosen, value)
+            elif op == OP_ACTIVATE:
+                neighbour = self.neighbours[g][operand]
+                if neighbour is not None:
+                    chained = rows
+                    for _ in range(int(value)):
+                        chained = self.trigger(neighbour, chained)
+                        if not chained.any():
+                            break
+            elif op == OP_DRAW:
+                self.cards_drawn += int(value) * rows
+            elif op == OP_SELF_DESTRUCT or (op == OP_MOMENTARY and value > 0):
+                self.removed[:, g] |= rows
+
+    def _consume_pool(self, rows: np.ndarray, chosen: np.ndarray, amount: float) -> None:
+        """Pay `amount` from the chosen colour (a COLOR_INDEXES position) in rows that can afford it."""
+        columns = np.asarray(COLOR_INDEXES)[chosen]
+        r = np.nonzero(rows & (self.forces[np.arange(self.battles), columns] >= amount))[0]
+        self.forces[r, columns[r]] -= int(amount)
+
+    def _hit(self, hit: Tuple[np.ndarray, np.ndarray]) -> None:
+        dealt, defeated = hit
+        self.damage_dealt += dealt.sum(axis=1)
+        self._defeat(defeated)
+
+    def _defeat(self, defeated: np.ndarray) -> None:
+        rows = defeated.any(axis=1)
+        if rows.any():
+            self.defeated += defeated.sum(axis=1)
+            self.recalculate_caps(rows)
+
+    # --- Gremlins --------------------------------------------------------
+
+    def load_move(self, s: int, index: int, rows: np.ndarray) -> None:
+        move = self.moves[s][index]
+        self.move_index[rows, s] = index
+        self.beats_left[rows, s] = move[3] * BEATS_PER_TICK
+        if move[0] not in TRIGGERED_MOVE_OPS:
+            self.apply_caps(rows, self.move_caps[s][index])
+
+    def complete_move(self, s: int, rows: np.ndarray) -> None:
+        moves = self.moves[s]
+        current = self.move_index[:, s].copy()
+        for index, move in enumerate(moves):
+            done = rows & (current == index)
+            if not done.any():
+                continue
+            if move[0] in TRIGGERED_MOVE_OPS:
+                self.trigger_move(move, done)
+            else:
+                self.recalculate_caps(done)
+            self.load_move(s, (index + 1) % len(moves), done & self.table.alive[:, s])
+
+    def trigger_move(self, move: Move, rows: np.ndarray) -> None:
+        op, operand, value, _ = move
+        forces = self.forces
+        if op == MOVE_ATTACK:
+            self.hero_hp = np.where(rows, np.maximum(0, self.hero_hp - value), self.hero_hp)
+            self.damage_taken += value * rows
+        elif op == MOVE_DRAIN:
+            drained = np.zeros_like(forces, dtype=bool)
+            if operand == DRAIN_ALL:
+                drained[:, FORCE_INDEXES] = rows[:, None]
+            elif operand == DRAIN_LARGEST or operand == DRAIN_RANDOM:
+                pools = forces[:, FORCE_INDEXES]
+                if operand == DRAIN_LARGEST:
+                    r = np.nonzero(rows)[0]
+                    chosen = pools[r].argmax(axis=1)
+                else:
+                    r = np.nonzero(rows & (pools > 0).any(axis=1))[0]
+                    chosen = _pick_nth(pools[r] > 0, self.rng)
+                drained[r, np.asarray(FORCE_INDEXES)[chosen]] = True
+            else:
+                drained[:, operand] = rows
+            forces[:] = np.where(drained, np.maximum(0, forces - value), forces)
+
+    # --- Force caps ------------------------------------------------------
+
+    def apply_caps(self, rows: np.ndarray, caps: np.ndarray) -> None:
+        capped = rows[:, None] & (caps < NO_CAP)
+        np.minimum(self.force_max, caps, out=self.force_max, where=capped)
+        np.minimum(self.forces, caps, out=self.forces, where=capped)
+
+    def recalculate_caps(self, rows: np.ndarray) -> None:
+        self.force_max[np.ix_(rows, np.asarray(FORCE_INDEXES))] = CAP_RESET_MAX
+        for s in range(self.table.slots):
+            alive = rows & self.table.alive[:, s]
+            if not alive.any():
+                continue
+            self.apply_caps(alive, self.background_caps[s])
+            for index, caps in enumerate(self.move_caps[s]):
+                self.apply_caps(alive & (self.move_index[:, s] == index), caps)
+
+    # --- Results ---------------------------------------------------------
+
+    def results(self) -> List[BattleResult]:
+        """One battle_sim.BattleResult per row."""
+        results = []
+        for row in range(self.battles):
+            fires: Dict[str, int] = {}
+            for g, card_id in enumerate(self.card_ids):
+                fires[card_id] = fires.get(card_id, 0) + int(self.fires[row, g])
+            results.append(BattleResult(OUTCOMES[self.outcome[row]], int(self.end_beat[row]),
+                                        int(self.hero_hp[row]), int(self.damage_dealt[row]),
+                                        int(self.damage_taken[row]), int(self.defeated[row]), 0,
+                                        int(self.cards_drawn[row]), fires,
+                                        forces_generated=int(self.forces_generated[row])))
+        return results
+
+    def summary(self) -> Dict[str, float]:
+        """battle_sim.summarise() computed over the arrays."""
+        return {
+            'battles': self.battles,
+            'win_rate': float(np.mean(self.outcome == WIN)),
+            'loss_rate': float(np.mean(self.outcome == LOSS)),
+            'timeout_rate': float(np.mean(self.outcome == TIMEOUT)),
+            'mean_ticks': float(np.mean(self.end_beat)) / BEATS_PER_TICK,
+            'mean_hero_hp': float(np.mean(self.hero_hp)),
+            'mean_damage_dealt': float(np.mean(self.damage_dealt)),
+        }
+
+def is_deterministic(data: BattleData, layout: List[Optional[str]], gremlin_ids: List[str]) -> bool:
+    """True when neither the gears nor the gremlins make a random choice."""
+    for card_id in filter(None, layout):
+        code = data.card_effects[card_id]
+        for i in range(0, len(code), 3):
+            if code[i] in (OP_DAMAGE, OP_PIERCE_DAMAGE, OP_POP_DAMAGE) and code[i + 1] == RANDOM:
+                return False
+    for template_id in gremlin_ids:
+        cycled, background = data.mob_moves.get(template_id, ((), ()))
+        if any(move[0] == MOVE_DRAIN and move[1] == DRAIN_RANDOM for move in cycled + background):
+            return False
+    return True
+
+def main():
+    """Run a layout against a wave as one lockstep batch and report outcomes and throughput."""
+    import argparse
+    import random
+
+    parser = argparse.ArgumentParser(description="Lockstep batch battles over struct-of-arrays gremlin tables")
+    parser.add_argument('--wave', required=True, help='wave_id from wave_data.json')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--layout', help='Comma-separated card ids in Escapement Order (- for empty)')
+    group.add_argument('--layout-file', help='Layout file, one mainplate row per line')
+    parser.add_argument('--battles', type=int, default=DEFAULT_BATTLES,
+                        help=f'Battles in the batch (default: {DEFAULT_BATTLES})')
+    parser.add_argument('--seed', type=int, help='Random seed')
+    parser.add_argument('--max-ticks', type=int, default=DEFAULT_MAX_TICKS,
+                        help=f'Ticks before a battle times out (default: {DEFAULT_MAX_TICKS})')
+    parser.add_argument('--hero-hp', type=int, default=HERO_HP, help=f'Hero HP (default: {HERO_HP})')
+    parser.add_argument('--check', action='store_true',
+                        help='Compare against battle_sim (exactly, when nothing is random)')
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with the exported JSON files')
+    args = parser.parse_args()
+
+    data = BattleData(Path(args.data))
+    layout = load_layout(Path(args.layout_file)) if args.layout_file else parse_layout(args.layout)
+    try:
+        gremlin_ids = data.wave_gremlins(args.wave)
+        layout_grid(layout)
+        start = time.perf_counter()
+        batch = BatchBattle(data, layout, gremlin_ids, args.battles, np.random.default_rng(args.seed),
+                            args.hero_hp)
+    except (KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"🔍 {args.wave}: {', '.join(gremlin_ids)}")
+    print_grid(layout)
+    batch.run(args.max_ticks)
+    elapsed = time.perf_counter() - start
+    summary = batch.summary()
+
+    print("\n" + "=" * 60)
+    print(f"📊 {args.battles} battles in {elapsed:.2f}s ({args.battles / max(elapsed, 1e-9):,.0f}/s)")
+    print("=" * 60)
+    print(f"  Win:      {summary['win_rate']:.1%}")
+    print(f"  Loss:     {summary['loss_rate']:.1%}")
+    print(f"  Timeout:  {summary['timeout_rate']:.1%}")
+    print(f"  Mean length:       {summary['mean_ticks']:.1f} ticks")
+    print(f"  Mean hero HP left: {summary['mean_hero_hp']:.1f}")
+    print(f"  Mean damage dealt: {summary['mean_damage_dealt']:.1f}")
+
+    if args.check:
+        scalar_start = time.perf_counter()
+        rng = random.Random(args.seed)
+        expected = [Battle(data, layout, gremlin_ids, rng, args.hero_hp).run_events(args.max_ticks)
+                    for _ in range(args.battles)]
+        scalar = time.perf_counter() - scalar_start
+        print(f"\n📊 battle_sim {scalar:.2f}s, batch {elapsed:.2f}s ({scalar / max(elapsed, 1e-9):.1f}x)")
+        if is_deterministic(data, layout, gremlin_ids):
+            mismatches = sum(a != b for a, b in zip(batch.results(), expected))
+            if mismatches:
+                print(f"❌ {mismatches} of {args.battles} battles differ from battle_sim")
+                return 1
+            print(f"✅ All {args.battles} battles identical to battle_sim")
+        else:
+            print("⚠️  Random targets or drains: compare the summaries")
+            for key, value in summarise(expected).items():
+                print(f"  {key:<18} battle_sim {value:10.3f}   batch {summary[key]:10.3f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
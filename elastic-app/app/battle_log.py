@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Binary battle event log and replayer.
+battle_sim.Battle can record a battle to a compact append-only log, and the
+replayer rebuilds the state at any beat by seeking to the nearest snapshot
+and applying the deltas after it. Two logs of the same battle (event vs
+per-beat simulation, or the game vs the simulator) are diffed beat by beat.
+
+Format (little-endian, so GDScript's FileAccess.store_32/16/8 write it as is):
+
+    header   16 bytes  "TBLG", u16 version, u16 record size (12),
+                       u32 snapshot interval in beats, u32 beats per tick
+    record   12 bytes  u32 beat, u16 entity, u8 kind, u8 field, i32 value
+
+Entity 0 is the hero; gears and gremlins get the next id when they first
+appear. Kinds:
+
+    SET       field of entity is now value (see HERO/GEAR/GREMLIN_FIELDS)
+    PLACE     gear entity placed in slot field (y * 4 + x); value: symbol
+    SPAWN     gremlin entity spawned in slot field; value: symbol
+    DEFEAT    gremlin entity left the battle
+    SYMBOL    symbol number entity is the UTF-8 name in the next value bytes,
+              padded with zeros to a whole number of records
+    SNAPSHOT  the next value records are SETs with the full state at this beat
+    END       the battle ended; value: outcome (OUTCOMES index)
+
+Only what a player can see is logged: forces and their maxima, hero HP, the
+damage/draw counters, gear fires, removal and interval, and gremlin HP,
+armor, shields, barriers, poison, burn and current move. A gear's progress
+and a move's countdown change every beat, so they are left out and a log
+looks the same whether the battle stepped every beat or jumped between
+events. The recorder compares that state with the previous one after every
+beat Battle processes and writes only what changed, plus a SNAPSHOT every
+snapshot interval.
+
+Usage:
+    python3 battle_log.py record --wave wave_1e --layout-file layout.txt --seed 7 -o battle.tblog
+    python3 battle_log.py record --wave wave_6d --layout-file layout.txt --seed 7 --check
+    python3 battle_log.py show battle.tblog --from 300 --to 600
+    python3 battle_log.py state battle.tblog --beat 450
+    python3 battle_log.py diff game.tblog battle.tblog
+"""
+
+import bisect
+import io
+import random
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from battle_sim import (BEATS_PER_TICK, DEFAULT_MAX_TICKS, GRID_WIDTH, Battle, BattleData, load_layout,
+                        parse_layout, print_grid)
+from effect_compiler import FORCE_NAMES
+from wave_difficulty import DATA_PATH
+
+MAGIC = b'TBLG'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+RECORD = struct.Struct('<IHBBi')
+DEFAULT_SNAPSHOT_INTERVAL = 100          # Beats
+MAX_DIFF_LINES = 20
+
+KIND_SET, KIND_PLACE, KIND_SPAWN, KIND_DEFEAT, KIND_SYMBOL, KIND_SNAPSHOT, KIND_END = range(7)
+KIND_NAMES = ('SET', 'PLACE', 'SPAWN', 'DEFEAT', 'SYMBOL', 'SNAPSHOT', 'END')
+OUTCOMES = ('timeout', 'win', 'loss')
+HERO = 0
+
+HERO_FIELDS = (tuple(FORCE_NAMES) + tuple(f'{name}_max' for name in FORCE_NAMES)
+               + ('hero_hp', 'damage_dealt', 'damage_taken', 'cards_drawn'))
+GEAR_FIELDS = ('fires', 'removed', 'interval')
+GREMLIN_FIELDS = ('hp', 'armor', 'shields', 'barriers', 'poison', 'burn_until', 'move_index')
+
+# (entity, kind, field, value) with the beat kept alongside
+Record = Tuple[int, int, int, int, int]
+
+class LogFormatError(ValueError):
+    """A file that is not a battle log this version can read."""
+
+def hero_state(battle: Battle) -> Tuple[int, ...]:
+    result = battle.result
+    return (tuple(battle.forces) + tuple(battle.force_max)
+            + (battle.hero_hp, result.damage_dealt, result.damage_taken, result.cards_drawn))
+
+def gear_state(gear) -> Tuple[int, ...]:
+    return gear.fires, int(gear.removed), gear.interval
+
+def gremlin_state(gremlin) -> Tuple[int, ...]:
+    return (gremlin.hp, gremlin.armor, gremlin.shields, gremlin.barriers, gremlin.poison, gremlin.burn_until,
+            gremlin.move_index)
+
+class BattleRecorder:
+    """Writes a battle's state changes to a log; pass it as Battle(recorder=...)."""
+
+    def __init__(self, stream: BinaryIO, snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL):
+        self.stream = stream
+        self.snapshot_interval = snapshot_interval
+        self.next_snapshot = 0
+        self.symbols: Dict[str, int] = {}
+        self.ids: Dict[object, int] = {}        # Gear or Gremlin -> entity; keeps them alive so ids stay unique
+        self.gears: List[Tuple[int, object]] = []
+        self.gremlins: List[Tuple[int, object]] = []
+        self.state: Dict[int, Tuple[int, ...]] = {}
+        stream.write(HEADER.pack(MAGIC, VERSION, RECORD.size, snapshot_interval, BEATS_PER_TICK))
+
+    def _write(self, beat: int, entity: int, kind: int, field_id: int, value: int) -> None:
+        self.stream.write(RECORD.pack(beat, entity, kind, field_id, value))
+
+    def _symbol(self, beat: int, name: str) -> int:
+        if name not in self.symbols:
+            index = self.symbols[name] = len(self.symbols)
+            raw = name.encode('utf-8')
+            self._write(beat, index, KIND_SYMBOL, 0, len(raw))
+            self.stream.write(raw + b'\0' * (-len(raw) % RECORD.size))
+        return self.symbols[name]
+
+    def _entity(self, obj) -> Tuple[int, bool]:
+        if obj in self.ids:
+            return self.ids[obj], False
+        entity = self.ids[obj] = len(self.ids) + 1
+        return entity, True
+
+    def _set(self, beat: int, entity: int, values: Tuple[int, ...]) -> None:
+        old = self.state.get(entity)
+        for field_id, value in enumerate(values):
+            if old is None or old[field_id] != value:
+                self._write(beat, entity, KIND_SET, field_id, int(value))
+        self.state[entity] = values
+
+    def sync(self, battle: Battle) -> None:
+        """Log what changed since the last call, at the battle's current beat."""
+        beat = battle.beat
+        for gear in sorted(battle.grid.values(), key=lambda g: (g.y, g.x)):
+            entity, new = self._entity(gear)
+            if new:
+                symbol = self._symbol(beat, gear.card_id)
+                self._write(beat, entity, KIND_PLACE, gear.y * GRID_WIDTH + gear.x, symbol)
+                self.gears.append((entity, gear))
+        for slot, gremlin in enumerate(battle.gremlins):
+            entity, new = self._entity(gremlin)
+            if new:
+                symbol = self._symbol(beat, gremlin.template_id)
+                self._write(beat, entity, KIND_SPAWN, slot, symbol)
+                self.gremlins.append((entity, gremlin))
+
+        self._set(beat, HERO, hero_state(battle))
+        for entity, gear in self.gears:
+            self._set(beat, entity, gear_state(gear))
+        alive = set(battle.gremlins)
+        remaining = []
+        for entity, gremlin in self.gremlins:
+            self._set(beat, entity, gremlin_state(gremlin))
+            if gremlin in alive:
+                remaining.append((entity, gremlin))
+            else:
+                self._write(beat, entity, KIND_DEFEAT, 0, 0)
+                del self.state[entity]
+        self.gremlins = remaining
+
+        if beat >= self.next_snapshot:
+            self.snapshot(beat)
+
+    def snapshot(self, beat: int) -> None:
+        count = sum(len(values) for values in self.state.values())
+        self._write(beat, HERO, KIND_SNAPSHOT, 0, count)
+        for entity in sorted(self.state):
+            for field_id, value in enumerate(self.state[entity]):
+                self._write(beat, entity, KIND_SET, field_id, int(value))
+        self.next_snapshot = beat - beat % self.snapshot_interval + self.snapshot_interval
+
+    def end(self, battle: Battle, outcome: str) -> None:
+        self.sync(battle)
+        self._write(battle.beat, HERO, KIND_END, 0, OUTCOMES.index(outcome))
+        self.stream.flush()
+
+@dataclass
+class ReplayState:
+    """Everything the log says about one beat."""
+    beat: int
+    values: Dict[int, Dict[str, int]] = field(default_factory=dict)     # entity -> field -> value
+    outcome: Optional[str] = None
+
+class Replay:
+    """A parsed log with its snapshot index, for rebuilding the state at any beat."""
+
+    def __init__(self, raw: bytes):
+        if len(raw) < HEADER.size:
+            raise LogFormatError("File is too short for a battle log header")
+        magic, version, record_size, self.snapshot_interval, self.beats_per_tick = HEADER.unpack_from(raw)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise LogFormatError(f"Not a version {VERSION} battle log (magic {magic!r}, version {version})")
+        self.records: List[Record] = []
+        self.symbols: List[str] = []
+        self.entities: Dict[int, Tuple[str, str, int]] = {HERO: ('hero', 'hero', 0)}   # kind, name, slot
+        self.snapshots: List[Tuple[int, int]] = []                                      # (beat, record index)
+        offset = HEADER.size
+        while offset + RECORD.size <= len(raw):
+            beat, entity, kind, field_id, value = RECORD.unpack_from(raw, offset)
+            offset += RECORD.size
+            if kind == KIND_SYMBOL:
+                if offset + value > len(raw):
+                    raise LogFormatError(f"Truncated symbol at byte {offset}")
+                self.symbols.append(raw[offset:offset + value].decode('utf-8'))
+                offset += value + (-value % RECORD.size)
+                continue
+            if kind == KIND_PLACE:
+                self.entities[entity] = ('gear', self.symbols[value], field_id)
+            elif kind == KIND_SPAWN:
+                self.entities[entity] = ('gremlin', self.symbols[value], field_id)
+            elif kind == KIND_SNAPSHOT:
+                self.snapshots.append((beat, len(self.records)))
+            self.records.append((beat, entity, kind, field_id, value))
+        if offset != len(raw):
+            raise LogFormatError(f"Truncated record at byte {offset}")
+        self._snapshot_beats = [beat for beat, _ in self.snapshots]
+
+    @classmethod
+    def load(cls, path: Path) -> 'Replay':
+        return cls(Path(path).read_bytes())
+
+    @property
+    def last_beat(self) -> int:
+        return self.records[-1][0] if self.records else 0
+
+    def field_name(self, entity: int, field_id: int) -> str:
+        kind = self.entities.get(entity, ('?',))[0]
+        names = HERO_FIELDS if kind == 'hero' else GEAR_FIELDS if kind == 'gear' else GREMLIN_FIELDS
+        return names[field_id] if field_id < len(names) else f'field_{field_id}'
+
+    def state_at(self, beat: int) -> ReplayState:
+        """The state after `beat`: the last snapshot at or before it, then the deltas up to it."""
+        state = ReplayState(beat)
+        start = 0
+        i = bisect.bisect_right(self._snapshot_beats, beat) - 1
+        if i >= 0:
+            start = self.snapshots[i][1]
+        records = self.records
+        for index in range(start, len(records)):
+            record_beat, entity, kind, field_id, value = records[index]
+            if record_beat > beat:
+                break
+            if kind == KIND_SNAPSHOT:
+                state.values = {}
+            elif kind == KIND_SET:
+                state.values.setdefault(entity, {})[self.field_name(entity, field_id)] = value
+            elif kind == KIND_DEFEAT:
+                state.values.pop(entity, None)
+            elif kind == KIND_END:
+                state.outcome = OUTCOMES[value] if value < len(OUTCOMES) else str(value)
+        return state
+
+    def deltas(self) -> List[Tuple[int, int, str, str, int]]:
+        """The log without snapshots, with names instead of symbol numbers, for diffing."""
+        rows = []
+        in_snapshot = 0
+        for beat, entity, kind, field_id, value in self.records:
+            if kind == KIND_SNAPSHOT:
+                in_snapshot = value
+                continue
+            if in_snapshot:
+                in_snapshot -= 1
+                continue
+            if kind in (KIND_PLACE, KIND_SPAWN):
+                rows.append((beat, entity, KIND_NAMES[kind], self.entities[entity][1], field_id))
+            elif kind == KIND_SET:
+                rows.append((beat, entity, KIND_NAMES[kind], self.field_name(entity, field_id), value))
+            else:
+                rows.append((beat, entity, KIND_NAMES[kind], '', value))
+        return rows
+
+    def describe(self, record: Record) -> str:
+        beat, entity, kind, field_id, value = record
+        kind_name, name, slot = self.entities.get(entity, ('?', '?', 0))
+        who = 'hero' if entity == HERO else f"#{entity} {name}"
+        if kind == KIND_SET:
+            return f"[beat {beat:5d}] {who}: {self.field_name(entity, field_id)} = {value}"
+        if kind == KIND_PLACE:
+            return f"[beat {beat:5d}] {who} placed at ({field_id % GRID_WIDTH},{field_id // GRID_WIDTH})"
+        if kind == KIND_SPAWN:
+            return f"[beat {beat:5d}] {who} spawned in slot {field_id}"
+        if kind == KIND_END:
+            return f"[beat {beat:5d}] battle ends: {OUTCOMES[value] if value < len(OUTCOMES) else value}"
+        return f"[beat {beat:5d}] {who}: {KIND_NAMES[kind].lower()}"
+
+def diff(first: Replay, second: Replay) -> Optional[Tuple[int, List[str]]]:
+    """The first beat where the logs disagree and what differs there, or None if they match."""
+    a, b = first.deltas(), second.deltas()
+    for i in range(max(len(a), len(b))):
+        left = a[i] if i < len(a) else None
+        right = b[i] if i < len(b) else None
+        if left != right:
+            beat = min(row[0] for row in (left, right) if row is not None)
+            at_a = [row for row in a if row[0] == beat]
+            at_b = [row for row in b if row[0] == beat]
+            lines = ([f"  - {' '.join(map(str, row))}" for row in at_a if row not in at_b]
+                     + [f"  + {' '.join(map(str, row))}" for row in at_b if row not in at_a])
+            if len(lines) > MAX_DIFF_LINES:
+                lines = lines[:MAX_DIFF_LINES] + [f"  ... {len(lines) - MAX_DIFF_LINES} more"]
+            return beat, lines
+    return None
+
+def record_battle(data: BattleData, layout: List[Optional[str]], wave_id: str, seed: int, stream: BinaryIO,
+                  max_ticks: int = DEFAULT_MAX_TICKS, per_beat: bool = False,
+                  snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL) -> str:
+    """Play one battle with a recorder attached; returns the outcome."""
+    recorder = BattleRecorder(stream, snapshot_interval)
+    battle = Battle(data, layout, data.wave_gremlins(wave_id), random.Random(seed), recorder=recorder)
+    result = battle.run(max_ticks) if per_beat else battle.run_events(max_ticks)
+    return result.outcome
+
+def print_state(replay: Replay, state: ReplayState) -> None:
+    hero = state.values.get(HERO, {})
+    forces = "  ".join(f"{name} {hero.get(name, 0)}/{hero.get(f'{name}_max', 0)}" for name in FORCE_NAMES
+                       if hero.get(name, 0))
+    print(f"📋 Beat {state.beat} (tick {state.beat / replay.beats_per_tick:.1f})"
+          + (f", battle over: {state.outcome}" if state.outcome else ""))
+    print(f"  Hero HP {hero.get('hero_hp', 0)}, dealt {hero.get('damage_dealt', 0)}, "
+          f"taken {hero.get('damage_taken', 0)}, drawn {hero.get('cards_drawn', 0)}")
+    print(f"  Forces: {forces or 'none'}")
+    for entity in sorted(state.values):
+        if entity == HERO:
+            continue
+        kind, name, slot = replay.entities[entity]
+        values = state.values[entity]
+        if kind == 'gear':
+            removed = " (removed)" if values.get('removed') else ""
+            print(f"  ⚙️  ({slot % GRID_WIDTH},{slot // GRID_WIDTH}) {name:<28} fires {values.get('fires', 0)}{removed}")
+        else:
+            print(f"  👾 {name:<30} HP {values.get('hp', 0)}, armor {values.get('armor', 0)}, "
+                  f"shields {values.get('shields', 0)}, barriers {values.get('barriers', 0)}, "
+                  f"poison {values.get('poison', 0)}, move {values.get('move_index', 0) + 1}")
+
+def main():
+    """Record, inspect and diff battle logs."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Binary battle event log and replayer")
+    sub = parser.add_subparsers(dest='command', required=True)
+    record = sub.add_parser('record', help='Simulate a battle and write its log')
+    record.add_argument('--wave', required=True, help='wave_id from wave_data.json')
+    group = record.add_mutually_exclusive_group(required=True)
+    group.add_argument('--layout', help='Comma-separated card ids in Escapement Order (- for empty)')
+    group.add_argument('--layout-file', help='Layout file, one mainplate row per line')
+    record.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    record.add_argument('--max-ticks', type=int, default=DEFAULT_MAX_TICKS,
+                        help=f'Ticks before the battle times out (default: {DEFAULT_MAX_TICKS})')
+    record.add_argument('--snapshot-interval', type=int, default=DEFAULT_SNAPSHOT_INTERVAL,
+                        help=f'Beats between snapshots (default: {DEFAULT_SNAPSHOT_INTERVAL})')
+    record.add_argument('--per-beat', action='store_true', help='Step every beat instead of jumping between events')
+    record.add_argument('--check', action='store_true',
+                        help='Record the battle in both time-advance modes and verify the logs match')
+    record.add_argument('-o', '--output', help='Log file to write')
+    record.add_argument('--data', default=str(DATA_PATH), help='Directory with the exported JSON files')
+    show = sub.add_parser('show', help='Print the events of a log')
+    show.add_argument('log')
+    show.add_argument('--from', dest='start', type=int, default=0, help='First beat to print')
+    show.add_argument('--to', dest='stop', type=int, help='Last beat to print')
+    state = sub.add_parser('state', help='Rebuild the state at a beat')
+    state.add_argument('log')
+    state.add_argument('--beat', type=int, help='Beat to rebuild (default: the last)')
+    compare = sub.add_parser('diff', help='Find the first beat where two logs disagree')
+    compare.add_argument('first')
+    compare.add_argument('second')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        data = BattleData(Path(args.data))
+        layout = load_layout(Path(args.layout_file)) if args.layout_file else parse_layout(args.layout)
+        interval = max(1, args.snapshot_interval)
+        try:
+            if args.check:
+                logs = {}
+                for per_beat in (True, False):
+                    stream = io.BytesIO()
+                    record_battle(data, layout, args.wave, args.seed, stream, args.max_ticks, per_beat, interval)
+                    logs[per_beat] = Replay(stream.getvalue())
+                mismatch = diff(logs[True], logs[False])
+                if mismatch:
+                    print(f"❌ The logs differ from beat {mismatch[0]}:")
+                    print("\n".join(mismatch[1]))
+                    return 1
+                print(f"✅ Identical logs ({len(logs[False].records)} records, "
+                      f"{logs[False].last_beat} beats)")
+                return 0
+            if not args.output:
+                print("❌ record needs -o/--output (or --check)")
+                return 1
+            with open(args.output, 'wb') as stream:
+                outcome = record_battle(data, layout, args.wave, args.seed, stream, args.max_ticks,
+                                        args.per_beat, interval)
+        except (KeyError, ValueError) as e:
+            print(f"❌ {e}")
+            return 1
+        print_grid(layout)
+        size = Path(args.output).stat().st_size
+        print(f"✅ {outcome}; wrote {args.output} ({size:,} bytes)")
+        return 0
+
+    try:
+        replays = [Replay.load(Path(path)) for path in
+                   ([args.first, args.second] if args.command == 'diff' else [args.log])]
+    except (OSError, LogFormatError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.command == 'show':
+        replay = replays[0]
+        in_snapshot = 0
+        for record in replay.records:
+            if record[2] == KIND_SNAPSHOT:
+                in_snapshot = record[4]
+                continue
+            if in_snapshot:
+                in_snapshot -= 1
+                continue
+            if record[0] >= args.start and (args.stop is None or record[0] <= args.stop):
+                print(replay.describe(record))
+        return 0
+
+    if args.command == 'state':
+        replay = replays[0]
+        print_state(replay, replay.state_at(replay.last_beat if args.beat is None else args.beat))
+        return 0
+
+    mismatch = diff(*replays)
+    if mismatch is None:
+        print(f"✅ The logs match ({len(replays[0].deltas())} events)")
+        return 0
+    beat, lines = mismatch
+    print(f"❌ The logs differ from beat {beat}:")
+    print("\n".join(lines))
+    for label, replay in zip((args.first, args.second), replays):
+        print(f"\n{label}")
+        print_state(replay, replay.state_at(beat))
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1002 @@
+#!/usr/bin/env python3
+"""
+Headless battle simulator driven by the exported data JSONs.
+Replays the engine's beat loop in plain Python so a gear layout can be
+played against a wave thousands of times per second, without Godot:
+
+- TimelineManager: 10 beats per tick; each beat runs the gears phase, then
+  the gremlins phase (BeatProcessor order).
+- Mainplate.process_beat: gears on the 4x4 grid advance in Escapement Order
+  (top-to-bottom, left-to-right). A gear is ready after production_interval
+  ticks and fires when SimpleEffectProcessor.can_satisfy_effect() allows it;
+  a blocked gear stays ready and keeps its progress.
+- on_fire_effect: the same key=value grammar as SimpleEffectProcessor
+  (generate_/consume_ forces, damage/pierce_damage/pop_damage targeting,
+  poison, execute, burn, activate_<direction>, draw), run from the opcode arrays
+  effect_compiler builds once per card, so nothing is parsed mid-battle.
+- Gremlins: move_1..move_6 from mob_data cycle with a per-move countdown in
+  beats; triggered moves (attack, drains, summon) fire when the countdown
+  ends, persistent moves (caps) hold while loaded, 0-tick moves apply at
+  spawn. The pieces of a multi-piece move ("attack=2x3", "attack=2,drain_red=1")
+  complete together. Poison ticks every 10 beats and bypasses barriers, armor and shields.
+
+Where the engine still has a stub the simulator plays the rule as designed:
+gremlin summons, drain_all_types and drain_largest take effect, cap removal
+re-applies the caps of the gremlins still alive, activate_<direction>
+triggers the neighbouring gear, and the complex_<name> effects follow the
+comments on SimpleEffectProcessor's handlers (those that touch shields, card
+costs or the hand are skipped). Drawn cards are only counted: the layout is
+fixed for the whole battle (run_sim.py plays cards from a hand instead).
+battle_log.py records a battle's state changes to a binary log and replays it.
+
+Usage:
+    python3 battle_sim.py --wave wave_1e --layout starter_chronometer,starter_Purple_gen
+    python3 battle_sim.py --wave wave_3a --layout-file layout.txt --battles 5000 --seed 7
+    python3 battle_sim.py --wave wave_1e --layout-file layout.txt --trace
+    python3 battle_sim.py --wave wave_6d --layout-file layout.txt --check   # Event vs per-beat
+"""
+
+import heapq
+import itertools
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from effect_compiler import (ALL_FORCES, COLOR_INDEXES, COMPLEX_EFFECTS, DAMAGE_TARGETS, DIRECTION_OFFSETS,
+                             DRAIN_ALL, DRAIN_LARGEST, DRAIN_RANDOM, FORCE_INDEX, FORCE_INDEXES, FORCE_NAMES,
+                             MOVE_ATTACK, MOVE_DRAIN, MOVE_HARD_CAP, MOVE_SUMMON, OP_ACTIVATE, OP_BURN,
+                             OP_COMPLEX, OP_CONSUME, OP_CONSUME_LARGEST, OP_CONSUME_SMALLEST, OP_DAMAGE,
+                             OP_DRAW, OP_EXECUTE, OP_GENERATE, OP_MOMENTARY, OP_PIERCE_DAMAGE, OP_POISON,
+                             OP_POP_DAMAGE, OP_SELF_DESTRUCT, TRIGGERED_MOVE_OPS, Move, compile_data)
+from wave_difficulty import DATA_PATH, _load_records, _number, parse_gremlins
+
+BEATS_PER_TICK = 10
+GRID_WIDTH = 4
+GRID_HEIGHT = 4
+MAX_GREMLIN_SLOTS = 5          # GremlinManager.MAX_SLOTS
+HERO_HP = 24                   # Hero._init()
+FORCE_MAX = 10                 # Starting maximum of every hero force
+CAP_RESET_MAX = 99             # recalculate_all_downsides() resets force maxima to this
+DEFAULT_MAX_TICKS = 300
+
+def move_caps(move: Move) -> Dict[int, int]:
+    """Hard force caps (force index -> cap) a compiled move imposes while it is active."""
+    op, operand, value, _ = move
+    if op != MOVE_HARD_CAP:
+        return {}
+    if operand == ALL_FORCES:
+        return {force: value for force in FORCE_INDEXES}
+    return {operand: value}
+
+class BattleData:
+    """Cards, mobs and waves from the data JSONs, with effects and moves compiled once."""
+
+    def __init__(self, data_path: Path = DATA_PATH):
+        self.cards = {c['card_template_id']: c for c in _load_records(data_path / 'card_data.json')
+                      if c.get('card_template_id')}
+        self.mobs = {m['template_id']: m for m in _load_records(data_path / 'mob_data.json')
+                     if m.get('template_id')}
+        self.waves = {str(w['wave_id']): w for w in _load_records(data_path / 'wave_data.json')
+                      if w.get('wave_id')}
+        # Keys that fail to compile are left out, as the engine skips them with a warning
+        self.compiled = compile_data(list(self.cards.values()), list(self.mobs.values()))
+        self.card_effects = self.compiled.cards
+        self.mob_moves = self.compiled.mobs
+        self.card_tags = {card_id: frozenset(t.strip() for t in str(card.get('tags') or '').split(',') if t.strip())
+                          for card_id, card in self.cards.items()}
+        self.mobs_by_size: Dict[str, List[str]] = {}
+        for mob_id, mob in self.mobs.items():
+            self.mobs_by_size.setdefault(str(mob.get('size_category', '')), []).append(mob_id)
+
+    def wave_gremlins(self, wave_id: str) -> List[str]:
+        if wave_id not in self.waves:
+            raise KeyError(f"Unknown wave '{wave_id}'")
+        return parse_gremlins(self.waves[wave_id].get('gremlins'))
+
+    def compile_errors(self, ids) -> List[Tuple[str, str, str]]:
+        """Compile errors of the given cards and mobs; those effects are not simulated."""
+        ids = set(ids)
+        return [error for error in self.compiled.errors if error[1] in ids]
+
+class Gear:
+    __slots__ = ('card_id', 'x', 'y', 'interval', 'effects', 'beats', 'fires', 'firing', 'removed', 'due')
+
+    def __init__(self, card_id: str, x: int, y: int, production_interval: int, effects: Tuple[float, ...]):
+        self.card_id = card_id
+        self.x = x
+        self.y = y
+        self.interval = production_interval * BEATS_PER_TICK
+        self.effects = effects
+        self.beats = 0        # Card.starting_progress is never applied by Mainplate
+        self.fires = 0
+        self.firing = False
+        self.removed = False
+        self.due: Optional[int] = None      # Scheduled beat in event mode
+
+class Gremlin:
+    __slots__ = ('template_id', 'hp', 'max_hp', 'armor', 'shields', 'barriers', 'damage_cap',
+                 'invulnerable', 'execute_immunity', 'burn_until', 'moves', 'background', 'move_index',
+                 'beats_left', 'poison', 'poison_timer', 'summon_cap', 'summoner', 'summons', 'due')
+
+    def __init__(self, template_id: str, mob: Dict, moves: Tuple[Tuple[Move, ...], Tuple[Move, ...]]):
+        self.template_id = template_id
+        self.max_hp = int(_number(mob.get('max_health', 10)))
+        self.hp = self.max_hp
+        self.armor = int(_number(mob.get('max_armor', 0)))
+        self.shields = int(_number(mob.get('max_shields', 0)))
+        self.barriers = int(_number(mob.get('barrier_count', 0)))
+        self.damage_cap = int(_number(mob.get('damage_cap', 0)))
+        self.invulnerable = bool(mob.get('invulnerable', False))
+        self.execute_immunity = int(_number(mob.get('execute_immunity_threshold', 0)))
+        self.burn_until = 0       # Burn only blocks healing, which nothing simulated does
+        self.moves, self.background = moves
+        self.move_index = 0
+        self.beats_left = 0
+        self.poison = 0
+        self.poison_timer = BEATS_PER_TICK
+        self.summon_cap = int(_number(mob.get('summon_cap', 0)))
+        self.summoner: Optional['Gremlin'] = None
+        self.summons = 0
+        self.due: Optional[int] = None
+
+    @property
+    def current_move(self) -> Optional[Move]:
+        return self.moves[self.move_index] if self.moves else None
+
+@dataclass
+class BattleResult:
+    outcome: str                  # 'win', 'loss' or 'timeout'
+    beats: int
+    hero_hp: int
+    damage_dealt: int = 0
+    damage_taken: int = 0
+    gremlins_defeated: int = 0
+    summons: int = 0
+    cards_drawn: int = 0
+    gear_fires: Dict[str, int] = field(default_factory=dict)
+    forces_generated: int = 0
+
+    @property
+    def ticks(self) -> float:
+        return self.beats / BEATS_PER_TICK
+
+def layout_grid(layout: List[Optional[str]]) -> Dict[Tuple[int, int], str]:
+    """(x, y) -> card id for a layout listed in Escapement Order; None/'' leaves a slot empty."""
+    if len(layout) > GRID_WIDTH * GRID_HEIGHT:
+        raise ValueError(f"Layout has {len(layout)} gears; the mainplate holds {GRID_WIDTH * GRID_HEIGHT}")
+    return {(i % GRID_WIDTH, i // GRID_WIDTH): card_id for i, card_id in enumerate(layout) if card_id}
+
+class Battle:
+    """One battle: a fixed gear layout against a list of gremlins, stepped one beat at a time."""
+
+    def __init__(self, data: BattleData, layout: List[Optional[str]], gremlin_ids: List[str],
+                 rng: Optional[random.Random] = None, hero_hp: int = HERO_HP,
+                 log: Optional[Callable[[str], None]] = None, recorder=None):
+        self.data = data
+        self.rng = rng or random.Random()
+        self.log = log
+        self.recorder = recorder        # battle_log.BattleRecorder
+        self.beat = 0
+        self.hero_hp = hero_hp
+        self.hero_max_hp = hero_hp
+        # Indexed like effect_compiler.FORCE_NAMES
+        self.forces = [0] * len(FORCE_NAMES)
+        self.force_max = [FORCE_MAX] * len(FORCE_NAMES)
+        self.result = BattleResult('timeout', 0, hero_hp)
+        # Event mode only (run_events): pending (beat, seq, gear/gremlin) entries
+        # and what the beat being processed touched
+        self.events: Optional[list] = None
+        self._touched: set = set()
+        self._recheck = False
+        self._seq = itertools.count()
+
+        self.grid: Dict[Tuple[int, int], Gear] = {}
+        # Escapement Order; gears without a production interval never advance
+        self.gears: List[Gear] = []
+        for (x, y), card_id in layout_grid(layout).items():
+            self.place(card_id, x, y)
+
+        # GremlinSpawnController skips templates missing from mob_data
+        self.gremlins: List[Gremlin] = []
+        for template_id in [g for g in gremlin_ids if g in data.mobs][:MAX_GREMLIN_SLOTS]:
+            self.spawn(template_id)
+        if recorder is not None:
+            recorder.sync(self)
+
+    # --- Beat loop -------------------------------------------------------
+
+    def step(self) -> Optional[str]:
+        """Advance one beat; returns the outcome once the battle is decided."""
+        if self.recorder is not None:
+            # Cards played or effects applied since the last beat belong to it
+            self.recorder.sync(self)
+        self.beat += 1
+        for gear in self.gears:
+            if gear.removed:
+                continue
+            gear.beats += 1
+            if gear.beats >= gear.interval and self.can_satisfy(gear.effects):
+                self.fire(gear)
+        for gremlin in list(self.gremlins):
+            if gremlin.hp > 0:
+                self.gremlin_beat(gremlin)
+        if self.recorder is not None:
+            self.recorder.sync(self)
+        return self.outcome()
+
+    def outcome(self) -> Optional[str]:
+        if self.hero_hp <= 0:
+            return 'loss'
+        if not self.gremlins:
+            return 'win'
+        return None
+
+    def run(self, max_ticks: int = DEFAULT_MAX_TICKS) -> BattleResult:
+        outcome = self.outcome()
+        max_beats = max_ticks * BEATS_PER_TICK
+        while outcome is None and self.beat < max_beats:
+            outcome = self.step()
+        return self.finish(outcome or 'timeout')
+
+    def run_events(self, max_ticks: int = DEFAULT_MAX_TICKS) -> BattleResult:
+        """The same battle as run(), jumping between events (see advance_to)."""
+        outcome = self.advance_to(max_ticks * BEATS_PER_TICK)
+        return self.finish(outcome or 'timeout')
+
+    def advance_to(self, until: int, per_beat: bool = False) -> Optional[str]:
+        """
+        Advance to beat `until`, or until the battle is decided; returns the outcome.
+
+        Unless per_beat is set, this jumps straight to the next beat where a gear
+        becomes ready, a gremlin move completes or poison ticks. Every gear and
+        gremlin keeps its next due beat in a priority queue; stale entries are
+        dropped when popped. The beats in between only advance counters, so they
+        are fast-forwarded, and the event beat itself goes through step() so
+        same-beat ordering is exactly the per-beat loop's. A gear that is ready
+        but cannot pay its effect is re-checked on the beat after anything
+        happens, since only events change forces. Gears placed, gremlins spawned
+        and effects applied between calls are picked up on the next call.
+        """
+        outcome = self.outcome()
+        if per_beat:
+            while outcome is None and self.beat < until:
+                outcome = self.step()
+            return outcome
+
+        if self.events is None:
+            self.events = []
+            for entity in self.gears + self.gremlins:
+                self._schedule(entity)
+        else:
+            # Anything may have changed since the last call
+            for entity in self._touched:
+                self._schedule(entity)
+            self._recheck = True
+        while outcome is None:
+            next_beat = self._next_event_beat()
+            if self._recheck and (next_beat is None or next_beat > self.beat + 1):
+                next_beat = self.beat + 1
+            if next_beat is None or next_beat > until:
+                self._skip_to(until)
+                break
+            self._skip_to(next_beat - 1)
+            self._touched.clear()
+            outcome = self.step()
+            for entity in self._touched:
+                self._schedule(entity)
+            self._recheck = bool(self._touched) and self._has_blocked_gear()
+        self._touched.clear()
+        return outcome
+
+    def _due(self, entity) -> Optional[int]:
+        """Absolute beat of an entity's next event, from its state after the current beat."""
+        if isinstance(entity, Gear):
+            if entity.removed or entity.beats >= entity.interval:
+                return None     # Removed, or blocked until forces change
+            return self.beat + entity.interval - entity.beats
+        if entity.hp <= 0 or entity not in self.gremlins:
+            return None
+        dues = []
+        if entity.beats_left > 0:
+            dues.append(self.beat + entity.beats_left)
+        if entity.poison > 0:
+            dues.append(self.beat + entity.poison_timer)
+        return min(dues) if dues else None
+
+    def _schedule(self, entity) -> None:
+        entity.due = self._due(entity)
+        if entity.due is not None:
+            heapq.heappush(self.events, (entity.due, next(self._seq), entity))
+
+    def _next_event_beat(self) -> Optional[int]:
+        events = self.events
+        while events:
+            due, _, entity = events[0]
+            if due > self.beat and entity.due == due:
+                return due
+            heapq.heappop(events)
+        return None
+
+    def _has_blocked_gear(self) -> bool:
+        return any(not gear.removed and gear.beats >= gear.interval for gear in self.gears)
+
+    def _skip_to(self, beat: int) -> None:
+        """Advance every counter to `beat` without processing it; nothing is due before then."""
+        skipped = beat - self.beat
+        if skipped <= 0:
+            return
+        for gear in self.gears:
+            if not gear.removed:
+                gear.beats += skipped
+        for gremlin in self.gremlins:
+            if gremlin.beats_left > 0:
+                gremlin.beats_left -= skipped
+            if gremlin.poison > 0:
+                gremlin.poison_timer -= skipped
+        self.beat = beat
+
+    def _touch(self, entity) -> None:
+        if self.events is not None:
+            self._touched.add(entity)
+
+    def finish(self, outcome: str) -> BattleResult:
+        result = self.result
+        result.outcome = outcome
+        result.beats = self.beat
+        result.hero_hp = self.hero_hp
+        for gear in self.grid.values():
+            result.gear_fires[gear.card_id] = result.gear_fires.get(gear.card_id, 0) + gear.fires
+        if self.recorder is not None:
+            self.recorder.end(self, outcome)
+        return result
+
+    def _log(self, message: str) -> None:
+        self.log(f"[beat {self.beat:5d}] {message}")
+
+    # --- Gears -----------------------------------------------------------
+
+    def place(self, card_id: str, x: int, y: int) -> Optional[Gear]:
+        """
+        Mainplate.request_card_placement: put a gear in a slot, replacing
+        (overbuilding) the gear already there; returns the replaced gear.
+        An Overbuild card inherits the replaced gear's progress.
+        """
+        card = self.data.cards.get(card_id)
+        if card is None:
+            raise KeyError(f"Unknown card '{card_id}'")
+        gear = Gear(card_id, x, y, int(_number(card.get('production_interval', 0))),
+                    self.data.card_effects[card_id])
+        old = self.grid.get((x, y))
+        if old is not None:
+            old.removed = True
+            old.due = None
+            if old in self.gears:
+                self.gears.remove(old)
+            self.result.gear_fires[old.card_id] = self.result.gear_fires.get(old.card_id, 0) + old.fires
+            if 'Overbuild' in str(card.get('tags', '')).split(','):
+                gear.beats = old.beats
+        self.grid[(x, y)] = gear
+        if gear.interval > 0:
+            self.gears.append(gear)
+            self.gears.sort(key=lambda g: (g.y, g.x))
+            self._touch(gear)
+        return old
+
+    def can_satisfy(self, code: Tuple[float, ...]) -> bool:
+        forces = self.forces
+        it = iter(code)
+        for op, operand, value in zip(it, it, it):
+            if op == OP_CONSUME:
+                if forces[operand] < int(value):
+                    return False
+            elif op == OP_CONSUME_LARGEST:
+                if max(forces[c] for c in COLOR_INDEXES) < value:
+                    return False
+            elif op == OP_CONSUME_SMALLEST:
+                pools = [forces[c] for c in COLOR_INDEXES if forces[c] > 0]
+                if not pools or min(pools) < value:
+                    return False
+        return True
+
+    def fire(self, gear: Gear) -> None:
+        gear.firing = True
+        gear.fires += 1
+        self._touch(gear)
+        if self.log:
+            self._log(f"{gear.card_id} fires at ({gear.x},{gear.y})")
+        self.apply_effects(gear.effects, gear)
+        gear.firing = False
+        gear.beats = 0
+
+    def trigger(self, gear: Gear) -> bool:
+        """Mainplate.trigger_card_activation: fire a gear now if its effect can be paid."""
+        if gear.removed or gear.firing or gear.interval <= 0 or not gear.effects:
+            return False
+        if not self.can_satisfy(gear.effects):
+            return False
+        self.fire(gear)
+        return True
+
+    def apply_effects(self, code: Tuple[float, ...], gear: Optional[Gear] = None) -> None:
+        """Run compiled (opcode, operand, value) triples in order."""
+        forces = self.forces
+        it = iter(code)
+        for op, operand, value in zip(it, it, it):
+            if op == OP_GENERATE:
+                self.generate(operand, int(value))
+            elif op == OP_CONSUME:
+                if forces[operand] >= int(value):
+                    forces[operand] -= int(value)
+            elif op == OP_DAMAGE or op == OP_PIERCE_DAMAGE or op == OP_POP_DAMAGE:
+                self.damage(DAMAGE_TARGETS[operand], int(value), op == OP_PIERCE_DAMAGE, op == OP_POP_DAMAGE)
+            elif op == OP_POISON:
+                targets = list(self.gremlins) if operand else self.gremlins[:1]
+                for gremlin in targets:
+                    self.apply_poison(gremlin, int(value))
+            elif op == OP_EXECUTE:
+                for gremlin in (list(self.gremlins) if operand else self.gremlins[:1]):
+                    self.execute(gremlin, int(value))
+            elif op == OP_BURN:
+                for gremlin in (list(self.gremlins) if operand else self.gremlins[:1]):
+                    gremlin.burn_until = max(gremlin.burn_until, self.beat + int(value) * BEATS_PER_TICK)
+            elif op == OP_CONSUME_LARGEST:
+                self._consume_pool(max, value)
+            elif op == OP_CONSUME_SMALLEST:
+                self._consume_pool(min, value)
+            elif op == OP_ACTIVATE and gear is not None:
+                dx, dy = DIRECTION_OFFSETS[operand]
+                neighbour = self.grid.get((gear.x + dx, gear.y + dy))
+                if neighbour is not None:
+                    for _ in range(int(value)):
+                        if not self.trigger(neighbour):
+                            break
+            elif op == OP_DRAW:
+                self.draw(int(value))
+            elif (op == OP_SELF_DESTRUCT or (op == OP_MOMENTARY and value > 0)) and gear is not None:
+                gear.removed = True
+            elif op == OP_COMPLEX:
+                handler = getattr(self, f'_complex_{COMPLEX_EFFECTS[operand]}', None)
+                if handler is not None:
+                    handler(gear)
+
+    def generate(self, force: int, amount: int) -> None:
+        before = self.forces[force]
+        self.forces[force] = min(self.force_max[force], before + amount)
+        self.result.forces_generated += max(0, self.forces[force] - before)
+
+    def draw(self, count: int) -> None:
+        """The layout is fixed, so drawn cards are only counted."""
+        self.result.cards_drawn += count
+
+    def _consume_pool(self, pick, amount: float) -> None:
+        forces = self.forces
+        pools = [c for c in COLOR_INDEXES if forces[c] > 0] if pick is min else list(COLOR_INDEXES)
+        if not pools:
+            return
+        chosen = pick(pools, key=forces.__getitem__)
+        if forces[chosen] >= amount:
+            forces[chosen] -= int(amount)
+
+    # --- Complex effects -------------------------------------------------
+    # SimpleEffectProcessor._complex_<name>, as their comments describe them. The
+    # engine's versions call mainplate helpers that do not exist yet; effects on
+    # hero shields, healing, card costs or the hand are not simulated.
+
+    def placed(self) -> List[Gear]:
+        """Gears on the mainplate in Escapement Order."""
+        return sorted((g for g in self.grid.values() if not g.removed), key=lambda g: (g.y, g.x))
+
+    def tag_count(self, tag: str) -> int:
+        tags = self.data.card_tags
+        return sum(tag in tags[g.card_id] for g in self.grid.values() if not g.removed)
+
+    def gear_at(self, x: int, y: int) -> Optional[Gear]:
+        gear = self.grid.get((x, y))
+        return gear if gear is not None and not gear.removed else None
+
+    def remove_gear(self, gear: Gear) -> None:
+        gear.removed = True
+        self._touch(gear)
+
+    def _adjacent(self, gear: Gear) -> List[Gear]:
+        # Vector2i UP, DOWN, LEFT, RIGHT
+        return [g for g in (self.gear_at(gear.x + dx, gear.y + dy) for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)))
+                if g is not None]
+
+    def _complex_chain_reaction(self, gear: Optional[Gear]) -> None:
+        if gear is not None:
+            for neighbour in self._adjacent(gear):
+                self.trigger(neighbour)
+
+    _complex_adjacent_trigger = _complex_chain_reaction
+
+    def _complex_mega_burst(self, gear: Optional[Gear]) -> None:
+        for color in COLOR_INDEXES:
+            self.generate(color, 3)
+
+    def _complex_sacrifice_draw(self, gear: Optional[Gear]) -> None:
+        placed = self.placed()
+        if placed:
+            self.remove_gear(self.rng.choice(placed))
+            self.draw(3)
+
+    def _complex_force_cascade(self, gear: Optional[Gear]) -> None:
+        total = sum(self.forces[c] for c in COLOR_INDEXES)
+        for color in COLOR_INDEXES:
+            self.forces[color] = 0
+        if total > 0:
+            self.damage('all', total)
+
+    def _complex_micro_synergy(self, gear: Optional[Gear]) -> None:
+        if self.tag_count('MICRO') >= 3:
+            self.damage('top', 7)
+
+    def _complex_beast_pack(self, gear: Optional[Gear]) -> None:
+        beasts = self.tag_count('BEAST')
+        if beasts > 0:
+            self.damage('top', 2 * beasts)
+
+    def _complex_heat_threshold(self, gear: Optional[Gear]) -> None:
+        if self.forces[FORCE_INDEX['heat']] > 5:
+            self.draw(1)
+
+    def _complex_micro_haste(self, gear: Optional[Gear]) -> None:
+        for other in self.placed():
+            if 'MICRO' in self.data.card_tags[other.card_id] and other.interval > BEATS_PER_TICK:
+                other.interval -= BEATS_PER_TICK
+                self._touch(other)
+
+    def _complex_order_line(self, gear: Optional[Gear]) -> None:
+        """Three ORDER gears in a row or column, next to each other: draw 2."""
+        order = {(g.x, g.y) for g in self.placed() if 'ORDER' in self.data.card_tags[g.card_id]}
+        for x, y in order:
+            if {(x + 1, y), (x + 2, y)} <= order or {(x, y + 1), (x, y + 2)} <= order:
+                self.draw(2)
+                return
+
+    def _complex_chaos_isolation(self, gear: Optional[Gear]) -> None:
+        if gear is not None and not self._adjacent(gear) and 'CHAOS' in self.data.card_tags[gear.card_id]:
+            self.damage('top', 3)
+
+    def _complex_forge_support(self, gear: Optional[Gear]) -> None:
+        """Other gears in the row produce +1 of each force they generate."""
+        if gear is None:
+            return
+        for other in self.placed():
+            if other is not gear and other.y == gear.y:
+                code = other.effects
+                for i in range(0, len(code), 3):
+                    if code[i] == OP_GENERATE:
+                        self.generate(code[i + 1], 1)
+
+    def _complex_void_hunger(self, gear: Optional[Gear]) -> None:
+        consumed = 0
+        for color in COLOR_INDEXES:
+            paid = min(self.forces[color], 5 - consumed)
+            self.forces[color] -= paid
+            consumed += paid
+            if consumed >= 5:
+                break
+        if consumed >= 5:
+            self.damage('top', 7)
+
+    def _complex_crystal_focus(self, gear: Optional[Gear]) -> None:
+        for _ in range(self.tag_count('CRYSTAL')):
+            self.generate(FORCE_INDEX['precision'], 2)
+
+    def _complex_arcane_ritual(self, gear: Optional[Gear]) -> None:
+        if self.tag_count('ARCANE') >= 3:
+            for other in self.placed():
+                self.trigger(other)
+
+    def _complex_overheat(self, gear: Optional[Gear]) -> None:
+        red = FORCE_INDEX['red']
+        if self.forces[red] >= 10:
+            self.damage('top', 15)
+            self.forces[red] = 0
+
+    def _complex_precision_strike(self, gear: Optional[Gear]) -> None:
+        blue = self.forces[FORCE_INDEX['blue']]
+        if blue >= 7:
+            self.damage('weakest', blue)
+
+    def _complex_momentum_avalanche(self, gear: Optional[Gear]) -> None:
+        green = FORCE_INDEX['green']
+        if self.forces[green] >= 8:
+            amount = self.forces[green] * 2
+            self.forces[green] = min(self.force_max[green], amount)
+            self.damage('top', amount)
+
+    def _complex_perfect_balance(self, gear: Optional[Gear]) -> None:
+        colors = [self.forces[c] for c in COLOR_INDEXES]
+        if colors[0] > 0 and len(set(colors)) == 1:
+            self.draw(3)
+
+    def _complex_entropy_cascade(self, gear: Optional[Gear]) -> None:
+        if self.forces[FORCE_INDEX['purple']] >= 6:
+            self.damage('all', 10)
+
+    def _complex_row_production(self, gear: Optional[Gear]) -> None:
+        if gear is not None:
+            for other in self.placed():
+                if other.y == gear.y:
+                    self.trigger(other)
+
+    def _complex_diagonal_damage(self, gear: Optional[Gear]) -> None:
+        if gear is None:
+            return
+        diagonals = sum(self.gear_at(gear.x + dx, gear.y + dy) is not None
+                        for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1)))
+        if diagonals > 0:
+            self.damage('top', diagonals * 3)
+
+    def _complex_sacrifice_power(self, gear: Optional[Gear]) -> None:
+        if gear is not None:
+            self.remove_gear(gear)
+            self.damage('top', 10)
+
+    def _complex_destroy_draw(self, gear: Optional[Gear]) -> None:
+        placed = self.placed()
+        if len(placed) > 1:
+            target = self.rng.choice(placed)
+            if target is not gear:
+                self.remove_gear(target)
+                self.draw(target.interval // BEATS_PER_TICK)
+
+    def _complex_force_scaling(self, gear: Optional[Gear]) -> None:
+        total = sum(self.forces[c] for c in COLOR_INDEXES)
+        if total > 0:
+            self.damage('top', total)
+
+    def _complex_gear_scaling(self, gear: Optional[Gear]) -> None:
+        count = len(self.placed())
+        if count > 0:
+            for color in COLOR_INDEXES:
+                self.generate(color, count)
+
+    def _complex_red_blue_combo(self, gear: Optional[Gear]) -> None:
+        self._combo(FORCE_INDEX['red'], FORCE_INDEX['blue'], FORCE_INDEX['heat'])
+
+    def _complex_white_purple_combo(self, gear: Optional[Gear]) -> None:
+        self._combo(FORCE_INDEX['white'], FORCE_INDEX['purple'], FORCE_INDEX['balance'], damage=0)
+
+    def _combo(self, first: int, second: int, result: int, damage: int = 12) -> None:
+        forces = self.forces
+        if forces[first] + forces[second] >= 10:
+            paid = min(forces[first], forces[second], 5)
+            forces[first] -= paid
+            forces[second] -= paid
+            self.generate(result, paid)
+            if damage:
+                self.damage('top', damage)
+
+    def _complex_rainbow_burst(self, gear: Optional[Gear]) -> None:
+        if all(self.forces[c] > 0 for c in COLOR_INDEXES):
+            total = sum(self.forces[c] for c in COLOR_INDEXES)
+            for color in COLOR_INDEXES:
+                self.forces[color] = 0
+            self.damage('all', total)
+            self.draw(5)
+
+    # --- Damage ----------------------------------------------------------
+
+    def targets(self, target: str) -> List[Gremlin]:
+        gremlins = self.gremlins
+        if not gremlins:
+            return []
+        if target == 'top':
+            return [gremlins[0]]
+        if target == 'bottom':
+            return [gremlins[-1]]
+        if target == 'all':
+            return list(gremlins)
+        if target == 'random':
+            return [self.rng.choice(gremlins)]
+        if target == 'weakest':
+            return [min(gremlins, key=lambda g: g.hp)]
+        strongest = max(gremlins, key=lambda g: g.hp)
+        return [strongest] if strongest.hp > 0 else []
+
+    def damage(self, target: str, amount: int, pierce: bool = False, pop: bool = False) -> None:
+        for gremlin in self.targets(target):
+            self.receive_damage(gremlin, amount, pierce, pop)
+
+    def receive_damage(self, gremlin: Gremlin, amount: int, pierce: bool = False,
+                       pop: bool = False, poison: bool = False) -> int:
+        """Damageable.receive_damage: cap, barrier, armor, shields, then HP."""
+        if gremlin.invulnerable:
+            return 0
+        damage = amount
+        if gremlin.damage_cap > 0:
+            damage = min(damage, gremlin.damage_cap)
+        if gremlin.barriers > 0 and not pierce:
+            gremlin.barriers -= 1
+            return 0
+        if not pierce and not poison:
+            damage -= min(gremlin.armor, damage)
+        if gremlin.shields > 0 and not pierce:
+            shield_damage = damage * 2 if pop else damage
+            lost = min(gremlin.shields, shield_damage)
+            gremlin.shields -= lost
+            damage -= lost
+            if pop and damage > 0:
+                damage *= 2
+        if damage <= 0:
+            return 0
+        gremlin.hp -= damage
+        self.result.damage_dealt += damage
+        if self.log:
+            self._log(f"{gremlin.template_id} takes {damage} ({max(gremlin.hp, 0)}/{gremlin.max_hp})")
+        if gremlin.hp <= 0:
+            self.defeat(gremlin)
+        return damage
+
+    def execute(self, gremlin: Gremlin, threshold: int) -> None:
+        """Damageable.can_be_executed/execute: HP at or below both the threshold and the immunity threshold."""
+        if gremlin.hp > gremlin.execute_immunity or gremlin.hp > threshold or gremlin.invulnerable:
+            return
+        gremlin.hp = 0
+        if self.log:
+            self._log(f"{gremlin.template_id} executed")
+        self.defeat(gremlin)
+
+    def apply_poison(self, gremlin: Gremlin, stacks: int) -> None:
+        if gremlin.poison <= 0:
+            gremlin.poison_timer = BEATS_PER_TICK    # A fresh PoisonConsumer
+        gremlin.poison += stacks
+        self._touch(gremlin)
+
+    # --- Gremlins --------------------------------------------------------
+
+    def spawn(self, template_id: str, summoner: Optional[Gremlin] = None) -> Optional[Gremlin]:
+        mob = self.data.mobs.get(template_id)
+        if mob is None:
+            raise KeyError(f"Unknown gremlin '{template_id}'")
+        gremlin = Gremlin(template_id, mob, self.data.mob_moves[template_id])
+        gremlin.summoner = summoner
+        if summoner is not None and str(mob.get('summon_position', 'bottom')) == 'top':
+            self.gremlins.insert(0, gremlin)
+        else:
+            self.gremlins.append(gremlin)
+        if self.log:
+            self._log(f"{template_id} spawns ({gremlin.hp} HP)")
+        self._touch(gremlin)
+        for move in gremlin.background:
+            self.apply_caps(move_caps(move))
+        if gremlin.moves:
+            self.load_move(gremlin, 0)
+        return gremlin
+
+    def defeat(self, gremlin: Gremlin) -> None:
+        if gremlin not in self.gremlins:
+            return
+        self.gremlins.remove(gremlin)
+        gremlin.due = None
+        if gremlin.summoner is not None:
+            gremlin.summoner.summons -= 1
+        self.result.gremlins_defeated += 1
+        if self.log:
+            self._log(f"{gremlin.template_id} defeated")
+        self.recalculate_caps()
+
+    def gremlin_beat(self, gremlin: Gremlin) -> None:
+        if gremlin.poison > 0:
+            gremlin.poison_timer -= 1
+            if gremlin.poison_timer <= 0:
+                self._touch(gremlin)
+                self.receive_damage(gremlin, gremlin.poison, pierce=True, poison=True)
+                gremlin.poison -= 1
+                gremlin.poison_timer = BEATS_PER_TICK
+                if gremlin.hp <= 0:
+                    return
+        if gremlin.beats_left > 0:
+            gremlin.beats_left -= 1
+            if gremlin.beats_left == 0:
+                self._touch(gremlin)
+                self.complete_move(gremlin)
+
+    def load_move(self, gremlin: Gremlin, index: int) -> None:
+        gremlin.move_index = index
+        move = gremlin.moves[index]
+        gremlin.beats_left = move[3] * BEATS_PER_TICK
+        if move[0] not in TRIGGERED_MOVE_OPS:
+            self.apply_caps(move_caps(move))
+
+    def complete_move(self, gremlin: Gremlin) -> None:
+        move = gremlin.current_move
+        if move[0] in TRIGGERED_MOVE_OPS:
+            self.trigger_move(gremlin, move)
+        else:
+            self.recalculate_caps()
+        if gremlin.hp > 0 and gremlin in self.gremlins:
+            self.load_move(gremlin, (gremlin.move_index + 1) % len(gremlin.moves))
+            if gremlin.beats_left == 0:
+                # Later pieces of a multi-piece move (0 ticks) complete on the same beat
+                self.complete_move(gremlin)
+
+    def trigger_move(self, gremlin: Gremlin, move: Move) -> None:
+        op, operand, value, _ = move
+        forces = self.forces
+        if op == MOVE_ATTACK:
+            self.hero_hp = max(0, self.hero_hp - value)
+            self.result.damage_taken += value
+            if self.log:
+                self._log(f"{gremlin.template_id} attacks for {value} (hero {self.hero_hp})")
+        elif op == MOVE_DRAIN:
+            if operand == DRAIN_RANDOM:
+                available = [f for f in FORCE_INDEXES if forces[f] > 0]
+                drained = [self.rng.choice(available)] if available else []
+            elif operand == DRAIN_ALL:
+                drained = FORCE_INDEXES
+            elif operand == DRAIN_LARGEST:
+                drained = [max(FORCE_INDEXES, key=forces.__getitem__)]
+            else:
+                drained = [operand]
+            for f in drained:
+                forces[f] = max(0, forces[f] - value)
+        elif op == MOVE_SUMMON:
+            self.summon(gremlin, self.data.compiled.symbols[operand])
+
+    def summon(self, gremlin: Gremlin, target: str) -> None:
+        if len(self.gremlins) >= MAX_GREMLIN_SLOTS:
+            return
+        if gremlin.summon_cap > 0 and gremlin.summons >= gremlin.summon_cap:
+            return
+        if target.startswith('random_'):
+            choices = self.data.mobs_by_size.get(target[len('random_'):], [])
+            if not choices:
+                return
+            target = self.rng.choice(choices)
+        if target not in self.data.mobs:
+            return
+        self.spawn(target, summoner=gremlin)
+        gremlin.summons += 1
+        self.result.summons += 1
+
+    # --- Force caps ------------------------------------------------------
+
+    def apply_caps(self, caps: Dict[int, int]) -> None:
+        for force, cap in caps.items():
+            self.force_max[force] = min(self.force_max[force], cap)
+            self.forces[force] = min(self.forces[force], cap)
+
+    def recalculate_caps(self) -> None:
+        """Reset force maxima, then re-apply the caps of every gremlin still holding one."""
+        for force in FORCE_INDEXES:
+            self.force_max[force] = CAP_RESET_MAX
+        for gremlin in self.gremlins:
+            for move in gremlin.background:
+                self.apply_caps(move_caps(move))
+            move = gremlin.current_move
+            if move is not None:
+                self.apply_caps(move_caps(move))
+
+def simulate(data: BattleData, layout: List[Optional[str]], wave_id: str, battles: int = 1000,
+             seed: Optional[int] = None, max_ticks: int = DEFAULT_MAX_TICKS,
+             hero_hp: int = HERO_HP, per_beat: bool = False) -> List[BattleResult]:
+    """Run `battles` independent battles of one layout against one wave."""
+    gremlin_ids = data.wave_gremlins(wave_id)
+    rng = random.Random(seed)
+    results = []
+    for _ in range(battles):
+        battle = Battle(data, layout, gremlin_ids, rng, hero_hp)
+        results.append(battle.run(max_ticks) if per_beat else battle.run_events(max_ticks))
+    return results
+
+def summarise(results: List[BattleResult]) -> Dict[str, float]:
+    count = len(results) or 1
+    return {
+        'battles': len(results),
+        'win_rate': sum(r.outcome == 'win' for r in results) / count,
+        'loss_rate': sum(r.outcome == 'loss' for r in results) / count,
+        'timeout_rate': sum(r.outcome == 'timeout' for r in results) / count,
+        'mean_ticks': sum(r.ticks for r in results) / count,
+        'mean_hero_hp': sum(r.hero_hp for r in results) / count,
+        'mean_damage_dealt': sum(r.damage_dealt for r in results) / count,
+    }
+
+def load_layout(path: Path) -> List[Optional[str]]:
+    """A layout file: one mainplate row per line, gears comma-separated, '-' or blank for empty."""
+    layout: List[Optional[str]] = []
+    rows = [line for line in path.read_text(encoding='utf-8').splitlines()
+            if line.strip() and not line.strip().startswith('#')]
+    for row in rows[:GRID_HEIGHT]:
+        cells = [cell.strip() for cell in row.split(',')][:GRID_WIDTH]
+        cells += [''] * (GRID_WIDTH - len(cells))
+        layout.extend(cell if cell not in ('', '-') else None for cell in cells)
+    return layout
+
+def parse_layout(text: str) -> List[Optional[str]]:
+    """A comma-separated layout in Escapement Order, '-' or blank for empty slots."""
+    return [cell.strip() if cell.strip() not in ('', '-') else None for cell in text.split(',')]
+
+def print_grid(layout: List[Optional[str]]) -> None:
+    grid = layout_grid(layout)
+    for y in range(GRID_HEIGHT):
+        print("  " + " | ".join(f"{grid.get((x, y), '-'):<22}" for x in range(GRID_WIDTH)))
+
+def main():
+    """Simulate a layout against a wave and report outcomes and throughput."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless battle simulator over the exported data JSONs")
+    parser.add_argument('--wave', required=True, help='wave_id from wave_data.json')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--layout', help='Comma-separated card ids in Escapement Order (- for empty)')
+    group.add_argument('--layout-file', help='Layout file, one mainplate row per line')
+    parser.add_argument('--battles', type=int, default=1000, help='Battles to simulate (default: 1000)')
+    parser.add_argument('--seed', type=int, help='Random seed')
+    parser.add_argument('--max-ticks', type=int, default=DEFAULT_MAX_TICKS,
+                        help=f'Ticks before a battle times out (default: {DEFAULT_MAX_TICKS})')
+    parser.add_argument('--hero-hp', type=int, default=HERO_HP, help=f'Hero HP (default: {HERO_HP})')
+    parser.add_argument('--trace', action='store_true', help='Print the events of a single battle')
+    parser.add_argument('--per-beat', action='store_true', help='Step every beat instead of jumping between events')
+    parser.add_argument('--check', action='store_true',
+                        help='Run both time-advance modes and verify they give identical results')
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with the exported JSON files')
+    args = parser.parse_args()
+
+    data = BattleData(Path(args.data))
+    layout = load_layout(Path(args.layout_file)) if args.layout_file else parse_layout(args.layout)
+    try:
+        gremlin_ids = data.wave_gremlins(args.wave)
+        layout_grid(layout)
+        missing = [card_id for card_id in layout if card_id and card_id not in data.cards]
+        if missing:
+            raise KeyError(f"Unknown card(s): {', '.join(missing)}")
+    except (KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"🔍 {args.wave}: {', '.join(gremlin_ids)}")
+    unknown = [g for g in gremlin_ids if g not in data.mobs]
+    if unknown:
+        print(f"⚠️  Not in mob_data, skipped: {', '.join(unknown)}")
+    print_grid(layout)
+    for _, record, message in data.compile_errors([c for c in layout if c] + gremlin_ids):
+        print(f"⚠️  {record}: not simulated: {message}")
+
+    if args.trace:
+        result = Battle(data, layout, gremlin_ids, random.Random(args.seed), args.hero_hp, log=print).run(args.max_ticks)
+        print(f"\n📋 {result.outcome} after {result.ticks:g} ticks, hero HP {result.hero_hp}")
+        return 0
+
+    if args.check:
+        timings = {}
+        outcomes = {}
+        for per_beat in (True, False):
+            start = time.perf_counter()
+            outcomes[per_beat] = simulate(data, layout, args.wave, args.battles, args.seed,
+                                          args.max_ticks, args.hero_hp, per_beat)
+            timings[per_beat] = time.perf_counter() - start
+        mismatches = sum(a != b for a, b in zip(outcomes[True], outcomes[False]))
+        print(f"\n📊 Per-beat {timings[True]:.2f}s, event-skipping {timings[False]:.2f}s "
+              f"({timings[True] / max(timings[False], 1e-9):.1f}x)")
+        if mismatches:
+            print(f"❌ {mismatches} of {args.battles} battles differ between the two modes")
+            return 1
+        print(f"✅ All {args.battles} battles identical")
+        return 0
+
+    start = time.perf_counter()
+    results = simulate(data, layout, args.wave, args.battles, args.seed, args.max_ticks,
+                       args.hero_hp, args.per_beat)
+    elapsed = time.perf_counter() - start
+    summary = summarise(results)
+
+    print("\n" + "=" * 60)
+    print(f"📊 {summary['battles']} battles in {elapsed:.2f}s ({summary['battles'] / max(elapsed, 1e-9):,.0f}/s)")
+    print("=" * 60)
+    print(f"  Win:      {summary['win_rate']:.1%}")
+    print(f"  Loss:     {summary['loss_rate']:.1%}")
+    print(f"  Timeout:  {summary['timeout_rate']:.1%}")
+    print(f"  Mean length:       {summary['mean_ticks']:.1f} ticks")
+    print(f"  Mean hero HP left: {summary['mean_hero_hp']:.1f}")
+    print(f"  Mean damage dealt: {summary['mean_damage_dealt']:.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Python tooling hot paths.
+Generates synthetic projects and sheets at multiples of the real project size,
+times style_check, check_type_safety, build_signature_index, validate_signatures
+and json_exporter.convert_to_json with per-rule/per-stage breakdowns, records
+wall time and peak RSS, and compares against stored baselines.
+
+Wall times are compared relative to a fixed reference workload, so baselines
+recorded on one machine still gate another; the baseline file also records
+the machine it was made on. The reference is timed in each stage's worker
+process right before and after the stage, and stages and reference both keep
+the fastest of --repeat runs, so a noisy moment skews both sides alike. A
+stage that fails, or has no baseline, fails the gate.
+
+Usage:
+    python3 benchmark_tooling.py                      # Compare scales 1,10 against baselines
+    python3 benchmark_tooling.py --scales 1,10,100    # Include the 100x project
+    python3 benchmark_tooling.py --scales 1,10,100 --save-baseline   # Record new baselines
+"""
+
+import contextlib
+import functools
+import io
+import json
+import os
+import platform
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BASELINE_FILE = Path('benchmark_baselines.json')
+BASELINE_VERSION = 3
+DEFAULT_REPEAT = 3           # Runs per stage; the fastest stage and reference times are kept
+DEFAULT_THRESHOLD = 0.25     # Fail when 25% slower / larger than baseline
+RSS_THRESHOLD = 0.50         # Memory is noisier than time; allow more headroom
+MIN_REGRESSION_SECONDS = 0.05  # Ignore regressions smaller than this (timer noise)
+
+CLASS_NAME_PATTERN = re.compile(r'^(class_name\s+)(\w+)', re.MULTILINE)
+
+STAGES = ['style_check', 'type_safety', 'build_signature_index',
+          'validate_signatures', 'convert_to_json']
+
+def generate_project(source: Path, dest: Path, scale: int) -> int:
+    """
+    Write `scale` copies of every script under source into dest/src.
+    Each copy gets a suffixed class_name so the copies stay distinct classes.
+    Returns the number of scripts written.
+    """
+    scripts = [(p.relative_to(source), p.read_text(encoding='utf-8')) for p in sorted(source.rglob('*.gd'))]
+    count = 0
+    for copy in range(scale):
+        root = dest / 'src' / f'copy_{copy}'
+        for rel_path, content in scripts:
+            if copy:
+                content = CLASS_NAME_PATTERN.sub(lambda m: f"{m.group(1)}{m.group(2)}_{copy}", content)
+            target = root / rel_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(content, encoding='utf-8')
+            count += 1
+    return count
+
+def generate_sheet(data_file: Path, scale: int) -> List[List[str]]:
+    """
+    Build raw sheet rows (header + data, as the CSV export returns them) from an
+    exported data JSON, repeated `scale` times with suffixed ids.
+    """
+    with open(data_file, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    header: List[str] = []
+    for record in records:
+        for key, value in record.items():
+            if key not in header and not isinstance(value, (dict, list)):
+                header.append(key)
+
+    id_field = header[0]
+    rows = [header]
+    for copy in range(scale):
+        for record in records:
+            row = []
+            for key in header:
+                value = record.get(key, '')
+                if key == id_field and copy:
+                    value = f"{value}_{copy}"
+                row.append('' if value is None else str(value))
+            rows.append(row)
+    return rows
+
+class StageTimer:
+    """Accumulates time spent in instrumented methods, keyed by method name."""
+
+    def __init__(self):
+        self.totals: Dict[str, float] = {}
+
+    def wrap(self, label: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.totals[label] = self.totals.get(label, 0.0) + time.perf_counter() - start
+        return timed
+
+    def instrument(self, obj, prefixes: tuple, exclude: tuple = ()) -> None:
+        """Replace matching bound methods on an instance with timed versions."""
+        for name in dir(type(obj)):
+            if name in exclude:
+                continue
+            if name.startswith(prefixes) and callable(getattr(obj, name)):
+                setattr(obj, name, self.wrap(name, getattr(obj, name)))
+
+    def breakdown(self) -> Dict[str, float]:
+        return {k: round(v, 4) for k, v in sorted(self.totals.items(), key=lambda kv: -kv[1])}
+
+def _run_style_check(project: Path, timer: StageTimer) -> Dict:
+    from style_check import StyleChecker, find_gd_files
+
+    checker = StyleChecker()
+    timer.instrument(checker, ('check_',), exclude=('check_file',))
+    violations = 0
+    for path in find_gd_files(project / 'src'):
+        violations += len(checker.check_file(path))
+    return {'violations': violations}
+
+def _run_type_safety(project: Path, timer: StageTimer) -> Dict:
+    from check_type_safety import TypeSafetyChecker
+
+    checker = TypeSafetyChecker()
+    timer.instrument(checker, ('_check_', '_split_params', '_is_in_string'))
+    for path in (project / 'src').rglob('*.gd'):
+        checker.check_file(path)
+    return {'errors': len(checker.all_errors), 'warnings': len(checker.all_warnings)}
+
+def _run_build_signature_index(project: Path, timer: StageTimer) -> Dict:
+    from build_signature_index import SignatureIndexBuilder
+
+    builder = SignatureIndexBuilder()
+    timer.instrument(builder, ('extract_', '_parse_', '_smart_split'))
+    builder.build_index(project / 'src')
+    builder.save_index(project / 'SIGNATURES.json')
+    return {'classes': len(builder.signatures['classes'])}
+
+def _run_validate_signatures(project: Path, timer: StageTimer) -> Dict:
+    import validate_signatures
+    from build_signature_index import SignatureIndexBuilder
+
+    signatures_path = project / 'SIGNATURES.json'
+    if not signatures_path.exists():
+        builder = SignatureIndexBuilder()
+        builder.build_index(project / 'src')
+        builder.save_index(signatures_path)
+
+    validator = validate_signatures.SignatureValidator(signatures_path)
+    timer.instrument(validator, ('_get_', '_validate_', '_infer_'))
+    validate_signatures.extract_call_sites = timer.wrap('extract_call_sites', validate_signatures.extract_call_sites)
+    errors = warnings = 0
+    for path in (project / 'src').rglob('*.gd'):
+        file_errors, file_warnings = validator.validate_file(path)
+        errors += len(file_errors)
+        warnings += len(file_warnings)
+    return {'errors': errors, 'warnings': warnings}
+
+def _run_convert_to_json(project: Path, timer: StageTimer) -> Dict:
+    sys.path.insert(0, str(Path('src/scenes/data').resolve()))
+    from json_exporter import PublicSheetsToJsonExporter
+
+    with open(project / 'sheet.json', 'r', encoding='utf-8') as f:
+        rows = json.load(f)
+    exporter = PublicSheetsToJsonExporter()
+    timer.instrument(exporter, ('_convert_', '_parse_', '_apply_', '_create_', '_resolve_'))
+    return {'records': len(exporter.convert_to_json(rows))}
+
+STAGE_RUNNERS = {
+    'style_check': _run_style_check,
+    'type_safety': _run_type_safety,
+    'build_signature_index': _run_build_signature_index,
+    'validate_signatures': _run_validate_signatures,
+    'convert_to_json': _run_convert_to_json,
+}
+
+def reference_workload() -> int:
+    """
+    Fixed pure-Python work (regex scans, string splits, dict inserts, like the
+    stages do) that wall times are divided by. It must not change, or every
+    baseline has to be re-recorded.
+    """
+    text = '\n'.join(f'func f_{i}(a: int, b: String = "x") -> void:\n\tvar v_{i} := a + {i}' for i in range(20000))
+    pattern = re.compile(r'func\s+(\w+)\((.*?)\)')
+    names: Dict[str, List[str]] = {}
+    for _ in range(5):
+        for match in pattern.finditer(text):
+            names[match.group(1)] = [param.strip() for param in match.group(2).split(',')]
+    return len(names)
+
+def time_reference() -> float:
+    """One run of reference_workload, in seconds."""
+    start = time.perf_counter()
+    reference_workload()
+    return time.perf_counter() - start
+
+def machine_info() -> Dict[str, str]:
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'python': platform.python_version(),
+        'cpus': str(os.cpu_count()),
+    }
+
+def run_stage(stage: str, project: Path) -> Dict:
+    """Run one stage in this process, bracketed by reference runs, and return its measurements."""
+    timer = StageTimer()
+    reference = time_reference()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        counts = STAGE_RUNNERS[stage](project, timer)
+    wall = time.perf_counter() - start
+    reference = min(reference, time_reference())
+    return {
+        'wall_s': round(wall, 4),
+        'reference_s': round(reference, 4),
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'breakdown': timer.breakdown(),
+        'counts': counts,
+    }
+
+def run_stage_isolated(stage: str, project: Path) -> Optional[Dict]:
+    """Run a stage in a fresh interpreter so peak RSS belongs to that stage alone."""
+    result = subprocess.run(
+        [sys.executable, __file__, '--worker', stage, str(project)],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(f"  ⚠️  {stage} failed: {result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'no output'}")
+        return None
+    return json.loads(result.stdout)
+
+def prepare_project(workdir: Path, scale: int) -> Path:
+    project = workdir / f'scale_{scale}'
+    scripts = generate_project(Path('src'), project, scale)
+    rows = generate_sheet(Path('src/scenes/data/card_data.json'), scale)
+    with open(project / 'sheet.json', 'w', encoding='utf-8') as f:
+        json.dump(rows, f)
+    print(f"📦 Scale {scale}x: {scripts} scripts, {len(rows) - 1} sheet rows")
+    return project
+
+def compare(results: Dict[str, Dict], baselines: Dict[str, Dict], threshold: float) -> List[str]:
+    """
+    Return a message for every measurement that regressed past its threshold.
+    Wall times are compared in reference units; the baseline is converted to
+    seconds with the reference timed next to the stage, for the message and
+    the noise floor.
+    """
+    regressions = []
+    for key, result in results.items():
+        baseline = baselines.get(key)
+        if not baseline:
+            continue
+        wall, base_wall = result['wall_s'], baseline['relative'] * result['reference_s']
+        if result['relative'] > baseline['relative'] * (1 + threshold) and wall - base_wall > MIN_REGRESSION_SECONDS:
+            regressions.append(f"{key}: wall {base_wall:.3f}s -> {wall:.3f}s (+{(wall / base_wall - 1) * 100:.0f}%, "
+                               f"scaled from the baseline machine)")
+        rss, base_rss = result['peak_rss_kb'], baseline['peak_rss_kb']
+        if rss > base_rss * (1 + RSS_THRESHOLD):
+            regressions.append(f"{key}: peak RSS {base_rss // 1024}MB -> {rss // 1024}MB")
+    return regressions
+
+def print_result(key: str, result: Dict, baseline: Optional[Dict], top: int) -> None:
+    delta = ""
+    if baseline and baseline['relative']:
+        delta = f" ({(result['relative'] / baseline['relative'] - 1) * 100:+.0f}% vs baseline)"
+    print(f"  {key:<32} {result['wall_s']:>8.3f}s  {result['peak_rss_kb'] // 1024:>5}MB{delta}")
+    for name, seconds in list(result['breakdown'].items())[:top]:
+        print(f"      {name:<36} {seconds:>8.3f}s")
+
+def main():
+    """Run the benchmark suite and gate on regressions."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the Python tooling against stored baselines")
+    parser.add_argument('--scales', default='1,10', help='Comma-separated project multiples (e.g. 1,10,100)')
+    parser.add_argument('--stages', default=','.join(STAGES), help='Comma-separated stages to run')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'Runs per stage; the fastest is kept (default {DEFAULT_REPEAT})')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed wall-time regression as a fraction (default 0.25)')
+    parser.add_argument('--baseline', default=str(BASELINE_FILE), help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--top', type=int, default=3, help='Breakdown entries to show per stage')
+    parser.add_argument('--worker', nargs=2, metavar=('STAGE', 'PROJECT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        stage, project = args.worker
+        print(json.dumps(run_stage(stage, Path(project))))
+        return 0
+
+    if not Path('src').exists():
+        print("❌ Run from elastic-app/app (src/ not found)")
+        return 1
+
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = [s for s in stages if s not in STAGE_RUNNERS]
+    if unknown:
+        print(f"❌ Unknown stage(s): {', '.join(unknown)}")
+        return 1
+
+    baseline_path = Path(args.baseline)
+    stored: Dict = {}
+    if baseline_path.exists():
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        if stored.get('version') != BASELINE_VERSION and not args.save_baseline:
+            print(f"❌ {baseline_path} predates relative baselines; re-record it with --save-baseline")
+            return 1
+    baselines: Dict[str, Dict] = stored.get('results', {}) if stored.get('version') == BASELINE_VERSION else {}
+
+    print("⏱️  Tooling benchmark")
+    print("=" * 60)
+    machine = machine_info()
+    if stored.get('machine') and stored['machine'] != machine:
+        print(f"   Baselines come from another machine ({stored['machine'].get('platform')}); "
+              f"comparing in reference units")
+
+    results: Dict[str, Dict] = {}
+    failed: List[str] = []
+    workdir = Path(tempfile.mkdtemp(prefix='tooling_bench_'))
+    try:
+        for scale in scales:
+            project = prepare_project(workdir, scale)
+            for stage in stages:
+                best = None
+                reference = float('inf')
+                for _ in range(max(args.repeat, 1)):
+                    result = run_stage_isolated(stage, project)
+                    if result is None:
+                        continue
+                    reference = min(reference, result['reference_s'])
+                    if best is None or result['wall_s'] < best['wall_s']:
+                        best = result
+                key = f"{stage}@{scale}x"
+                if best is None:
+                    failed.append(key)
+                    continue
+                # Same min-of-N policy on both sides of the ratio
+                best['reference_s'] = reference
+                best['relative'] = round(best['wall_s'] / reference, 3)
+                results[key] = best
+                print_result(key, best, baselines.get(key), args.top)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("=" * 60)
+    reference_s = min((r['reference_s'] for r in results.values()), default=0.0)
+    if results:
+        print(f"📏 Reference workload: {reference_s:.3f}s (fastest next to any stage)")
+    if failed:
+        print(f"❌ Stage(s) failed: {', '.join(failed)}")
+        if args.save_baseline:
+            print("   Baselines not saved")
+        return 1
+    if args.save_baseline:
+        baselines.update(results)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': BASELINE_VERSION, 'machine': machine, 'reference_s': round(reference_s, 4),
+                       'results': baselines}, f, indent=2, sort_keys=True)
+        print(f"💾 Saved {len(results)} baseline(s) to {baseline_path}")
+        return 0
+
+    missing = [key for key in results if key not in baselines]
+    regressions = compare(results, baselines, args.threshold)
+    if regressions:
+        print("❌ Performance regressions:")
+        for message in regressions:
+            print(f"  - {message}")
+    if missing:
+        print(f"❌ No baseline for: {', '.join(missing)}; record them with --save-baseline")
+    if regressions or missing:
+        return 1
+    print("✅ No regressions past threshold")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -183,6 +183,10 @@ class SignatureIndexBuilder:
                 params = self._parse_parameters(params_str)
                 class_data["constructors"]["new"] = {"params": params}
             
+            # A top-level _init() defines the arguments of ClassName.new()
+            if "new" not in class_data["constructors"] and "_init" in class_data["methods"]:
+                class_data["constructors"]["new"] = {"params": class_data["methods"]["_init"]["params"]}
+            
             # If class extends Resource/RefCounted and no explicit new(), it has default 0-arg constructor
             if class_data["extends"] in ["Resource", "RefCounted", "Node", "Object"] and "new" not in class_data["constructors"]:
                 class_data["constructors"]["new"] = {"params": []}
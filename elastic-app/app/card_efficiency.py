@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Per-card efficiency table over card_data.json.
+Turns every card's on_fire_effect, production_interval and time_cost into a
+throughput vector that can be sorted and plotted instead of reading
+rules_text by eye:
+
+- <force>_per_tick: net force per tick for each of the ten forces
+  (generate_/add_ minus consume_/pay_), any_color_per_tick for the
+  consume_largest/consume_smallest payments
+- damage_per_tick (damage, pierce_damage, pop_damage; an _all hit counts
+  once), poison_per_tick (stacks applied) and draw_per_tick
+- *_played: the same rates over --horizon ticks of the gear running plus the
+  time_cost spent playing it, so cheap cards rank above expensive ones with
+  the same output
+
+A gear fires once per production_interval ticks; one with no interval never
+fires and has an all-zero vector. A self_destruct or momentary card fires
+once, so its output is spread over the horizon. Keys the vector does not
+model (activate_, execute, burn, discard, mill, complex_ and the keys
+effect_compiler marks unmodelled, such as heal or card_tax) are listed in
+the unmodelled column.
+
+Rows are cached by a hash of the card record and of the sources that compute
+a row in .card_efficiency_cache.json, so after a sheet sync only the cards
+that changed are recomputed, and editing this file or effect_compiler.py
+recomputes them all.
+
+Usage:
+    python3 card_efficiency.py                              # CSV on stdout
+    python3 card_efficiency.py -o card_efficiency.json --sort damage_per_tick_played
+    python3 card_efficiency.py -o card_efficiency.csv --no-cache
+"""
+
+import csv
+import functools
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from effect_compiler import (COMPLEX_EFFECTS, DIRECTIONS, FORCE_NAMES, OP_ACTIVATE, OP_BURN, OP_COMPLEX,
+                             OP_CONSUME, OP_CONSUME_LARGEST, OP_CONSUME_SMALLEST, OP_DAMAGE, OP_DISCARD, OP_DRAW,
+                             OP_EXECUTE, OP_GENERATE, OP_MILL, OP_MOMENTARY, OP_PIERCE_DAMAGE, OP_POISON,
+                             OP_POP_DAMAGE, OP_SELF_DESTRUCT, OP_UNMODELLED, OPCODE_NAMES, UNMODELLED_EFFECTS,
+                             compile_effect)
+from wave_difficulty import DATA_PATH, _load_records, _number
+
+CACHE_FILE = Path(".card_efficiency_cache.json")
+CACHE_VERSION = 2
+ROW_SOURCES = ('card_efficiency.py', 'effect_compiler.py', 'wave_difficulty.py')
+DEFAULT_HORIZON = 30           # Ticks a played gear is assumed to run
+RARITY_PREFIX = 'Card.RarityType.'
+UNMODELLED_OPS = (OP_ACTIVATE, OP_EXECUTE, OP_BURN, OP_DISCARD, OP_MILL, OP_COMPLEX, OP_UNMODELLED)
+
+FORCE_FIELDS = [f'{name}_per_tick' for name in FORCE_NAMES]
+OUTPUT_FIELDS = (['card_template_id', 'display_name', 'rarity', 'tags', 'time_cost', 'production_interval', 'once']
+                 + FORCE_FIELDS
+                 + ['any_color_per_tick', 'forces_per_tick', 'damage_per_tick', 'poison_per_tick', 'draw_per_tick',
+                    'forces_per_tick_played', 'damage_per_tick_played', 'draw_per_tick_played',
+                    'unmodelled', 'errors'])
+
+@functools.lru_cache(maxsize=None)
+def sources_digest() -> str:
+    """Hash of the sources efficiency_row() depends on."""
+    digest = hashlib.sha1()
+    for name in ROW_SOURCES:
+        path = Path(__file__).resolve().parent / name
+        digest.update(path.read_bytes() if path.exists() else b'')
+    return digest.hexdigest()
+
+def card_digest(card: Dict, horizon: int) -> str:
+    """Content hash of a card record and the settings and sources its row depends on."""
+    raw = json.dumps([CACHE_VERSION, sources_digest(), horizon, card], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def efficiency_row(card: Dict, horizon: int = DEFAULT_HORIZON) -> Dict:
+    """One card's throughput vector; see the module docstring for the columns."""
+    errors: List[str] = []
+    code = compile_effect(card.get('on_fire_effect'), errors)
+    triples = list(zip(code[0::3], code[1::3], code[2::3]))
+    interval = int(_number(card.get('production_interval', 0)))
+    time_cost = _number(card.get('time_cost', 0))
+    once = any(op == OP_SELF_DESTRUCT or (op == OP_MOMENTARY and value > 0) for op, _, value in triples)
+
+    # Fires per tick: a repeating gear fires every interval, a one-shot gear once per horizon
+    if interval <= 0:
+        rate = 0.0
+    elif once:
+        rate = 1 / max(interval, horizon)
+    else:
+        rate = 1 / interval
+
+    forces = [0.0] * len(FORCE_NAMES)
+    any_color = damage = poison = draw = 0.0
+    unmodelled: List[str] = []
+    for op, operand, value in triples:
+        if op == OP_GENERATE:
+            forces[operand] += value
+        elif op == OP_CONSUME:
+            forces[operand] -= int(value)
+        elif op in (OP_CONSUME_LARGEST, OP_CONSUME_SMALLEST):
+            any_color -= int(value)
+        elif op in (OP_DAMAGE, OP_PIERCE_DAMAGE, OP_POP_DAMAGE):
+            damage += value
+        elif op == OP_POISON:
+            poison += value
+        elif op == OP_DRAW:
+            draw += value
+        elif op in UNMODELLED_OPS:
+            if op == OP_ACTIVATE:
+                unmodelled.append(f'activate_{DIRECTIONS[operand]}')
+            elif op == OP_COMPLEX:
+                unmodelled.append(f'complex_{COMPLEX_EFFECTS[operand]}')
+            elif op == OP_UNMODELLED:
+                unmodelled.append(UNMODELLED_EFFECTS[operand])
+            else:
+                unmodelled.append(OPCODE_NAMES[op])
+
+    # Amortise the time spent playing the card over the ticks it then runs
+    played = horizon / (horizon + time_cost) if horizon + time_cost > 0 else 0.0
+    row = {
+        'card_template_id': card.get('card_template_id'),
+        'display_name': card.get('display_name', ''),
+        'rarity': str(card.get('card_rarity', '')).replace(RARITY_PREFIX, ''),
+        'tags': '|'.join(t.strip() for t in str(card.get('tags') or '').split(',') if t.strip()),
+        'time_cost': int(time_cost) if time_cost == int(time_cost) else time_cost,
+        'production_interval': interval,
+        'once': once,
+    }
+    for name, amount in zip(FORCE_FIELDS, forces):
+        row[name] = round(amount * rate, 4)
+    total_forces = sum(forces) + any_color
+    row.update({
+        'any_color_per_tick': round(any_color * rate, 4),
+        'forces_per_tick': round(total_forces * rate, 4),
+        'damage_per_tick': round(damage * rate, 4),
+        'poison_per_tick': round(poison * rate, 4),
+        'draw_per_tick': round(draw * rate, 4),
+        'forces_per_tick_played': round(total_forces * rate * played, 4),
+        'damage_per_tick_played': round(damage * rate * played, 4),
+        'draw_per_tick_played': round(draw * rate * played, 4),
+        'unmodelled': '|'.join(unmodelled),
+        'errors': '; '.join(errors),
+    })
+    return row
+
+class EfficiencyTable:
+    """Computes card rows with a content-hash cache so unchanged cards are not recomputed."""
+
+    def __init__(self, horizon: int = DEFAULT_HORIZON, cache_path: Optional[Path] = CACHE_FILE):
+        self.horizon = horizon
+        self.cache_path = cache_path
+        self.cache: Dict[str, Dict] = {}
+        self.seen_digests: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        if cache_path and cache_path.exists():
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.cache = data.get("entries", {})
+            except (OSError, ValueError):
+                self.cache = {}
+
+    def row(self, card: Dict) -> Dict:
+        digest = card_digest(card, self.horizon)
+        self.seen_digests.add(digest)
+        cached = self.cache.get(digest)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        row = efficiency_row(card, self.horizon)
+        self.cache[digest] = row
+        return row
+
+    def rows(self, cards: List[Dict]) -> List[Dict]:
+        return [self.row(card) for card in cards if card.get('card_template_id')]
+
+    def save(self) -> None:
+        """Persist entries for the cards seen in this run, dropping stale ones."""
+        if not self.cache_path:
+            return
+        entries = {k: v for k, v in self.cache.items() if k in self.seen_digests}
+        try:
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f)
+        except OSError as e:
+            print(f"Warning: could not write {self.cache_path}: {e}", file=sys.stderr)
+
+def write_rows(rows: List[Dict], output: Optional[str], fmt: str) -> None:
+    """CSV or JSON to a file, or to stdout when output is None."""
+    f = open(output, 'w', encoding='utf-8', newline='') if output else sys.stdout
+    try:
+        if fmt == 'json':
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        else:
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS, lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(rows)
+    finally:
+        if output:
+            f.close()
+
+def main():
+    """Write the per-card efficiency table as CSV or JSON."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-card throughput table over card_data.json")
+    parser.add_argument('-o', '--output', help='Write the table to this file instead of stdout')
+    parser.add_argument('--format', choices=('csv', 'json'),
+                        help='Output format (default: from the --output extension, else csv)')
+    parser.add_argument('--sort', default='card_template_id', choices=OUTPUT_FIELDS, metavar='COLUMN',
+                        help='Column to sort by; numeric columns sort highest first (default: card_template_id)')
+    parser.add_argument('--horizon', type=int, default=DEFAULT_HORIZON,
+                        help=f'Ticks a played gear runs, for the *_played columns (default: {DEFAULT_HORIZON})')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not update the cache')
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with card_data.json')
+    args = parser.parse_args()
+
+    cards = _load_records(Path(args.data) / 'card_data.json')
+    if not cards:
+        print("❌ card_data.json has no cards", file=sys.stderr)
+        return 1
+    table = EfficiencyTable(max(1, args.horizon), cache_path=None if args.no_cache else CACHE_FILE)
+    rows = table.rows(cards)
+    table.save()
+
+    if isinstance(rows[0][args.sort], str):
+        rows.sort(key=lambda r: (r[args.sort], r['card_template_id']))
+    else:
+        rows.sort(key=lambda r: (-r[args.sort], r['card_template_id']))
+    fmt = args.format or ('json' if args.output and args.output.endswith('.json') else 'csv')
+    write_rows(rows, args.output, fmt)
+
+    print(f"📊 {len(rows)} cards ({table.hits} cached, {table.misses} computed)", file=sys.stderr)
+    failed = [r['card_template_id'] for r in rows if r['errors']]
+    if failed:
+        print(f"⚠️  {len(failed)} card(s) with effect keys that did not compile: {', '.join(failed)}",
+              file=sys.stderr)
+    if args.output:
+        print(f"📄 Wrote {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
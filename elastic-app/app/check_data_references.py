@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Cross-reference check over the exported data JSONs.
+Every id one sheet refers to must exist in the sheet that defines it:
+wave gremlins and mob summons must be mob template_ids (or random_<size>
+for a size some mob has), hero starting relics must be relic ids, and no
+file may define the same id twice. Card effects and gremlin moves must
+compile (see effect_compiler.py).
+
+Usage:
+    python3 check_data_references.py [--data DIR]
+"""
+
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+from effect_compiler import compile_data
+from wave_difficulty import DATA_PATH, DifficultyScorer, _load_records, parse_gremlins
+
+# Id field of each data file
+ID_FIELDS = {
+    'card_data.json': 'card_template_id',
+    'mob_data.json': 'template_id',
+    'wave_data.json': 'wave_id',
+    'relic_data.json': 'relic_template_id',
+    'hero_data.json': 'template_name',
+    'goals_data.json': 'template_name',
+}
+
+class Problem(NamedTuple):
+    file: str
+    record: str
+    message: str
+
+def _load(data_path: Path, filename: str) -> List[Dict]:
+    path = data_path / filename
+    return _load_records(path) if path.exists() else []
+
+def check_references(data_path: Path = DATA_PATH) -> List[Problem]:
+    """Every dangling reference and duplicate id across the data files."""
+    problems: List[Problem] = []
+
+    for filename, id_field in ID_FIELDS.items():
+        counts = Counter(str(r.get(id_field)) for r in _load(data_path, filename) if r.get(id_field))
+        for record_id, count in counts.items():
+            if count > 1:
+                problems.append(Problem(filename, record_id, f"{id_field} defined {count} times"))
+
+    mobs = {m['template_id']: m for m in _load(data_path, 'mob_data.json') if m.get('template_id')}
+    sizes = {m.get('size_category') for m in mobs.values() if m.get('size_category')}
+    scorer = DifficultyScorer(mobs)
+
+    for wave in _load(data_path, 'wave_data.json'):
+        wave_id = str(wave.get('wave_id', '?'))
+        gremlins = parse_gremlins(wave.get('gremlins'))
+        if not gremlins:
+            problems.append(Problem('wave_data.json', wave_id, "no gremlins"))
+        for gremlin in scorer.unknown(gremlins):
+            problems.append(Problem('wave_data.json', wave_id, f"unknown gremlin '{gremlin}'"))
+
+    for mob_id, mob in mobs.items():
+        for key, value, _ in scorer.moves(mob):
+            if key != 'summon':
+                continue
+            if value.startswith('random_'):
+                if value[len('random_'):] not in sizes:
+                    problems.append(Problem('mob_data.json', mob_id, f"summons unknown size '{value}'"))
+            elif value not in mobs:
+                problems.append(Problem('mob_data.json', mob_id, f"summons unknown gremlin '{value}'"))
+
+    cards = _load(data_path, 'card_data.json')
+    compiled = compile_data(cards, list(mobs.values()))
+    problems.extend(Problem(*error) for error in compiled.errors)
+
+    relics = {str(r.get('relic_template_id')) for r in _load(data_path, 'relic_data.json')}
+    for hero in _load(data_path, 'hero_data.json'):
+        relic = hero.get('starting_relic')
+        if relic and relic not in relics:
+            problems.append(Problem('hero_data.json', str(hero.get('template_name', '?')),
+                                    f"unknown starting_relic '{relic}'"))
+
+    return problems
+
+def print_problems(problems: List[Problem]) -> None:
+    for problem in problems:
+        print(f"  ❌ {problem.file}: {problem.record}: {problem.message}")
+    if problems:
+        print(f"\n⚠️  {len(problems)} cross-reference problem(s)")
+    else:
+        print("✅ All cross-references resolve")
+
+def main():
+    """Check the data JSONs and exit non-zero on dangling references."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cross-reference check over the exported data JSONs")
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with the exported JSON files')
+    args = parser.parse_args()
+
+    problems = check_references(Path(args.data))
+    print_problems(problems)
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,56 @@
 #!/usr/bin/env python3
 """
-Check for duplicate class_name declarations in GDScript files.
-Duplicate class names will cause compilation errors in Godot.
+Check for symbol collisions in GDScript files.
+Duplicate class names will cause compilation errors in Godot, and so will
+autoloads that share a name with a class_name, inner classes that shadow a
+global class, signals redeclared along an inheritance chain and duplicate
+enum constants.
+
+Each file is read once and scanned in a single pass. Per-file results are
+cached by content hash, so unchanged files cost a hash and a dict lookup.
 """
 
+import hashlib
+import json
 import os
 import sys
 import re
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Set, Tuple
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Set, Tuple
+
+CACHE_FILE = Path(".symbol_cache.json")
+CACHE_VERSION = 2
+
+CLASS_NAME_PATTERN = re.compile(r'^class_name\s+(\w+)(?:\s+extends\s+(\w+))?')
+EXTENDS_PATTERN = re.compile(r'^extends\s+(?:"([^"]+)"|\'([^\']+)\'|(\w+))')
+INNER_CLASS_PATTERN = re.compile(r'^class\s+(\w+)')
+SIGNAL_PATTERN = re.compile(r'^signal\s+(\w+)')
+ENUM_PATTERN = re.compile(r'^enum\s*(\w*)\s*\{(.*)$')
+
+@dataclass
+class ScriptSymbols:
+    """
+    Symbols declared by one script. Scopes are "" for the script itself and
+    the dotted inner class path (e.g. "Outer.Inner") for inner classes.
+    """
+    path: str
+    class_name: Optional[str] = None
+    extends: Optional[str] = None
+    # (scope, class name, line)
+    inner_classes: List[Tuple[str, str, int]] = field(default_factory=list)
+    # (scope, signal name, line)
+    signals: List[Tuple[str, str, int]] = field(default_factory=list)
+    # (scope, enum name or "" for anonymous enums, constant, line)
+    enum_constants: List[Tuple[str, str, str, int]] = field(default_factory=list)
+
+@dataclass
+class Collision:
+    kind: str
+    symbol: str
+    locations: List[str]
+    message: str
 
 def find_gd_files(directory: str = "src") -> List[Path]:
     """Find all .gd files in the directory."""
@@ -20,78 +61,354 @@ def find_gd_files(directory: str = "src") -> List[Path]:
                 gd_files.append(Path(root) / file)
     return gd_files
 
+def _strip_comment(line: str) -> str:
+    """Drop a trailing # comment, ignoring # inside string literals."""
+    if '#' not in line:
+        return line
+    quote = None
+    for i, char in enumerate(line):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '#':
+            return line[:i]
+    return line
+
+def scan_source(path: str, content: str) -> ScriptSymbols:
+    """Collect all symbols needed by the collision checks in one pass over the lines."""
+    symbols = ScriptSymbols(path=path)
+    scopes: List[Tuple[int, str]] = []  # (indent, name) of the enclosing inner classes
+    enum_scope = ""
+    enum_name: Optional[str] = None  # Set while inside an enum body
+    enum_body = ""
+    enum_line = 0
+
+    for line_num, raw_line in enumerate(content.splitlines(), 1):
+        line = _strip_comment(raw_line).rstrip()
+        if not line.strip():
+            continue
+
+        if enum_name is not None:
+            enum_body += " " + line
+            if '}' in line:
+                _add_enum_constants(symbols, enum_scope, enum_name, enum_body.split('}', 1)[0], enum_line)
+                enum_name = None
+            continue
+
+        stripped = line.lstrip()
+        indent = len(line) - len(stripped)
+        while scopes and indent <= scopes[-1][0]:
+            scopes.pop()
+        scope = ".".join(name for _, name in scopes)
+
+        first = stripped[0]
+        if first == 'c':
+            match = CLASS_NAME_PATTERN.match(stripped)
+            if match and not indent:
+                symbols.class_name = match.group(1)
+                if match.group(2) and symbols.extends is None:
+                    symbols.extends = match.group(2)
+                continue
+            match = INNER_CLASS_PATTERN.match(stripped)
+            if match:
+                symbols.inner_classes.append((scope, match.group(1), line_num))
+                scopes.append((indent, match.group(1)))
+                continue
+        elif first == 'e':
+            match = EXTENDS_PATTERN.match(stripped)
+            if match and not indent:
+                if symbols.extends is None:
+                    symbols.extends = match.group(1) or match.group(2) or match.group(3)
+                continue
+            match = ENUM_PATTERN.match(stripped)
+            if match:
+                body = match.group(2)
+                if '}' in body:
+                    _add_enum_constants(symbols, scope, match.group(1), body.split('}', 1)[0], line_num)
+                else:
+                    enum_scope, enum_name, enum_body, enum_line = scope, match.group(1), body, line_num
+                continue
+        elif first == 's':
+            match = SIGNAL_PATTERN.match(stripped)
+            if match:
+                symbols.signals.append((scope, match.group(1), line_num))
+                continue
+
+    return symbols
+
+def _add_enum_constants(symbols: ScriptSymbols, scope: str, enum_name: str, body: str, line_num: int) -> None:
+    for entry in body.split(','):
+        constant = entry.split('=', 1)[0].strip()
+        if constant:
+            symbols.enum_constants.append((scope, enum_name, constant, line_num))
+
+class SymbolScanner:
+    """Scans scripts with a content-hash cache so unchanged files are not reparsed."""
+
+    def __init__(self, cache_path: Optional[Path] = CACHE_FILE):
+        self.cache_path = cache_path
+        self.cache: Dict[str, Dict] = {}
+        self.seen_digests: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        if cache_path and cache_path.exists():
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.cache = data.get("entries", {})
+            except (OSError, ValueError):
+                self.cache = {}
+
+    def scan(self, file_path: Path) -> Optional[ScriptSymbols]:
+        try:
+            raw = file_path.read_bytes()
+        except OSError as e:
+            print(f"Error reading {file_path}: {e}", file=sys.stderr)
+            return None
+
+        digest = hashlib.sha1(raw).hexdigest()
+        self.seen_digests.add(digest)
+        cached = self.cache.get(digest)
+        if cached is not None:
+            self.hits += 1
+            symbols = ScriptSymbols(**cached)
+            symbols.path = str(file_path)
+            # JSON turns tuples into lists
+            symbols.inner_classes = [tuple(x) for x in symbols.inner_classes]
+            symbols.signals = [tuple(x) for x in symbols.signals]
+            symbols.enum_constants = [tuple(x) for x in symbols.enum_constants]
+            return symbols
+
+        self.misses += 1
+        symbols = scan_source(str(file_path), raw.decode('utf-8', errors='replace'))
+        self.cache[digest] = asdict(symbols)
+        return symbols
+
+    def save(self) -> None:
+        """Persist entries for the files seen in this run, dropping stale ones."""
+        if not self.cache_path:
+            return
+        entries = {k: v for k, v in self.cache.items() if k in self.seen_digests}
+        try:
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f)
+        except OSError as e:
+            print(f"Warning: could not write {self.cache_path}: {e}", file=sys.stderr)
+
+def get_autoloads(project_file: Path = Path("project.godot")) -> Dict[str, str]:
+    """Read autoload name -> script path from project.godot."""
+    autoloads = {}
+    if not project_file.exists():
+        return autoloads
+    in_section = False
+    with open(project_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith('['):
+                in_section = stripped == '[autoload]'
+                continue
+            if in_section and '=' in stripped:
+                name, value = stripped.split('=', 1)
+                autoloads[name.strip()] = value.strip().strip('"').lstrip('*')
+    return autoloads
+
 def extract_class_names(file_path: Path) -> List[str]:
-    """Extract all class_name declarations from a GDScript file."""
-    class_names = []
+    """Extract the class_name and every inner class name declared in a GDScript file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Find all class_name declarations
-        # Pattern matches: class_name ClassName or class_name ClassName extends BaseClass
-        pattern = r'^class_name\s+(\w+)'
-        matches = re.finditer(pattern, content, re.MULTILINE)
-        
-        for match in matches:
-            class_name = match.group(1)
-            class_names.append(class_name)
-            
+        content = file_path.read_text(encoding='utf-8')
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
-        
-    return class_names
+        return []
+    symbols = scan_source(str(file_path), content)
+    names = [symbols.class_name] if symbols.class_name else []
+    return names + [name for _, name, _ in symbols.inner_classes]
+
+def _res_path(file_path: str, project_root: Path = Path(".")) -> str:
+    """Map a filesystem path to its res:// path under the project root."""
+    path = Path(file_path).resolve()
+    try:
+        return "res://" + path.relative_to(project_root.resolve()).as_posix()
+    except ValueError:
+        # Outside the project; there is no res:// path that could refer to it
+        return path.as_posix()
+
+def find_collisions(scripts: List[ScriptSymbols], autoloads: Dict[str, str]) -> List[Collision]:
+    """Run every collision check over the scanned scripts."""
+    collisions: List[Collision] = []
+
+    class_to_files: Dict[str, List[str]] = defaultdict(list)
+    for script in scripts:
+        if script.class_name:
+            class_to_files[script.class_name].append(script.path)
+
+    # Duplicate class_name
+    for class_name, files in sorted(class_to_files.items()):
+        if len(files) > 1:
+            collisions.append(Collision(
+                "duplicate_class", class_name, files,
+                f"Class '{class_name}' is defined in {len(files)} files"))
+
+    # Autoload singleton vs class_name
+    for name, path in sorted(autoloads.items()):
+        if name in class_to_files:
+            collisions.append(Collision(
+                "autoload_class", name, [f"project.godot ({path})"] + class_to_files[name],
+                f"Autoload '{name}' has the same name as a class_name"))
+
+    # Inner classes shadowing global classes (including the script's own
+    # class_name) or autoloads, and inner classes declared twice in one scope
+    for script in scripts:
+        seen_inner: Dict[Tuple[str, str], int] = {}
+        for scope, inner_name, line_num in script.inner_classes:
+            label = f"{scope}.{inner_name}" if scope else inner_name
+            if (scope, inner_name) in seen_inner:
+                collisions.append(Collision(
+                    "duplicate_inner_class", label,
+                    [f"{script.path}:{seen_inner[(scope, inner_name)]}", f"{script.path}:{line_num}"],
+                    f"Inner class '{label}' is declared twice in the same script"))
+            else:
+                seen_inner[(scope, inner_name)] = line_num
+
+            if inner_name in class_to_files:
+                collisions.append(Collision(
+                    "inner_class_shadow", inner_name,
+                    [f"{script.path}:{line_num}"] + class_to_files[inner_name],
+                    f"Inner class '{label}' shadows global class '{inner_name}'"))
+            elif inner_name in autoloads:
+                collisions.append(Collision(
+                    "inner_class_shadow", inner_name, [f"{script.path}:{line_num}"],
+                    f"Inner class '{label}' shadows autoload '{inner_name}'"))
+
+    # Signals: duplicates within one class scope, and script-level signals
+    # along the inheritance chain
+    by_class = {s.class_name: s for s in scripts if s.class_name}
+    by_res_path = {_res_path(s.path): s for s in scripts}
+
+    def parent_of(script: ScriptSymbols) -> Optional[ScriptSymbols]:
+        if not script.extends:
+            return None
+        if script.extends.startswith("res://"):
+            return by_res_path.get(script.extends)
+        return by_class.get(script.extends)
+
+    for script in scripts:
+        seen: Dict[Tuple[str, str], int] = {}
+        for scope, signal_name, line_num in script.signals:
+            if (scope, signal_name) in seen:
+                label = f"{scope}.{signal_name}" if scope else signal_name
+                collisions.append(Collision(
+                    "duplicate_signal", label,
+                    [f"{script.path}:{seen[(scope, signal_name)]}", f"{script.path}:{line_num}"],
+                    f"Signal '{label}' is declared twice in the same script"))
+            else:
+                seen[(scope, signal_name)] = line_num
+
+        own_signals = [(name, line_num) for scope, name, line_num in script.signals if not scope]
+        ancestor = parent_of(script)
+        visited = {script.path}
+        while ancestor and ancestor.path not in visited:
+            visited.add(ancestor.path)
+            inherited = {name: line_num for scope, name, line_num in ancestor.signals if not scope}
+            for signal_name, line_num in own_signals:
+                if signal_name in inherited:
+                    collisions.append(Collision(
+                        "inherited_signal", signal_name,
+                        [f"{script.path}:{line_num}", f"{ancestor.path}:{inherited[signal_name]}"],
+                        f"Signal '{signal_name}' redeclares a signal inherited from "
+                        f"{ancestor.class_name or ancestor.path}"))
+            ancestor = parent_of(ancestor)
+
+    # Enum constants: duplicates inside a named enum, and anonymous enum
+    # constants that collide in their class scope
+    for script in scripts:
+        seen_constants: Dict[Tuple[str, str, str], int] = {}
+        for scope, enum_name, constant, line_num in script.enum_constants:
+            key = (scope, enum_name, constant)
+            if key in seen_constants:
+                label = ".".join(part for part in (scope, enum_name, constant) if part)
+                collisions.append(Collision(
+                    "duplicate_enum_constant", label,
+                    [f"{script.path}:{seen_constants[key]}", f"{script.path}:{line_num}"],
+                    f"Enum constant '{label}' is declared more than once"))
+            else:
+                seen_constants[key] = line_num
+
+    return collisions
+
+def scan_project(directory: str = "src", scanner: Optional[SymbolScanner] = None) -> List[ScriptSymbols]:
+    """Scan every script under directory, reading each file once."""
+    scanner = scanner or SymbolScanner(cache_path=None)
+    scripts = []
+    for file_path in find_gd_files(directory):
+        symbols = scanner.scan(file_path)
+        if symbols:
+            scripts.append(symbols)
+    return scripts
 
 def check_duplicate_classes(directory: str = "src") -> Dict[str, List[Path]]:
     """Check for duplicate class_name declarations across all GDScript files."""
     class_to_files = defaultdict(list)
-    
-    gd_files = find_gd_files(directory)
-    
-    for file_path in gd_files:
-        class_names = extract_class_names(file_path)
-        for class_name in class_names:
-            class_to_files[class_name].append(file_path)
-    
+    for script in scan_project(directory):
+        if script.class_name:
+            class_to_files[script.class_name].append(Path(script.path))
+
     # Filter to only duplicates
     duplicates = {
-        class_name: files 
-        for class_name, files in class_to_files.items() 
+        class_name: files
+        for class_name, files in class_to_files.items()
         if len(files) > 1
     }
-    
+
     return duplicates
 
 def main():
-    """Main function to check for duplicate classes."""
-    print("🔍 Checking for duplicate class names...")
+    """Main function to check for symbol collisions."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check GDScript files for duplicate and colliding symbols")
+    parser.add_argument('directory', nargs='?', default='src', help='Directory to scan (default: src)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not update the symbol cache')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Show cache statistics')
+    args = parser.parse_args()
+
+    print("🔍 Checking for duplicate class names and symbol collisions...")
     print("=" * 60)
-    
-    # Check in src directory by default
-    duplicates = check_duplicate_classes("src")
-    
-    if not duplicates:
-        print("✅ No duplicate class names found!")
+
+    scanner = SymbolScanner(cache_path=None if args.no_cache else CACHE_FILE)
+    scripts = scan_project(args.directory, scanner)
+    collisions = find_collisions(scripts, get_autoloads())
+    scanner.save()
+
+    if args.verbose:
+        print(f"Scanned {len(scripts)} scripts ({scanner.hits} cached, {scanner.misses} parsed)")
+
+    if not collisions:
+        print("✅ No duplicate class names or symbol collisions found!")
         return 0
-    
-    # Report duplicates
-    print(f"\n❌ Found {len(duplicates)} duplicate class name(s):\n")
-    
-    for class_name, files in sorted(duplicates.items()):
-        print(f"  Class '{class_name}' is defined in {len(files)} files:")
-        for file_path in files:
-            # Make path relative for cleaner output
-            try:
-                rel_path = file_path.relative_to(Path.cwd())
-            except:
-                rel_path = file_path
-            print(f"    - {rel_path}")
-        print()
-    
+
+    # Report collisions grouped by kind
+    print(f"\n❌ Found {len(collisions)} symbol collision(s):\n")
+
+    by_kind: Dict[str, List[Collision]] = defaultdict(list)
+    for collision in collisions:
+        by_kind[collision.kind].append(collision)
+
+    for kind, items in by_kind.items():
+        print(f"  [{kind}]")
+        for collision in items:
+            print(f"  {collision.message}:")
+            for location in collision.locations:
+                print(f"    - {location}")
+            print()
+
     print("=" * 60)
-    print("❌ Duplicate class names will cause Godot compilation errors!")
-    print("Fix by renaming one of the duplicate classes or removing the duplicate file.")
-    
+    print("❌ Symbol collisions will cause Godot compilation errors or confusing shadowing!")
+    print("Fix by renaming one of the colliding symbols or removing the duplicate file.")
+
     return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -12,6 +12,9 @@ import tempfile
 from pathlib import Path
 from typing import List, Tuple, Optional
 
+from check_duplicate_classes import CACHE_FILE, SymbolScanner, find_collisions, get_autoloads, scan_project
+from godot_diagnostics import Diagnostic, DiagnosticCollector, format_groups, parse_lines
+
 class TypeSafetyChecker:
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
@@ -431,6 +434,26 @@ def get_autoload_names() -> List[str]:
     
     return autoloads
 
+def check_symbol_collisions(verbose: bool = False) -> Tuple[bool, str]:
+    """Check for duplicate class names and other symbol collisions across src/."""
+    print("\n🔍 Checking for symbol collisions...")
+
+    scanner = SymbolScanner(cache_path=CACHE_FILE)
+    scripts = scan_project("src", scanner)
+    collisions = find_collisions(scripts, get_autoloads())
+    scanner.save()
+
+    if verbose:
+        print(f"Scanned {len(scripts)} scripts ({scanner.hits} cached, {scanner.misses} parsed)")
+
+    if not collisions:
+        return True, "No symbol collisions found"
+
+    lines = []
+    for collision in collisions:
+        lines.append(f"[{collision.kind}] {collision.message}: {', '.join(collision.locations)}")
+    return False, "Symbol collisions found:\n" + "\n".join(lines)
+
 def check_godot_compilation(verbose: bool = False) -> Tuple[bool, str]:
     """Check if the Godot project compiles without errors."""
     print("\n🔧 Checking Godot compilation...")
@@ -462,52 +485,47 @@ def check_godot_compilation(verbose: bool = False) -> Tuple[bool, str]:
         
         # Parse output for our specific error markers
         if result.stdout:
-            if "[COMPILE CHECK] ❌ ERRORS FOUND:" in result.stdout:
-                # Extract the error messages
-                error_lines = []
-                capture = False
-                for line in result.stdout.split('\n'):
-                    if "[COMPILE CHECK] ❌ ERRORS FOUND:" in line:
-                        capture = True
-                        continue
-                    if capture and line.strip():
-                        error_lines.append(line.strip())
-                
-                if error_lines:
-                    error_msg = "\n".join(error_lines[:20])  # Show first 20 errors
-                    if len(error_lines) > 20:
-                        error_msg += f"\n... and {len(error_lines) - 20} more errors"
-                    return False, f"Compilation errors found:\n{error_msg}"
+            marker = "[COMPILE CHECK] ❌ ERRORS FOUND:"
+            if marker in result.stdout:
+                # Only the per-script report; the results summary repeats the error count
+                report = result.stdout.split("📊 Compilation Check Results")[0]
+                collector = DiagnosticCollector().extend(parse_lines(report.splitlines()))
+                error_groups = collector.root_errors()
+                if error_groups:
+                    return False, f"Compilation errors found:\n{format_groups(error_groups, 20)}"
+
+                # Nothing the parser recognised; show the raw lines after the marker
+                raw_lines = [line.strip() for line in result.stdout.split(marker, 1)[1].splitlines() if line.strip()]
+                if raw_lines:
+                    message = "Compilation errors found:\n" + "\n".join(raw_lines[:20])
+                    if len(raw_lines) > 20:
+                        message += f"\n... and {len(raw_lines) - 20} more"
+                    return False, message
             
             if "[COMPILE CHECK] ✅ All scripts compile successfully!" in result.stdout:
                 return True, "All scripts compile successfully"
         
         # Check for GDScript errors in stderr
         if result.stderr:
-            # Look for script errors
-            if 'SCRIPT ERROR' in result.stderr or 'Parse Error' in result.stderr or 'Compile Error' in result.stderr:
-                # Extract error messages
-                error_lines = []
-                for line in result.stderr.split('\n'):
-                    if 'ERROR' in line or 'Error' in line:
-                        # Skip some common non-critical errors
-                        if 'already connected' in line:
-                            continue
-                        if 'Mapped:' in line:  # Skip enum mapping messages
-                            continue
-                        # Skip autoload-related errors (false positives in headless mode)
-                        if 'Identifier not found:' in line and any(autoload in line for autoload in autoload_names):
-                            continue
-                        # Skip dependent compilation failures from autoload issues
-                        if 'Failed to compile depended scripts' in line:
-                            continue
-                        error_lines.append(line.strip())
-                
-                if error_lines:
-                    error_msg = "\n".join(error_lines[:10])  # Show first 10 errors
-                    if len(error_lines) > 10:
-                        error_msg += f"\n... and {len(error_lines) - 10} more errors"
-                    return False, f"GDScript errors:\n{error_msg}"
+            def is_noise(diagnostic: Diagnostic) -> bool:
+                """Skip non-critical errors and autoload false positives from headless mode."""
+                if 'already connected' in diagnostic.message:
+                    return True
+                if 'Mapped:' in diagnostic.message:  # Skip enum mapping messages
+                    return True
+                if ('Identifier not found:' in diagnostic.message or 'not declared in the current scope' in diagnostic.message) \
+                        and any(autoload in diagnostic.message for autoload in autoload_names):
+                    return True
+                return False
+            
+            # Dependent-script failures are grouped under their root cause rather than dropped
+            collector = DiagnosticCollector(ignore=is_noise).extend(parse_lines(result.stderr.splitlines()))
+            error_groups = collector.root_errors()
+            if verbose:
+                print(f"Parsed {collector.total} diagnostics ({collector.ignored} ignored as noise, "
+                      f"{collector.engine} engine messages skipped)")
+            if error_groups:
+                return False, f"GDScript errors:\n{format_groups(error_groups, 10)}"
         
         # Check exit code
         if result.returncode == 124:  # Timeout
@@ -533,6 +551,7 @@ def main():
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     parser.add_argument('--all', '-a', action='store_true', help='Check all .gd files in src/')
     parser.add_argument('--skip-compile', action='store_true', help='Skip Godot compilation check')
+    parser.add_argument('--skip-symbols', action='store_true', help='Skip duplicate class/symbol collision check')
     
     args = parser.parse_args()
     
@@ -588,6 +607,17 @@ def main():
     else:
         print("\n✅ Type safety check passed!")
         
+        # Duplicate class names and other collisions fail compilation, and are much cheaper to find
+        if not args.skip_symbols:
+            symbols_success, symbols_msg = check_symbol_collisions(args.verbose)
+            
+            if not symbols_success:
+                print("\n❌ Symbol collision check failed!")
+                print(f"Error: {symbols_msg}")
+                sys.exit(1)
+            else:
+                print("\n✅ Symbol collision check passed!")
+        
         # Run Godot compilation check with smart dependency resolution
         if not args.skip_compile:
             compile_success, compile_msg = check_godot_compilation(args.verbose)
@@ -2,100 +2,78 @@
 """
 Clean up wave data spreadsheet by moving actual mob IDs from is_boss to gremlins column
 when gremlins column contains descriptive text instead of actual mob IDs.
+
+Usage:
+    python3 clean_wave_gremlins.py [--dry-run] [--local DIR]
 """
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-import json
+import sys
+
+from wave_sheets import DEFAULT_SHEET, RowRule, WaveSheet, use_local_backend
+
+# Gremlins holds descriptive text (has spaces) while is_boss holds the mob IDs
+GREMLINS_FROM_IS_BOSS = RowRule(
+    name='gremlins_from_is_boss',
+    when=lambda row: (isinstance(row.get('gremlins'), str) and ' ' in row['gremlins']
+                      and row.get('is_boss') and row['is_boss'] != row['gremlins']),
+    transform=lambda row: {'gremlins': row['is_boss']},
+)
 
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
-SERVICE_ACCOUNT_FILE = '/home/rosswolf/Code/google-sheets-mcp/service-account-key.json'
-SPREADSHEET_ID = '1Bv6R-AZtzmG_ycwudZ5Om6dKrJgl6Ut9INw7GTJFUlw'
+RULES = [GREMLINS_FROM_IS_BOSS]
 
-def get_sheets_service():
-    creds = service_account.Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-    return build('sheets', 'v4', credentials=creds)
+def clean_wave_gremlins(sheet: WaveSheet = None):
+    """Move mob IDs into the gremlins column; pass a shared sheet to batch with other steps."""
+    owns_sheet = sheet is None
+    sheet = sheet or WaveSheet()
 
-def clean_wave_gremlins():
-    service = get_sheets_service()
-    sheet = service.spreadsheets()
-    
-    # Get all data
-    result = sheet.values().get(
-        spreadsheetId=SPREADSHEET_ID,
-        range='Sheet1!A:Z'  # Get all columns
-    ).execute()
-    
-    values = result.get('values', [])
-    if not values:
+    if not sheet.values:
         print("No data found")
         return
-    
-    headers = values[0]
-    print(f"Headers: {headers}")
-    
-    # Find column indices
-    gremlins_col = None
-    is_boss_col = None
-    
-    for i, header in enumerate(headers):
-        if header == 'gremlins':
-            gremlins_col = i
-        elif header == 'is_boss':
-            is_boss_col = i
-    
-    if gremlins_col is None or is_boss_col is None:
-        print(f"Required columns not found. gremlins_col: {gremlins_col}, is_boss_col: {is_boss_col}")
+
+    missing = [name for name in ('gremlins', 'is_boss') if sheet.column(name) is None]
+    if missing:
+        print(f"Required columns not found: {', '.join(missing)}")
         return
-    
-    print(f"gremlins column: {gremlins_col}, is_boss column: {is_boss_col}")
-    
-    # Process each row
-    updates = []
-    cleaned_count = 0
-    
-    for row_num, row in enumerate(values[1:], start=2):  # Start at row 2 (skip headers)
-        if len(row) <= max(gremlins_col, is_boss_col):
-            continue  # Skip incomplete rows
-            
-        gremlins_value = row[gremlins_col] if gremlins_col < len(row) else ""
-        is_boss_value = row[is_boss_col] if is_boss_col < len(row) else ""
-        
-        # Check if gremlins column contains descriptive text (has spaces) and is_boss has data
-        if (isinstance(gremlins_value, str) and 
-            ' ' in gremlins_value and 
-            is_boss_value and 
-            is_boss_value != gremlins_value):
-            
-            print(f"Row {row_num}: '{gremlins_value}' -> '{is_boss_value}'")
-            
-            # Prepare update to move is_boss value to gremlins column
-            gremlins_cell = f"{chr(65 + gremlins_col)}{row_num}"
-            updates.append({
-                'range': gremlins_cell,
-                'values': [[is_boss_value]]
-            })
-            cleaned_count += 1
-    
-    print(f"\nFound {cleaned_count} rows to clean")
-    
-    if updates and cleaned_count > 0:
+
+    changes = sheet.apply_rules(RULES)
+    for change in changes:
+        print(f"Row {change.row_num}: '{change.old}' -> '{change.new}'")
+
+    print(f"\nFound {len(changes)} rows to clean")
+
+    if changes:
         # Auto-apply changes (no confirmation needed in automated environment)
-        # Batch update all changes
-        body = {
-            'valueInputOption': 'RAW',
-            'data': updates
-        }
-        
-        result = sheet.values().batchUpdate(
-            spreadsheetId=SPREADSHEET_ID,
-            body=body
-        ).execute()
-        
-        print(f"✅ Updated {result.get('totalUpdatedCells', 0)} cells in {len(updates)} rows")
+        if owns_sheet:
+            result = sheet.flush()
+            print(f"✅ Updated {result.get('totalUpdatedCells', 0)} cells in {len(changes)} rows")
+        else:
+            print(f"✅ Queued {len(changes)} row updates")
     else:
         print("✅ No updates needed - all gremlins columns already have proper mob IDs")
 
+def main():
+    """Clean the sheet, or print the cell diff with --dry-run."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Move mob IDs from is_boss into gremlins")
+    parser.add_argument('--sheet', default=DEFAULT_SHEET, help='Sheet (tab) name')
+    parser.add_argument('--local', metavar='DIR', help='Use CSV files in DIR instead of Google Sheets')
+    parser.add_argument('--dry-run', action='store_true', help='Print the cell diff without writing')
+    args = parser.parse_args()
+
+    if args.local:
+        use_local_backend(args.local)
+    sheet = WaveSheet(args.sheet)
+    clean_wave_gremlins(sheet)
+    if not sheet.pending:
+        return 0
+    if args.dry_run:
+        print(f"🔍 Dry run: would write {len(sheet.pending_updates())} range(s):")
+        print(sheet.format_diff())
+        return 0
+    result = sheet.flush()
+    print(f"✅ Updated {result.get('totalUpdatedCells', 0)} cells")
+    return 0
+
 if __name__ == "__main__":
-    clean_wave_gremlins()
\ No newline at end of file
+    sys.exit(main())
@@ -67,7 +67,7 @@ if [[ "$RUN_TYPE_CHECK" == true ]] && [[ "$SKIP_TYPE_CHECK" == false ]]; then
     echo -e "\n${BLUE}📝 Step 1: Type Safety Check${NC}"
     echo "------------------------------"
     
-    if python3 check_type_safety.py --all $VERBOSE; then
+    if python3 check_type_safety.py --all --skip-symbols $VERBOSE; then
         echo -e "${GREEN}✅ Type safety check passed${NC}"
     else
         echo -e "${YELLOW}⚠️ Type safety check had issues${NC}"
@@ -75,6 +75,19 @@ if [[ "$RUN_TYPE_CHECK" == true ]] && [[ "$SKIP_TYPE_CHECK" == false ]]; then
     fi
 fi
 
+# Duplicate class names and symbol collisions break compilation, so they do fail
+if [[ "$RUN_COMPILE_CHECK" == true ]]; then
+    echo -e "\n${BLUE}🔍 Step 1b: Symbol Collision Check${NC}"
+    echo "------------------------------"
+
+    if python3 check_duplicate_classes.py $VERBOSE; then
+        echo -e "${GREEN}✅ Symbol collision check passed${NC}"
+    else
+        echo -e "${RED}❌ Symbol collision check failed${NC}"
+        OVERALL_SUCCESS=false
+    fi
+fi
+
 # Run Godot compilation check
 if [[ "$RUN_COMPILE_CHECK" == true ]]; then
     echo -e "\n${BLUE}🔧 Step 2: Godot Compilation Check${NC}"
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Dead-code report for the GDScript project.
+Joins the project's reference graph with the effect and move keys actually
+used in the exported data JSONs, then reports effect handlers nothing can
+reach, dispatch keys no data uses, unused GlobalSignals and unreferenced
+methods, with an estimate of how many lines could be removed.
+"""
+
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from gdscript_calls import TOKEN_PATTERN
+from style_check import StyleChecker
+
+FUNC_PATTERN = re.compile(r'^(\s*)(?:static\s+)?func\s+(\w+)')
+SIGNAL_PATTERN = re.compile(r'^\s*signal\s+(\w+)')
+MATCH_PATTERN = re.compile(r'^(\s*)match\s+(.+?):\s*(?:#.*)?$')
+CASE_KEYS_PATTERN = re.compile(r'^\s*((?:"[^"]*"\s*,\s*)*"[^"]*")\s*:\s*(?:#.*)?$')
+QUOTED_PATTERN = re.compile(r'"([^"]*)"')
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_]\w*$')
+
+# Method names referenced from scenes, e.g. [connection ... method="_on_quit_pressed"]
+SCENE_METHOD_PATTERN = re.compile(r'\bmethod\s*=\s*"(\w+)"')
+
+# Engine callbacks that are never called from script but are still live
+EXTRA_VIRTUAL_METHODS = {
+    '_static_init', '_to_string', '_get_drag_data', '_can_drop_data', '_drop_data',
+    '_make_custom_tooltip', '_has_point', '_get_minimum_size', '_structured_text_parser',
+}
+
+SRC_PATH = Path(__file__).resolve().parent / 'src'
+DATA_PATH = SRC_PATH / 'scenes' / 'data'
+GLOBAL_SIGNALS_FILE = 'global_signals.gd'
+CARD_EFFECT_FIELDS = ('on_play_effect', 'on_place_effect', 'on_replace_effect',
+                      'on_destroy_effect', 'on_fire_effect')
+
+@dataclass
+class Dispatcher:
+    """A data-driven match statement whose case keys come from an exported JSON."""
+    script: str          # File name of the script
+    function: str        # Function containing the match
+    source: str          # Label for the data that feeds it
+
+# Match statements gated on data keys; case bodies no data reaches are dead
+DISPATCHERS = [
+    Dispatcher('simple_effect_processor.gd', '_process_single_effect', 'card effects'),
+    Dispatcher('simple_effect_processor.gd', '_process_complex_effect', 'card effects'),
+    Dispatcher('gremlin_downside_processor.gd', '_process_single_downside', 'gremlin moves'),
+]
+
+@dataclass
+class FunctionDef:
+    file: str
+    name: str
+    line: int
+    end_line: int
+    references: Set[str] = field(default_factory=set)
+
+    @property
+    def length(self) -> int:
+        return self.end_line - self.line + 1
+
+@dataclass
+class MatchCase:
+    file: str
+    function: str
+    keys: List[str]
+    line: int
+    end_line: int
+    live: bool = True
+
+    @property
+    def body_lines(self) -> int:
+        return self.end_line - self.line
+
+@dataclass
+class SignalDef:
+    file: str
+    name: str
+    line: int
+
+@dataclass
+class DeadCodeReport:
+    unreachable_handlers: List[FunctionDef] = field(default_factory=list)
+    dead_cases: List[MatchCase] = field(default_factory=list)
+    unused_keys: Dict[str, List[str]] = field(default_factory=dict)
+    unknown_keys: Dict[str, List[str]] = field(default_factory=dict)
+    unconnected_signals: List[SignalDef] = field(default_factory=list)
+    unemitted_signals: List[SignalDef] = field(default_factory=list)
+    unreferenced_methods: List[FunctionDef] = field(default_factory=list)
+
+    @property
+    def removable_lines(self) -> int:
+        lines = sum(f.length for f in self.unreachable_handlers)
+        lines += sum(f.length for f in self.unreferenced_methods)
+        lines += sum(c.body_lines + 1 for c in self.dead_cases)
+        return lines
+
+    def to_dict(self) -> Dict:
+        def func(f: FunctionDef) -> Dict:
+            return {'file': f.file, 'name': f.name, 'line': f.line, 'lines': f.length}
+
+        return {
+            'unreachable_handlers': [func(f) for f in self.unreachable_handlers],
+            'dead_cases': [{'file': c.file, 'function': c.function, 'keys': c.keys,
+                            'line': c.line, 'lines': c.body_lines + 1} for c in self.dead_cases],
+            'unused_keys': self.unused_keys,
+            'unknown_keys': self.unknown_keys,
+            'unconnected_signals': [{'file': s.file, 'name': s.name, 'line': s.line}
+                                    for s in self.unconnected_signals],
+            'unemitted_signals': [{'file': s.file, 'name': s.name, 'line': s.line}
+                                  for s in self.unemitted_signals],
+            'unreferenced_methods': [func(f) for f in self.unreferenced_methods],
+            'removable_lines': self.removable_lines,
+        }
+
+def _indent_width(indent: str) -> int:
+    return len(indent.expandtabs(4))
+
+def _is_code(line: str) -> bool:
+    stripped = line.strip()
+    return bool(stripped) and not stripped.startswith('#')
+
+def _block_end(lines: List[str], start: int, indent: int) -> int:
+    """Index of the last code line of the block opened at lines[start]."""
+    end = start
+    for i in range(start + 1, len(lines)):
+        if not _is_code(lines[i]):
+            continue
+        if _indent_width(re.match(r'\s*', lines[i]).group()) <= indent:
+            break
+        end = i
+    return end
+
+def _split_key_values(text: str) -> List[str]:
+    """Keys of a "key=value, key=value" string, as the effect processors split it."""
+    keys = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        keys.append(part.split('=')[0].strip())
+    return keys
+
+def _load_records(path: Path) -> List[Dict]:
+    """Rows of an exported data JSON, which is a list (or a dict keyed by id)."""
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return list(data.values()) if isinstance(data, dict) else data
+
+def load_data_keys(data_path: Path = DATA_PATH) -> Dict[str, Set[str]]:
+    """Effect keys used by cards and move keys used by gremlins, by dispatcher source."""
+    keys: Dict[str, Set[str]] = {'card effects': set(), 'gremlin moves': set()}
+
+    for card in _load_records(data_path / 'card_data.json'):
+        for name in CARD_EFFECT_FIELDS:
+            value = card.get(name)
+            if isinstance(value, str):
+                keys['card effects'].update(_split_key_values(value))
+
+    for mob in _load_records(data_path / 'mob_data.json'):
+        for name, value in mob.items():
+            if re.fullmatch(r'move_\d+', name) and isinstance(value, str):
+                keys['gremlin moves'].update(_split_key_values(value))
+
+    return keys
+
+class ProjectIndex:
+    """Functions, signals, match cases and references for every script and scene."""
+
+    def __init__(self, src_path: Path, data_keys: Dict[str, Set[str]]):
+        self.src_path = src_path
+        self.data_keys = data_keys
+        self.functions: List[FunctionDef] = []
+        self.functions_by_name: Dict[str, List[FunctionDef]] = {}
+        self.signals: List[SignalDef] = []
+        self.cases: List[MatchCase] = []
+        self.root_references: Set[str] = set()   # From top-level code and scenes
+        self.references_by_file: Dict[str, Set[str]] = {}
+
+    def build(self) -> 'ProjectIndex':
+        for path in sorted(self.src_path.rglob('*.gd')):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._index_script(str(path), f.read())
+        for pattern in ('*.tscn', '*.tres'):
+            for path in sorted(self.src_path.rglob(pattern)):
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    self.root_references.update(SCENE_METHOD_PATTERN.findall(f.read()))
+        for func in self.functions:
+            self.functions_by_name.setdefault(func.name, []).append(func)
+        return self
+
+    def _index_script(self, path: str, content: str) -> None:
+        lines = content.split('\n')
+        name = Path(path).name
+        dispatchers = {d.function: d for d in DISPATCHERS if d.script == name}
+
+        # Line index -> function owning it; None for top-level code
+        owner: List[Optional[FunctionDef]] = [None] * len(lines)
+        # Lines whose references are dropped because no data reaches them
+        dead_lines: Set[int] = set()
+
+        for i, line in enumerate(lines):
+            signal = SIGNAL_PATTERN.match(line)
+            if signal:
+                self.signals.append(SignalDef(path, signal.group(1), i + 1))
+                continue
+            func = FUNC_PATTERN.match(line)
+            if not func:
+                continue
+            end = _block_end(lines, i, _indent_width(func.group(1)))
+            definition = FunctionDef(path, func.group(2), i + 1, end + 1)
+            self.functions.append(definition)
+            for j in range(i, end + 1):
+                owner[j] = definition
+            if definition.name in dispatchers:
+                dispatcher = dispatchers[definition.name]
+                dead_lines.update(self._index_cases(path, dispatcher, lines, i, end))
+
+        file_references = self.references_by_file.setdefault(path, set())
+        line_starts = [0]
+        for line in lines:
+            line_starts.append(line_starts[-1] + len(line) + 1)
+
+        line_index = 0
+        previous = None
+        for match in TOKEN_PATTERN.finditer(content):
+            kind = match.lastgroup
+            if kind == 'comment':
+                continue
+            while line_starts[line_index + 1] <= match.start():
+                line_index += 1
+            text = match.group()
+            declared = previous in ('func', 'signal')
+            previous = text if kind == 'ident' else None
+            if kind == 'string':
+                # Names passed as strings: call_deferred("x"), has_method("x"), connect("x", ...)
+                text = text.strip('"\'')
+                if not IDENTIFIER_PATTERN.match(text):
+                    continue
+            elif kind != 'ident' or declared:
+                continue
+            if line_index in dead_lines:
+                continue
+            file_references.add(text)
+            function = owner[line_index]
+            if function is None:
+                self.root_references.add(text)
+            else:
+                function.references.add(text)
+
+    def _index_cases(self, path: str, dispatcher: Dispatcher, lines: List[str],
+                     start: int, end: int) -> Set[int]:
+        """Record the cases of a dispatcher's match and return the line indexes of dead ones."""
+        used = self.data_keys.get(dispatcher.source, set())
+        dead: Set[int] = set()
+        for i in range(start, end + 1):
+            match = MATCH_PATTERN.match(lines[i])
+            if not match:
+                continue
+            match_indent = _indent_width(match.group(1))
+            match_end = _block_end(lines, i, match_indent)
+            case_indent = None
+            for j in range(i + 1, match_end + 1):
+                if not _is_code(lines[j]):
+                    continue
+                indent = _indent_width(re.match(r'\s*', lines[j]).group())
+                if case_indent is None:
+                    case_indent = indent
+                if indent != case_indent:
+                    continue
+                keys = CASE_KEYS_PATTERN.match(lines[j])
+                if not keys:
+                    continue  # "_:" default, bindings and non-literal patterns stay live
+                case_end = _block_end(lines, j, indent)
+                case = MatchCase(path, dispatcher.function, QUOTED_PATTERN.findall(keys.group(1)),
+                                 j + 1, case_end + 1)
+                case.live = any(key in used for key in case.keys)
+                self.cases.append(case)
+                if not case.live:
+                    dead.update(range(j, case_end + 1))
+            break  # Only the first match in a dispatcher is data-driven
+        return dead
+
+def _live_names(index: ProjectIndex, roots: Set[str]) -> Set[str]:
+    """Names reachable from the roots, following function bodies by name."""
+    live: Set[str] = set()
+    pending = list(roots)
+    while pending:
+        name = pending.pop()
+        if name in live:
+            continue
+        live.add(name)
+        for func in index.functions_by_name.get(name, []):
+            pending.extend(func.references - live)
+    return live
+
+def analyze(src_path: Path = SRC_PATH, data_path: Path = DATA_PATH) -> DeadCodeReport:
+    data_keys = load_data_keys(data_path)
+    index = ProjectIndex(src_path, data_keys).build()
+
+    roots = set(index.root_references)
+    roots.update(StyleChecker().godot_virtual_methods)
+    roots.update(EXTRA_VIRTUAL_METHODS)
+    live = _live_names(index, roots)
+
+    report = DeadCodeReport()
+    dispatcher_scripts = {d.script for d in DISPATCHERS}
+    for func in index.functions:
+        if func.name in live:
+            continue
+        if Path(func.file).name in dispatcher_scripts:
+            report.unreachable_handlers.append(func)
+        else:
+            report.unreferenced_methods.append(func)
+
+    report.dead_cases = [c for c in index.cases if not c.live]
+    handled: Dict[str, Set[str]] = {}
+    for dispatcher in DISPATCHERS:
+        handled.setdefault(dispatcher.source, set())
+    for case in index.cases:
+        source = next(d.source for d in DISPATCHERS if d.function == case.function)
+        handled[source].update(case.keys)
+    for source, keys in handled.items():
+        used = data_keys.get(source, set())
+        unused = sorted(keys - used)
+        unknown = sorted(used - keys)
+        if unused:
+            report.unused_keys[source] = unused
+        if unknown:
+            report.unknown_keys[source] = unknown
+
+    # GlobalSignals: a signal is connected if referenced outside its file, and
+    # emitted if its signal_<name> wrapper is live
+    external: Dict[str, Set[str]] = {}
+    for signal in index.signals:
+        if Path(signal.file).name != GLOBAL_SIGNALS_FILE:
+            continue
+        if signal.file not in external:
+            external[signal.file] = set()
+            for path, names in index.references_by_file.items():
+                if path != signal.file:
+                    external[signal.file].update(names)
+        if signal.name not in external[signal.file]:
+            report.unconnected_signals.append(signal)
+        if f"signal_{signal.name}" not in live:
+            report.unemitted_signals.append(signal)
+
+    return report
+
+def print_report(report: DeadCodeReport, limit: int) -> None:
+    def show(items: List, describe) -> None:
+        for item in items[:limit]:
+            print(f"  {describe(item)}")
+        if len(items) > limit:
+            print(f"  ... and {len(items) - limit} more")
+
+    print(f"\n🔌 Unreachable effect handlers: {len(report.unreachable_handlers)}")
+    show(report.unreachable_handlers, lambda f: f"{f.file}:{f.line}: {f.name}() ({f.length} lines)")
+
+    print(f"\n🗝️  Dead dispatch cases: {len(report.dead_cases)}")
+    show(report.dead_cases, lambda c: f"{c.file}:{c.line}: {', '.join(c.keys)}")
+    for source, keys in report.unused_keys.items():
+        print(f"  Keys no {source} use: {len(keys)}")
+    for source, keys in report.unknown_keys.items():
+        print(f"  ⚠️  {source} keys with no handler: {', '.join(keys)}")
+
+    print(f"\n📡 GlobalSignals never connected: {len(report.unconnected_signals)}")
+    show(report.unconnected_signals, lambda s: f"{s.file}:{s.line}: {s.name}")
+    print(f"\n📡 GlobalSignals never emitted: {len(report.unemitted_signals)}")
+    show(report.unemitted_signals, lambda s: f"{s.file}:{s.line}: {s.name}")
+
+    print(f"\n🧹 Unreferenced methods: {len(report.unreferenced_methods)}")
+    show(report.unreferenced_methods, lambda f: f"{f.file}:{f.line}: {f.name}() ({f.length} lines)")
+
+def main():
+    """Run the dead-code analysis and print the report."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report unreachable handlers, unused signals and methods")
+    parser.add_argument('--src', default=str(SRC_PATH), help='Source directory to scan')
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with exported data JSONs')
+    parser.add_argument('--limit', type=int, default=25, help='Maximum entries per section')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    src_path = Path(args.src)
+    if not src_path.exists():
+        print(f"❌ Source directory not found: {src_path}")
+        return 1
+    # Without the exports every data-driven handler would look dead
+    missing = [name for name in ('card_data.json', 'mob_data.json') if not (Path(args.data) / name).exists()]
+    if missing:
+        print(f"❌ {', '.join(missing)} not found in {args.data}")
+        return 1
+
+    report = analyze(src_path, Path(args.data))
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+        return 0
+
+    print("🔍 Dead-code report")
+    print("=" * 60)
+    print_report(report, args.limit)
+    print("\n" + "=" * 60)
+    print(f"✂️  Estimated removable lines: {report.removable_lines}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Compiles card on_fire_effect strings and gremlin move_N descriptors into
+compact opcode arrays, once, ahead of any simulation.
+
+A card's effect "consume_red=2,damage=3,activate_east=1" becomes a flat tuple
+of (opcode, operand, value) triples; a gremlin move "drain_momentum=2" with
+move_1_ticks=3 becomes one (opcode, operand, value, ticks) row. A move is
+tokenised on "," like MoveParser.parse_move_descriptor, and an NxM value
+repeats the piece M times; the pieces after the first get 0 ticks, meaning
+they complete together with the row before them. Operands are
+indexes into FORCE_NAMES, DAMAGE_TARGETS or DIRECTIONS, or into the shared
+symbol table for summon targets, so nothing is split, matched or converted
+while a battle runs. The effect key table covers every arm of
+SimpleEffectProcessor's match; arms the simulator does not model (heals,
+shields, caps, drains, gear destruction...) compile to OP_UNMODELLED, which
+the simulator skips. Keys that SimpleEffectProcessor or
+GremlinDownsideProcessor would not recognise are compile errors, so they are
+rejected when the data is exported instead of being skipped with a warning
+mid-battle.
+
+Usage:
+    python3 effect_compiler.py                 # Compile and write compiled_effects.json
+    python3 effect_compiler.py --check         # Only report unknown keys and engine drift
+    python3 effect_compiler.py --show starter_adaptive
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from wave_difficulty import DATA_PATH, _load_records, _number
+
+COMPILED_FILE = 'compiled_effects.json'
+ENGINE_SOURCE = Path(__file__).resolve().parent / 'src' / 'scenes' / 'core' / 'effects' / 'simple_effect_processor.gd'
+SOURCE_FILES = ('card_data.json', 'mob_data.json')
+
+COLORS = ('red', 'blue', 'green', 'white', 'purple')
+FORCES = ('heat', 'precision', 'momentum', 'balance', 'entropy')
+FORCE_NAMES = COLORS + FORCES
+FORCE_INDEX = {name: i for i, name in enumerate(FORCE_NAMES)}
+FORCE_INDEX['black'] = FORCE_INDEX['purple']
+COLOR_INDEXES = tuple(range(len(COLORS)))
+FORCE_INDEXES = tuple(range(len(COLORS), len(FORCE_NAMES)))
+# Gremlin caps and drains name forces by their colour too
+GREMLIN_FORCE_INDEX = dict(
+    {name: FORCE_INDEX[name] for name in FORCES},
+    red=FORCE_INDEX['heat'], white=FORCE_INDEX['precision'], green=FORCE_INDEX['momentum'],
+    blue=FORCE_INDEX['balance'], black=FORCE_INDEX['entropy'], purple=FORCE_INDEX['entropy'])
+
+DAMAGE_TARGETS = ('top', 'all', 'random', 'weakest', 'strongest', 'bottom')
+DIRECTIONS = ('north', 'south', 'east', 'west')
+DIRECTION_OFFSETS = ((0, -1), (0, 1), (1, 0), (-1, 0))
+
+# Card effect opcodes
+OP_GENERATE = 0          # operand: force
+OP_CONSUME = 1           # operand: force
+OP_CONSUME_LARGEST = 2
+OP_CONSUME_SMALLEST = 3
+OP_DAMAGE = 4            # operand: target
+OP_PIERCE_DAMAGE = 5     # operand: target
+OP_POP_DAMAGE = 6        # operand: target
+OP_POISON = 7            # operand: 0 top, 1 all
+OP_ACTIVATE = 8          # operand: direction
+OP_DRAW = 9
+OP_DISCARD = 10
+OP_MILL = 11
+OP_SELF_DESTRUCT = 12
+OP_MOMENTARY = 13
+OP_EXECUTE = 14          # operand: 0 top, 1 all; value: HP threshold
+OP_BURN = 15             # operand: 0 top, 1 all; value: ticks
+OP_COMPLEX = 16          # operand: COMPLEX_EFFECTS index
+OP_UNMODELLED = 17       # operand: UNMODELLED_EFFECTS index; the simulator skips it
+OPCODE_NAMES = ('generate', 'consume', 'consume_largest', 'consume_smallest', 'damage',
+                'pierce_damage', 'pop_damage', 'poison', 'activate', 'draw', 'discard',
+                'mill', 'self_destruct', 'momentary', 'execute', 'burn', 'complex', 'unmodelled')
+CONSUME_OPS = (OP_CONSUME, OP_CONSUME_LARGEST, OP_CONSUME_SMALLEST)
+
+# SimpleEffectProcessor._process_complex_effect, written "complex_<name>" without a value
+COMPLEX_EFFECTS = ('chain_reaction', 'mega_burst', 'sacrifice_draw', 'force_cascade', 'micro_synergy',
+                   'beast_pack', 'heat_threshold', 'tool_discount', 'micro_haste', 'next_free',
+                   'order_line', 'chaos_isolation', 'forge_support', 'void_hunger', 'crystal_focus',
+                   'shadow_stealth', 'arcane_ritual', 'mech_automation', 'overheat', 'precision_strike',
+                   'momentum_avalanche', 'perfect_balance', 'entropy_cascade', 'adjacent_trigger',
+                   'row_production', 'column_shield', 'diagonal_damage', 'sacrifice_power',
+                   'discard_damage', 'destroy_draw', 'force_scaling', 'card_scaling', 'gear_scaling',
+                   'red_blue_combo', 'white_purple_combo', 'rainbow_burst')
+COMPLEX_INDEX = {name: i for i, name in enumerate(COMPLEX_EFFECTS)}
+
+# SimpleEffectProcessor arms the simulator does not model
+UNMODELLED_EFFECTS = (
+    ('overkill_damage', 'heal', 'heal_self', 'shield', 'shield_self')
+    + tuple(f'{name}_{kind}_cap' for kind in ('soft', 'hard')
+            for name in ('heat', 'red', 'precision', 'white', 'momentum', 'green',
+                         'balance', 'blue', 'entropy', 'purple', 'black'))
+    + ('total_forces_cap', 'hand_limit', 'card_tax')
+    + tuple(f'drain_{name}' for name in ('heat', 'red', 'precision', 'white', 'momentum', 'green',
+                                         'balance', 'blue', 'entropy', 'purple', 'black',
+                                         'random', 'all', 'highest'))
+    + ('force_discard', 'destroy_gear', 'corrupt_gear', 'summon',
+       'gremlin_shield', 'gremlin_heal', 'gremlin_armor', 'enhance_gremlins'))
+
+# Gremlin move opcodes
+MOVE_ATTACK = 0
+MOVE_DRAIN = 1           # operand: force, or DRAIN_RANDOM / DRAIN_ALL / DRAIN_LARGEST
+MOVE_SUMMON = 2          # operand: symbol
+MOVE_FORCE_DISCARD = 3
+MOVE_HARD_CAP = 4        # operand: force, or ALL_FORCES
+MOVE_SOFT_CAP = 5        # operand: force, or ALL_FORCES
+MOVE_CARD_COST_PENALTY = 6
+MOVE_NAMES = ('attack', 'drain', 'summon', 'force_discard', 'hard_cap', 'soft_cap', 'card_cost_penalty')
+TRIGGERED_MOVE_OPS = frozenset((MOVE_ATTACK, MOVE_DRAIN, MOVE_SUMMON, MOVE_FORCE_DISCARD))
+DRAIN_RANDOM = -1
+DRAIN_ALL = -2
+DRAIN_LARGEST = -3
+ALL_FORCES = -1
+
+# (opcode, operand, value, ticks); ticks 0 in a cycle completes with the previous row
+Move = Tuple[int, int, int, int]
+REPEAT_PATTERN = re.compile(r'^(\d+)x(\d+)$')
+
+class EffectCompileError(ValueError):
+    """An effect or move key the game does not recognise."""
+
+def _effect_keys() -> Dict[str, Tuple[int, int]]:
+    keys = {
+        'consume_max': (OP_CONSUME_LARGEST, 0), 'pay_largest': (OP_CONSUME_LARGEST, 0),
+        'consume_largest': (OP_CONSUME_LARGEST, 0),
+        'pay_smallest': (OP_CONSUME_SMALLEST, 0), 'consume_smallest': (OP_CONSUME_SMALLEST, 0),
+        'poison': (OP_POISON, 0), 'poison_all': (OP_POISON, 1),
+        'execute': (OP_EXECUTE, 0), 'execute_all': (OP_EXECUTE, 1),
+        'burn': (OP_BURN, 0), 'burn_all': (OP_BURN, 1),
+        'draw': (OP_DRAW, 0), 'discard': (OP_DISCARD, 0), 'mill': (OP_MILL, 0),
+        'self_destruct': (OP_SELF_DESTRUCT, 0), 'momentary': (OP_MOMENTARY, 0),
+    }
+    for name, index in FORCE_INDEX.items():
+        keys[f'generate_{name}'] = keys[f'add_{name}'] = (OP_GENERATE, index)
+        keys[f'consume_{name}'] = keys[f'pay_{name}'] = (OP_CONSUME, index)
+    for kind, op in (('damage', OP_DAMAGE), ('pierce_damage', OP_PIERCE_DAMAGE), ('pop_damage', OP_POP_DAMAGE)):
+        keys[kind] = (op, 0)
+        for index, target in enumerate(DAMAGE_TARGETS):
+            keys[f'{kind}_{target}'] = (op, index)
+    for index, direction in enumerate(DIRECTIONS):
+        keys[f'activate_{direction}'] = (OP_ACTIVATE, index)
+    for index, name in enumerate(UNMODELLED_EFFECTS):
+        keys[name] = (OP_UNMODELLED, index)
+    return keys
+
+def _move_keys() -> Dict[str, Tuple[int, int]]:
+    keys = {
+        'attack': (MOVE_ATTACK, 0),
+        'drain_random': (MOVE_DRAIN, DRAIN_RANDOM), 'drain_all_types': (MOVE_DRAIN, DRAIN_ALL),
+        'drain_largest': (MOVE_DRAIN, DRAIN_LARGEST),
+        'force_discard': (MOVE_FORCE_DISCARD, 0), 'card_cost_penalty': (MOVE_CARD_COST_PENALTY, 0),
+        'max_resource_hard_cap': (MOVE_HARD_CAP, ALL_FORCES),
+        'max_resource_soft_cap': (MOVE_SOFT_CAP, ALL_FORCES),
+    }
+    for name, index in GREMLIN_FORCE_INDEX.items():
+        keys[f'drain_{name}'] = (MOVE_DRAIN, index)
+        keys[f'{name}_hard_cap'] = (MOVE_HARD_CAP, index)
+        keys[f'{name}_soft_cap'] = (MOVE_SOFT_CAP, index)
+    return keys
+
+EFFECT_KEYS = _effect_keys()
+MOVE_KEYS = _move_keys()
+
+ARM_PATTERN = re.compile(r'^\t\t("[^"]+"(?:\s*,\s*"[^"]+")*)\s*:')
+
+def engine_arms(function: str, source: Path = ENGINE_SOURCE) -> List[str]:
+    """The string arms of the first match statement in a SimpleEffectProcessor function."""
+    arms: List[str] = []
+    inside = False
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith(f'static func {function}('):
+                inside = True
+            elif inside and line.startswith('static func '):
+                break
+            elif inside:
+                match = ARM_PATTERN.match(line)
+                if match:
+                    arms.extend(re.findall(r'"([^"]+)"', match.group(1)))
+    return arms
+
+def engine_drift(source: Path = ENGINE_SOURCE) -> List[str]:
+    """Differences between the compiler's key tables and SimpleEffectProcessor's match arms."""
+    drift = []
+    for function, known, prefix in (('_process_single_effect', set(EFFECT_KEYS), ''),
+                                    ('_process_complex_effect', set(COMPLEX_EFFECTS), 'complex_')):
+        arms = {arm[len(prefix):] if arm.startswith(prefix) else arm for arm in engine_arms(function, source)}
+        drift.extend(f"engine handles '{prefix}{key}' but the compiler rejects it" for key in sorted(arms - known))
+        drift.extend(f"compiler accepts '{prefix}{key}' but the engine has no arm for it" for key in sorted(known - arms))
+    return drift
+
+def _reject(message: str, errors: Optional[List[str]]) -> None:
+    if errors is None:
+        raise EffectCompileError(message)
+    errors.append(message)
+
+def _value(text: str, label: str, errors: Optional[List[str]]) -> Optional[float]:
+    """A numeric effect or move value; anything else is rejected rather than read as 0."""
+    try:
+        return float(text)
+    except ValueError:
+        _reject(f"non-numeric value '{text}' in '{label}'", errors)
+        return None
+
+def compile_effect(text, errors: Optional[List[str]] = None) -> Tuple[float, ...]:
+    """
+    Flat (opcode, operand, value) triples for an effect string. Unknown keys
+    raise EffectCompileError, or are skipped and appended to errors if given.
+    """
+    code: List[float] = []
+    for part in str(text or '').split(','):
+        if not part.strip():
+            continue
+        if part.strip().startswith('complex_'):
+            name = part.strip()[len('complex_'):]
+            if name in COMPLEX_INDEX:
+                code.extend((OP_COMPLEX, COMPLEX_INDEX[name], 1))
+            else:
+                _reject(f"unknown complex effect '{part.strip()}'", errors)
+            continue
+        pieces = [p.strip() for p in part.split('=')]
+        if len(pieces) != 2:
+            _reject(f"malformed effect '{part.strip()}'", errors)
+        elif pieces[0] not in EFFECT_KEYS:
+            _reject(f"unknown effect key '{pieces[0]}'", errors)
+        else:
+            value = _value(pieces[1], part.strip(), errors)
+            if value is not None:
+                op, operand = EFFECT_KEYS[pieces[0]]
+                code.extend((op, operand, value))
+    return tuple(code)
+
+class CompiledData:
+    """Compiled card effects and gremlin moves, with the symbol table summons refer to."""
+
+    def __init__(self):
+        self.cards: Dict[str, Tuple[float, ...]] = {}
+        self.mobs: Dict[str, Tuple[Tuple[Move, ...], Tuple[Move, ...]]] = {}
+        self.symbols: List[str] = []
+        self.errors: List[Tuple[str, str, str]] = []     # (file, record, message)
+        self._symbol_index: Dict[str, int] = {}
+
+    def symbol(self, name: str) -> int:
+        if name not in self._symbol_index:
+            self._symbol_index[name] = len(self.symbols)
+            self.symbols.append(name)
+        return self._symbol_index[name]
+
+    def compile_moves(self, mob: Dict, errors: Optional[List[str]] = None) -> Tuple[Tuple[Move, ...], Tuple[Move, ...]]:
+        """(cycled, background) moves, split as GremlinSpawnController._parse_moves_to_queue does."""
+        cycled: List[Move] = []
+        background: List[Move] = []
+        for i in range(1, 7):
+            text = str(mob.get(f'move_{i}') or '').strip()
+            if not text:
+                continue
+            ticks = int(_number(mob.get(f'move_{i}_ticks', 0)))
+            pieces = self._compile_move(text, f'move_{i}', errors)
+            # Later pieces of a cycled move complete on the same tick as the first
+            rows = [(op, operand, value, ticks if n == 0 else 0) for n, (op, operand, value) in enumerate(pieces)]
+            (background if ticks == 0 else cycled).extend(rows)
+        return tuple(cycled), tuple(background)
+
+    def _compile_move(self, text: str, label: str, errors: Optional[List[str]]) -> List[Tuple[int, int, int]]:
+        """(opcode, operand, value) pieces of one move descriptor, repeats expanded."""
+        pieces: List[Tuple[int, int, int]] = []
+        for token in text.split(','):
+            parts = [p.strip() for p in token.split('=')]
+            if len(parts) != 2:
+                _reject(f"{label}: malformed move '{token.strip()}'", errors)
+                continue
+            name, param = parts
+            if name == 'summon' and param:
+                pieces.append((MOVE_SUMMON, self.symbol(param), 1))
+                continue
+            if name not in MOVE_KEYS:
+                _reject(f"{label}: unknown move key '{name}'", errors)
+                continue
+            repeat = 1
+            multi_hit = REPEAT_PATTERN.match(param)
+            if multi_hit:
+                param, repeat = multi_hit.group(1), int(multi_hit.group(2))
+            value = _value(param, f"{label}: {token.strip()}", errors)
+            if value is None:
+                continue
+            op, operand = MOVE_KEYS[name]
+            pieces.extend([(op, operand, int(value))] * repeat)
+        return pieces
+
+    def to_json(self) -> Dict:
+        return {
+            'opcodes': list(OPCODE_NAMES),
+            'move_opcodes': list(MOVE_NAMES),
+            'forces': list(FORCE_NAMES),
+            'symbols': self.symbols,
+            'cards': {card_id: list(code) for card_id, code in self.cards.items()},
+            'mobs': {mob_id: {'moves': [list(m) for m in cycled], 'background': [list(m) for m in background]}
+                     for mob_id, (cycled, background) in self.mobs.items()},
+        }
+
+def compile_data(cards: List[Dict], mobs: List[Dict]) -> CompiledData:
+    """
+    Compile every card and mob. Records that fail to compile are listed in
+    .errors; their valid effects are kept so a simulation can still run.
+    """
+    compiled = CompiledData()
+    for card in cards:
+        card_id = card.get('card_template_id')
+        if not card_id:
+            continue
+        errors: List[str] = []
+        compiled.cards[card_id] = compile_effect(card.get('on_fire_effect'), errors)
+        compiled.errors.extend(('card_data.json', card_id, f"on_fire_effect: {e}") for e in errors)
+    for mob in mobs:
+        mob_id = mob.get('template_id')
+        if not mob_id:
+            continue
+        errors = []
+        compiled.mobs[mob_id] = compiled.compile_moves(mob, errors)
+        compiled.errors.extend(('mob_data.json', mob_id, e) for e in errors)
+    return compiled
+
+def compile_data_dir(data_path: Path = DATA_PATH) -> CompiledData:
+    def records(filename):
+        path = data_path / filename
+        return _load_records(path) if path.exists() else []
+    return compile_data(records('card_data.json'), records('mob_data.json'))
+
+def write_compiled(compiled: CompiledData, data_path: Path = DATA_PATH) -> Path:
+    """Write compiled_effects.json next to the data JSONs; refuses data with compile errors."""
+    if compiled.errors:
+        raise EffectCompileError(f"{len(compiled.errors)} record(s) failed to compile")
+    output = data_path / COMPILED_FILE
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(compiled.to_json(), f, separators=(',', ':'), ensure_ascii=False)
+    return output
+
+def disassemble(code: Tuple[float, ...]) -> List[str]:
+    lines = []
+    for i in range(0, len(code), 3):
+        op, operand, value = int(code[i]), int(code[i + 1]), code[i + 2]
+        name = OPCODE_NAMES[op]
+        if op in (OP_GENERATE, OP_CONSUME):
+            name += f' {FORCE_NAMES[operand]}'
+        elif op in (OP_DAMAGE, OP_PIERCE_DAMAGE, OP_POP_DAMAGE):
+            name += f' {DAMAGE_TARGETS[operand]}'
+        elif op in (OP_POISON, OP_EXECUTE, OP_BURN):
+            name += ' all' if operand else ' top'
+        elif op == OP_ACTIVATE:
+            name += f' {DIRECTIONS[operand]}'
+        elif op == OP_COMPLEX:
+            name += f' {COMPLEX_EFFECTS[operand]}'
+        elif op == OP_UNMODELLED:
+            name += f' {UNMODELLED_EFFECTS[operand]}'
+        lines.append(f"{op:3d} {operand:3d} {value:g}    ; {name}")
+    return lines
+
+def main():
+    """Compile the data JSONs, report unknown keys and write the compiled form."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile card effects and gremlin moves into opcode arrays")
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with the exported JSON files')
+    parser.add_argument('--check', action='store_true', help='Report unknown keys without writing')
+    parser.add_argument('--show', metavar='ID', help='Disassemble one card or mob')
+    args = parser.parse_args()
+
+    data_path = Path(args.data)
+    compiled = compile_data_dir(data_path)
+
+    if args.show:
+        if args.show in compiled.cards:
+            print("\n".join(disassemble(compiled.cards[args.show])) or "(no on_fire_effect)")
+        elif args.show in compiled.mobs:
+            for label, moves in zip(('moves', 'background'), compiled.mobs[args.show]):
+                for op, operand, value, ticks in moves:
+                    target = f" {compiled.symbols[operand]}" if op == MOVE_SUMMON else ''
+                    print(f"{label:10s} {op:3d} {operand:3d} {value:3d} @{ticks}    ; {MOVE_NAMES[op]}{target}")
+        else:
+            print(f"❌ No card or mob '{args.show}'")
+            return 1
+        return 0
+
+    drift = engine_drift() if ENGINE_SOURCE.exists() else []
+    for message in drift:
+        print(f"  ❌ {ENGINE_SOURCE.name}: {message}")
+    for file, record, message in compiled.errors:
+        print(f"  ❌ {file}: {record}: {message}")
+    print(f"📊 Compiled {len(compiled.cards)} cards, {len(compiled.mobs)} mobs")
+    if compiled.errors:
+        print(f"⚠️  {len(compiled.errors)} record(s) with unknown keys")
+        return 1
+    if drift:
+        print(f"⚠️  Effect key table is out of step with {ENGINE_SOURCE.name}")
+        return 1
+    if not args.check:
+        print(f"✅ Wrote {write_compiled(compiled, data_path)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+In-process stand-in for the Google Sheets values API, backed by local CSV files.
+Each tab is a CSV file named <tab>.csv in one directory. Supports
+values().get/update/append/clear/batchUpdate on A1 ranges with the same
+request/execute() shape and response fields as googleapiclient, so the wave
+scripts run offline.
+
+Switch the wave scripts to it with an environment variable:
+    WAVE_SHEETS_LOCAL=/tmp/waves python3 sort_waves_by_difficulty.py
+or with `--local DIR` on wave_maintenance.py.
+
+Seed a directory from the exported wave data:
+    python3 fake_sheets.py seed /tmp/waves
+
+Simulate throttling and flaky connections with WAVE_SHEETS_FAULTS, a comma
+separated list consumed one per request: an HTTP status ("429", "503:2" with
+a Retry-After of 2 seconds) fails the request before it is applied, and
+"timeout" applies it but loses the response.
+"""
+
+import csv
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_TAB = 'Sheet1'
+FAULTS_ENV = 'WAVE_SHEETS_FAULTS'
+
+# Cell part of an A1 range, e.g. "A:H", "B5", "A2:I30", "A5:H"
+CELLS_PATTERN = re.compile(r'^(?:([A-Za-z]{1,3})?(\d+)?(?::([A-Za-z]{1,3})?(\d+)?)?)?$')
+
+def column_index(letters: str) -> int:
+    """Zero-based column index for A1 letters: A -> 0, Z -> 25, AA -> 26."""
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + ord(char) - 64
+    return index - 1
+
+def column_letter(index: int) -> str:
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+class GridRange:
+    """A parsed A1 range; open ends (None) extend to the edge of the data."""
+
+    def __init__(self, tab: str, first_row: int, first_col: int,
+                 last_row: Optional[int], last_col: Optional[int]):
+        self.tab = tab
+        self.first_row = first_row     # Zero-based, inclusive
+        self.first_col = first_col
+        self.last_row = last_row       # Zero-based, inclusive; None = open
+        self.last_col = last_col
+
+    @classmethod
+    def parse(cls, a1: str, default_tab: str = DEFAULT_TAB, tabs: Tuple[str, ...] = ()) -> 'GridRange':
+        """
+        Parse "Sheet1!A:H", "'wave data'!B5", "A2:I30" or a bare (optionally quoted) tab name.
+        Like the API, a bare name that is an existing tab means the whole tab.
+        """
+        text = a1.strip()
+        if '!' not in text and len(text) > 1 and text[0] == text[-1] == "'":
+            text = text[1:-1].replace("''", "'")
+            tab, cells = text, ''
+        elif text in tabs:
+            tab, cells = text, ''
+        elif '!' in text:
+            tab, _, cells = text.rpartition('!')
+            if len(tab) > 1 and tab[0] == tab[-1] == "'":
+                tab = tab[1:-1].replace("''", "'")
+        elif CELLS_PATTERN.match(text):
+            tab, cells = default_tab, text
+        else:
+            tab, cells = text, ''
+
+        match = CELLS_PATTERN.match(cells)
+        if not match:
+            raise ValueError(f"Unable to parse range: {a1}")
+        col1, row1, col2, row2 = match.groups()
+        first_col = column_index(col1) if col1 else 0
+        first_row = int(row1) - 1 if row1 else 0
+        if ':' in cells:
+            last_col = column_index(col2) if col2 else None
+            last_row = int(row2) - 1 if row2 else None
+        else:
+            # Single cell, or the whole tab when no cells were given
+            last_col = first_col if col1 else None
+            last_row = first_row if row1 else None
+        return cls(tab, first_row, first_col, last_row, last_col)
+
+    def a1(self, last_row: int, last_col: int) -> str:
+        tab = f"'{self.tab}'" if re.search(r'\W', self.tab) else self.tab
+        return (f"{tab}!{column_letter(self.first_col)}{self.first_row + 1}"
+                f":{column_letter(last_col)}{last_row + 1}")
+
+class LocalResponse(dict):
+    """Response headers with a status, like the httplib2.Response on HttpError.resp."""
+
+    def __init__(self, status: int, headers: Optional[Dict[str, str]] = None):
+        super().__init__(headers or {})
+        self.status = status
+
+class LocalHttpError(Exception):
+    """Same shape as googleapiclient.errors.HttpError: the response is on .resp."""
+
+    def __init__(self, resp: LocalResponse):
+        super().__init__(f"<HttpError {resp.status} (injected by {FAULTS_ENV})>")
+        self.resp = resp
+
+class LocalTimeoutError(TimeoutError):
+    """The request was applied but its response never arrived."""
+
+def parse_faults(spec: str) -> List[Tuple[str, Optional[int], Optional[str]]]:
+    """("http", status, retry_after) / ("timeout", None, None) from "429:1,503,timeout"."""
+    faults = []
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        if part == 'timeout':
+            faults.append(('timeout', None, None))
+        else:
+            status, _, retry_after = part.partition(':')
+            faults.append(('http', int(status), retry_after or None))
+    return faults
+
+class _Request:
+    """Deferred call, matching googleapiclient's HttpRequest.execute()."""
+
+    def __init__(self, action: Callable[[], Dict], book: 'LocalSpreadsheet'):
+        self._action = action
+        self._book = book
+
+    def execute(self, num_retries: int = 0) -> Dict:
+        if not self._book.faults:
+            return self._action()
+        kind, status, retry_after = self._book.faults.pop(0)
+        self._book.calls.append(f'fault:{status or kind}')
+        if kind == 'timeout':
+            self._action()
+            raise LocalTimeoutError("response lost (injected)")
+        headers = {'retry-after': retry_after} if retry_after else {}
+        raise LocalHttpError(LocalResponse(status, headers))
+
+class LocalSpreadsheet:
+    """Tabs of one spreadsheet, each loaded from and saved to a CSV file."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.calls: List[str] = []
+        self.faults = parse_faults(os.environ.get(FAULTS_ENV, ''))
+
+    def _path(self, tab: str) -> Path:
+        return self.directory / f"{tab}.csv"
+
+    def tabs(self) -> Tuple[str, ...]:
+        return tuple(path.stem for path in self.directory.glob('*.csv'))
+
+    def parse(self, a1: str) -> 'GridRange':
+        return GridRange.parse(a1, tabs=self.tabs())
+
+    def load(self, tab: str) -> List[List[str]]:
+        path = self._path(tab)
+        if not path.exists():
+            return []
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return [row for row in csv.reader(f)]
+
+    def save(self, tab: str, grid: List[List[str]]) -> None:
+        grid = _trim(grid)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.csv.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerows(grid)
+        os.replace(temp_path, self._path(tab))
+
+def _trim(grid: List[List[str]]) -> List[List[str]]:
+    """Drop trailing empty cells and rows, as the Sheets API does on read."""
+    rows = []
+    for row in grid:
+        row = list(row)
+        while row and row[-1] == '':
+            row.pop()
+        rows.append(row)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+def _cell_text(value: Any) -> str:
+    """How a written value reads back (FORMATTED_VALUE)."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    return str(value)
+
+def _write(grid: List[List[str]], first_row: int, first_col: int, values: List[List[Any]]) -> Tuple[int, int, int]:
+    """Write a block into the grid; returns (rows, columns, cells) updated."""
+    width = max((len(row) for row in values), default=0)
+    for r, row in enumerate(values):
+        target_row = first_row + r
+        while len(grid) <= target_row:
+            grid.append([])
+        target = grid[target_row]
+        while len(target) < first_col + len(row):
+            target.append('')
+        for c, value in enumerate(row):
+            target[first_col + c] = _cell_text(value)
+    return len(values), width, sum(len(row) for row in values)
+
+class _Values:
+    """spreadsheets().values() resource."""
+
+    def __init__(self, book: LocalSpreadsheet):
+        self.book = book
+
+    def get(self, spreadsheetId: str, range: str, **kwargs) -> _Request:
+        def action():
+            self.book.calls.append('get')
+            target = self.book.parse(range)
+            if target.tab not in self.book.tabs():
+                # The API rejects reads from a tab that does not exist
+                raise ValueError(f"Unable to parse range: {range} (no {target.tab}.csv in {self.book.directory})")
+            grid = _trim(self.book.load(target.tab))
+            last_row = len(grid) - 1 if target.last_row is None else min(target.last_row, len(grid) - 1)
+            values = []
+            for row in grid[target.first_row:last_row + 1]:
+                end = len(row) if target.last_col is None else target.last_col + 1
+                values.append(row[target.first_col:end])
+            values = _trim(values)
+            result = {'range': range, 'majorDimension': 'ROWS'}
+            if values:
+                result['values'] = values
+            return result
+        return _Request(action, self.book)
+
+    def update(self, spreadsheetId: str, range: str, body: Dict, valueInputOption: str = 'RAW', **kwargs) -> _Request:
+        def action():
+            self.book.calls.append('update')
+            return self._update(range, body.get('values', []))
+        return _Request(action, self.book)
+
+    def _update(self, a1, values: List[List[Any]]) -> Dict:
+        target = a1 if isinstance(a1, GridRange) else self.book.parse(a1)
+        grid = self.book.load(target.tab)
+        response = self._write_block(grid, target, values)
+        self.book.save(target.tab, grid)
+        return response
+
+    @staticmethod
+    def _write_block(grid: List[List[str]], target: GridRange, values: List[List[Any]]) -> Dict:
+        rows, columns, cells = _write(grid, target.first_row, target.first_col, values)
+        return {
+            'spreadsheetId': 'local',
+            'updatedRange': target.a1(target.first_row + max(rows - 1, 0), target.first_col + max(columns - 1, 0)),
+            'updatedRows': rows,
+            'updatedColumns': columns,
+            'updatedCells': cells,
+        }
+
+    def append(self, spreadsheetId: str, range: str, body: Dict, valueInputOption: str = 'RAW', **kwargs) -> _Request:
+        def action():
+            self.book.calls.append('append')
+            target = self.book.parse(range)
+            grid = _trim(self.book.load(target.tab))
+            # The table ends at the last row with data in the range's columns
+            last_col = target.last_col
+            next_row = target.first_row
+            for index, row in enumerate(grid):
+                cells = row[target.first_col:None if last_col is None else last_col + 1]
+                if index >= target.first_row and any(cell != '' for cell in cells):
+                    next_row = index + 1
+            block = GridRange(target.tab, next_row, target.first_col, None, None)
+            updates = self._update(block, body.get('values', []))
+            return {'spreadsheetId': 'local', 'tableRange': range, 'updates': updates}
+        return _Request(action, self.book)
+
+    def clear(self, spreadsheetId: str, range: str, body: Optional[Dict] = None, **kwargs) -> _Request:
+        def action():
+            self.book.calls.append('clear')
+            target = self.book.parse(range)
+            grid = self.book.load(target.tab)
+            last_row = len(grid) - 1 if target.last_row is None else min(target.last_row, len(grid) - 1)
+            for row in grid[target.first_row:last_row + 1]:
+                end = len(row) if target.last_col is None else min(target.last_col + 1, len(row))
+                if end > target.first_col:
+                    row[target.first_col:end] = [''] * (end - target.first_col)
+            self.book.save(target.tab, grid)
+            return {'spreadsheetId': 'local', 'clearedRange': range}
+        return _Request(action, self.book)
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict, **kwargs) -> _Request:
+        def action():
+            self.book.calls.append('batchUpdate')
+            # Each tab is loaded and saved once, however many ranges touch it
+            grids: Dict[str, List[List[str]]] = {}
+            responses = []
+            for entry in body.get('data', []):
+                target = self.book.parse(entry['range'])
+                if target.tab not in grids:
+                    grids[target.tab] = self.book.load(target.tab)
+                responses.append(self._write_block(grids[target.tab], target, entry.get('values', [])))
+            for tab, grid in grids.items():
+                self.book.save(tab, grid)
+            return {
+                'spreadsheetId': 'local',
+                'totalUpdatedRows': sum(r['updatedRows'] for r in responses),
+                'totalUpdatedColumns': max((r['updatedColumns'] for r in responses), default=0),
+                'totalUpdatedCells': sum(r['updatedCells'] for r in responses),
+                'totalUpdatedSheets': len(grids),
+                'responses': responses,
+            }
+        return _Request(action, self.book)
+
+class _Spreadsheets:
+    def __init__(self, book: LocalSpreadsheet):
+        self._values = _Values(book)
+
+    def values(self) -> _Values:
+        return self._values
+
+class LocalSheetsService:
+    """Drop-in for build('sheets', 'v4', ...) that reads and writes CSV files."""
+
+    def __init__(self, directory):
+        self.book = LocalSpreadsheet(Path(directory))
+        self._spreadsheets = _Spreadsheets(self.book)
+
+    def spreadsheets(self) -> _Spreadsheets:
+        return self._spreadsheets
+
+def seed_from_json(json_path: Path, directory: Path, tab: str = DEFAULT_TAB) -> int:
+    """Write an exported data JSON back out as a sheet tab; lists become "a|b"."""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    header: List[str] = []
+    for record in records:
+        for key, value in record.items():
+            if key not in header and not isinstance(value, dict):
+                header.append(key)
+
+    grid = [header]
+    for record in records:
+        row = []
+        for key in header:
+            value = record.get(key, '')
+            row.append('|'.join(map(str, value)) if isinstance(value, list) else _cell_text(value))
+        grid.append(row)
+    LocalSpreadsheet(directory).save(tab, grid)
+    return len(records)
+
+def main():
+    """Seed or inspect a local sheet directory."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local CSV-backed Sheets API stand-in")
+    sub = parser.add_subparsers(dest='command', required=True)
+    seed = sub.add_parser('seed', help='Create a tab from an exported data JSON')
+    seed.add_argument('directory', help='Directory holding <tab>.csv files')
+    seed.add_argument('--json', default='src/scenes/data/wave_data.json', help='Exported data JSON')
+    seed.add_argument('--tab', default=DEFAULT_TAB, help='Tab name to write')
+    show = sub.add_parser('get', help='Print a range')
+    show.add_argument('directory', help='Directory holding <tab>.csv files')
+    show.add_argument('range', help='A1 range, e.g. Sheet1!A1:D10')
+    args = parser.parse_args()
+
+    if args.command == 'seed':
+        count = seed_from_json(Path(args.json), Path(args.directory), args.tab)
+        print(f"✅ Seeded {args.tab} with {count} rows in {args.directory}")
+        return 0
+
+    result = LocalSheetsService(args.directory).spreadsheets().values().get(
+        spreadsheetId='local', range=args.range).execute()
+    for row in result.get('values', []):
+        print('\t'.join(row))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Bracket-aware call-site extractor for GDScript.
+Scans a file once and records every call with its exact argument count,
+call and argument spans, and receiver expression. Handles nested calls,
+multi-line argument lists, strings, comments, lambdas and trailing commas.
+"""
+
+import bisect
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r'''
+    (?P<string>"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+  | (?P<comment>\#[^\n]*)
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\w*)
+  | (?P<ident>[A-Za-z_]\w*)
+  | (?P<open>[(\[{])
+  | (?P<close>[)\]}])
+  | (?P<comma>,)
+  | (?P<dot>\.)
+  | (?P<other>[^\s\w])
+''', re.VERBOSE)
+
+# Words that may be followed by "(" without being a call
+NON_CALL_KEYWORDS = {
+    'if', 'elif', 'else', 'while', 'for', 'in', 'match', 'return', 'and', 'or',
+    'not', 'is', 'as', 'var', 'const', 'static', 'when', 'await', 'yield',
+}
+
+# Words whose following "name(" is a declaration, not a call
+DECLARATION_KEYWORDS = {'func', 'signal'}
+
+@dataclass
+class CallSite:
+    name: str
+    receiver: Optional[str]     # Full receiver expression, e.g. "a.b()" for a.b().c(x)
+    arg_count: int
+    start: int                  # Offset of the receiver (or callee name if none)
+    name_start: int             # Offset of the callee name
+    end: int                    # Offset just past the closing ")"
+    line: int
+    column: int
+    end_line: int
+    arg_spans: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def receiver_name(self) -> Optional[str]:
+        """Last identifier of the receiver chain, e.g. "b" for self.a.b.foo()."""
+        if not self.receiver:
+            return None
+        match = re.search(r'(\w+)\s*$', self.receiver)
+        return match.group(1) if match else None
+
+    def args(self, content: str) -> List[str]:
+        return [content[s:e].strip() for s, e in self.arg_spans]
+
+class _Frame:
+    """An open bracket; call frames also accumulate argument spans."""
+    __slots__ = ('token_index', 'call', 'arg_start', 'has_content')
+
+    def __init__(self, token_index: int, call: Optional[CallSite], arg_start: int):
+        self.token_index = token_index
+        self.call = call
+        self.arg_start = arg_start
+        self.has_content = False
+
+def _line_starts(content: str) -> List[int]:
+    starts = [0]
+    find = content.find
+    pos = find('\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = find('\n', pos + 1)
+    return starts
+
+def extract_call_sites(content: str) -> List[CallSite]:
+    """Return every call in the source, in order of the closing parenthesis."""
+    line_starts = _line_starts(content)
+
+    def line_col(offset: int) -> Tuple[int, int]:
+        index = bisect.bisect_right(line_starts, offset) - 1
+        return index + 1, offset - line_starts[index] + 1
+
+    kinds: List[str] = []
+    starts: List[int] = []
+    texts: List[str] = []
+    match_open: Dict[int, int] = {}  # close token index -> open token index
+    stack: List[_Frame] = []
+    calls: List[CallSite] = []
+
+    for match in TOKEN_PATTERN.finditer(content):
+        kind = match.lastgroup
+        if kind == 'comment':
+            continue
+        index = len(kinds)
+        start = match.start()
+        text = match.group()
+        kinds.append(kind)
+        starts.append(start)
+        texts.append(text)
+
+        if stack and kind != 'close':
+            stack[-1].has_content = True
+
+        if kind == 'open':
+            call = None
+            if text == '(' and index > 0 and kinds[index - 1] == 'ident':
+                call = _start_call(index - 1, kinds, starts, texts, match_open, content)
+            stack.append(_Frame(index, call, match.end()))
+        elif kind == 'comma':
+            frame = stack[-1] if stack else None
+            if frame and frame.call:
+                frame.call.arg_spans.append((frame.arg_start, start))
+                frame.arg_start = match.end()
+                frame.has_content = False
+        elif kind == 'close':
+            if not stack:
+                continue  # Unbalanced close, ignore
+            frame = stack.pop()
+            match_open[index] = frame.token_index
+            call = frame.call
+            if call:
+                if frame.has_content:
+                    call.arg_spans.append((frame.arg_start, start))
+                call.arg_count = len(call.arg_spans)
+                call.end = match.end()
+                call.line, call.column = line_col(call.name_start)
+                call.end_line = line_col(start)[0]
+                calls.append(call)
+            if stack:
+                stack[-1].has_content = True
+
+    return calls
+
+def _start_call(name_index: int, kinds: List[str], starts: List[int], texts: List[str],
+                match_open: Dict[int, int], content: str) -> Optional[CallSite]:
+    """Build a CallSite for "name(" at token name_index, or None if it is not a call."""
+    name = texts[name_index]
+    if name in NON_CALL_KEYWORDS or name in DECLARATION_KEYWORDS:
+        return None  # Keyword, or a lambda "func(...)"
+    if name_index > 0 and kinds[name_index - 1] == 'ident' and texts[name_index - 1] in DECLARATION_KEYWORDS:
+        return None  # func/signal declaration
+
+    name_start = starts[name_index]
+    receiver = None
+    receiver_start = name_start
+    if name_index > 0 and kinds[name_index - 1] == 'dot':
+        # Walk back over the receiver chain: idents, balanced brackets and dots
+        i = name_index - 2
+        first = name_index - 1
+        while i >= 0:
+            if kinds[i] == 'ident':
+                first = i
+                if i > 0 and kinds[i - 1] == 'dot':
+                    i -= 2
+                    continue
+                break
+            if kinds[i] == 'close' and i in match_open:
+                first = match_open[i]
+                i = first - 1
+                if i >= 0 and kinds[i] in ('ident', 'close', 'dot'):
+                    if kinds[i] == 'dot':
+                        i -= 1
+                    continue
+                break
+            break
+        if first < name_index - 1:
+            receiver_start = starts[first]
+            receiver = content[receiver_start:starts[name_index - 1]].strip()
+
+    return CallSite(
+        name=name, receiver=receiver, arg_count=0,
+        start=receiver_start, name_start=name_start, end=name_start,
+        line=0, column=0, end_line=0,
+    )
+
+def extract_file_calls(filepath: Path) -> List[CallSite]:
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return extract_call_sites(f.read())
+
+def index_project_calls(src_path: Path) -> Dict[str, List[CallSite]]:
+    """Extract call sites for every script under src_path, keyed by path."""
+    return {str(p): extract_file_calls(p) for p in sorted(src_path.rglob("*.gd"))}
+
+def iter_calls_to(index: Dict[str, List[CallSite]], name: str) -> Iterator[Tuple[str, CallSite]]:
+    for path, calls in index.items():
+        for call in calls:
+            if call.name == name:
+                yield path, call
+
+def main():
+    """Print call sites for the given files."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List GDScript call sites with argument counts")
+    parser.add_argument('files', nargs='+', help='GDScript files to scan')
+    parser.add_argument('--name', help='Only show calls to this method')
+    args = parser.parse_args()
+
+    for path in args.files:
+        for call in extract_file_calls(Path(path)):
+            if args.name and call.name != args.name:
+                continue
+            target = f"{call.receiver}.{call.name}" if call.receiver else call.name
+            print(f"{path}:{call.line}:{call.column}: {target}() args={call.arg_count}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
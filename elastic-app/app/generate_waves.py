@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Wave roster generator.
+Searches for gremlin compositions whose difficulty (wave_difficulty.py) falls
+in a target band, and writes them as rows import_waves.py can upsert.
+
+A wave fits the 5 gremlin slots of GremlinManager, and every summoner keeps
+slots free for its summons (up to its summon_cap), so each mob has a slot
+weight of 1 + reserved slots. The search is branch-and-bound over mob counts:
+a table of reachable score sums per (first mob, slot weight), kept as integer
+bitsets, tells in O(1) whether a partial composition can still land in the
+band, so only branches that lead to a valid wave are explored. The table costs
+mobs x slots big-int operations, which keeps hundreds of mobs cheap.
+
+Without --band, the bands are the EndlessWaveManager windows (target
+5 + 10 * (wave - 1), +/- 30%) that have fewer than --min-candidates waves.
+
+Usage:
+    python3 generate_waves.py                       # Fill thin endless windows
+    python3 generate_waves.py --band 2:40-60 --band 3:150-200 -o wave_batches/generated.csv
+    python3 import_waves.py wave_batches/generated.csv --dry-run
+"""
+
+import bisect
+import csv
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from wave_difficulty import DATA_PATH, DifficultyScorer, _load_records, parse_gremlins
+
+MAX_SLOTS = 5                 # GremlinManager.gremlin_slots
+MAX_SUMMON_RESERVE = 2        # Slots a summoner keeps free (capped by its summon_cap)
+BASE_DIFFICULTY = 5           # EndlessWaveManager.start_next_wave()
+DIFFICULTY_PER_WAVE = 10
+RANGE_LOW = 0.7
+RANGE_HIGH = 1.3
+MAX_SEARCH = 20000            # Compositions enumerated per band before selecting
+BATCH_DIR = Path(__file__).resolve().parent / 'wave_batches'
+# The wave sheet's columns; import_waves.py recomputes difficulty, it is listed for review
+OUTPUT_FIELDS = ['wave_id', 'display_name', 'act', 'difficulty', 'gremlins']
+WAVE_NUMBER = re.compile(r'^wave_(\d+)')
+
+@dataclass
+class Band:
+    act: int
+    low: int
+    high: int
+
+    @classmethod
+    def parse(cls, text: str) -> 'Band':
+        """"ACT:LOW-HIGH", e.g. "2:40-60"."""
+        match = re.match(r'^(\d+):(\d+)-(\d+)$', text.strip())
+        if not match:
+            raise ValueError(f"Bad band '{text}' (expected ACT:LOW-HIGH)")
+        act, low, high = map(int, match.groups())
+        return cls(act, min(low, high), max(low, high))
+
+    def __str__(self) -> str:
+        return f"act {self.act}: {self.low}-{self.high}"
+
+class RosterSearch:
+    """Branch-and-bound enumeration of compositions over a fixed mob pool."""
+
+    def __init__(self, scorer: DifficultyScorer, mob_ids: List[str], max_slots: int = MAX_SLOTS):
+        self.scorer = scorer
+        self.max_slots = max_slots
+        # Cheapest first, so each band's search starts from filler mobs
+        self.mob_ids = sorted(mob_ids, key=scorer.mob_score)
+        self.scores = [max(0, round(scorer.mob_score(m))) for m in self.mob_ids]
+        self.weights = [1 + self.summon_reserve(scorer.mobs[m]) for m in self.mob_ids]
+
+        # reach[i][w]: bitset of score sums reachable with mobs i.. at slot weight <= w
+        count = len(self.mob_ids)
+        exact = [[0] * (max_slots + 1) for _ in range(count + 1)]
+        exact[count][0] = 1
+        for i in range(count - 1, -1, -1):
+            score, weight = self.scores[i], self.weights[i]
+            for w in range(max_slots + 1):
+                bits = exact[i + 1][w]
+                if w >= weight:
+                    bits |= exact[i][w - weight] << score
+                exact[i][w] = bits
+        self.reach = []
+        for row in exact:
+            cumulative, running = [], 0
+            for bits in row:
+                running |= bits
+                cumulative.append(running)
+            self.reach.append(cumulative)
+
+    def summon_reserve(self, mob: Dict) -> int:
+        if not any(key == 'summon' for key, _, _ in self.scorer.moves(mob)):
+            return 0
+        cap = int(mob.get('summon_cap') or 0)
+        return min(cap, MAX_SUMMON_RESERVE) if cap > 0 else MAX_SUMMON_RESERVE
+
+    @staticmethod
+    def _any_in(bits: int, low: int, high: int) -> bool:
+        if high < 0:
+            return False
+        low = max(low, 0)
+        return (bits >> low) & ((1 << (high - low + 1)) - 1) != 0
+
+    def compositions(self, low: int, high: int, limit: int = MAX_SEARCH) -> Iterator[List[str]]:
+        """Multisets of mob ids whose rounded score sum lies in [low, high]."""
+        found = 0
+        chosen: List[int] = []
+
+        def search(start: int, slots_left: int, total: int) -> Iterator[List[str]]:
+            nonlocal found
+            if chosen and low <= total <= high:
+                found += 1
+                yield [self.mob_ids[i] for i in chosen]
+            for i in range(start, len(self.mob_ids)):
+                if found >= limit:
+                    return
+                weight, score = self.weights[i], self.scores[i]
+                if weight > slots_left:
+                    continue
+                new_total = total + score
+                # Bound: some completion from mobs i.. must land in the band
+                if not self._any_in(self.reach[i][slots_left - weight], low - new_total, high - new_total):
+                    continue
+                chosen.append(i)
+                yield from search(i, slots_left - weight, new_total)
+                chosen.pop()
+
+        if self._any_in(self.reach[0][self.max_slots], low, high):
+            yield from search(0, self.max_slots, 0)
+
+def select(candidates: List[Tuple[List[str], int]], band: Band, count: int) -> List[Tuple[List[str], int]]:
+    """Pick count varied candidates: fewest repeated mobs first, then nearest the band centre."""
+    centre = (band.low + band.high) / 2
+    picked: List[Tuple[List[str], int]] = []
+    used: Dict[str, int] = {}
+    remaining = list(candidates)
+    while remaining and len(picked) < count:
+        best = min(remaining, key=lambda c: (sum(used.get(m, 0) for m in set(c[0])),
+                                             abs(c[1] - centre), len(c[0])))
+        remaining.remove(best)
+        picked.append(best)
+        for mob_id in set(best[0]):
+            used[mob_id] = used.get(mob_id, 0) + 1
+    return picked
+
+def existing_waves(data_path: Path) -> List[Dict]:
+    """Waves in wave_data.json plus the definitions in wave_batches/."""
+    waves = list(_load_records(data_path / 'wave_data.json'))
+    for path in sorted(BATCH_DIR.glob('*.csv')):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            waves.extend(csv.DictReader(f))
+    return waves
+
+def gap_bands(waves: List[Dict], wave_count: int, min_candidates: int) -> List[Band]:
+    """EndlessWaveManager windows with fewer than min_candidates waves."""
+    by_difficulty = sorted((int(float(w.get('difficulty') or 0)), int(float(w.get('act') or 1)))
+                           for w in waves if w.get('difficulty') not in (None, ''))
+    difficulties = [d for d, _ in by_difficulty]
+    bands = []
+    for number in range(1, wave_count + 1):
+        target = BASE_DIFFICULTY + (number - 1) * DIFFICULTY_PER_WAVE
+        low, high = int(target * RANGE_LOW), int(target * RANGE_HIGH)
+        if bisect.bisect_right(difficulties, high) - bisect.bisect_left(difficulties, low) >= min_candidates:
+            continue
+        # Act of the existing wave nearest the target
+        nearest = min(by_difficulty, key=lambda d: abs(d[0] - target), default=(0, 1))
+        bands.append(Band(nearest[1], low, high))
+    return bands
+
+def generate(scorer: DifficultyScorer, bands: List[Band], per_band: int, waves: List[Dict],
+             include_bosses: bool = False) -> List[Dict]:
+    """Candidate wave rows for every band, skipping compositions that already exist."""
+    pool = [m for m, mob in scorer.mobs.items() if include_bosses or mob.get('size_category') != 'boss']
+    search = RosterSearch(scorer, pool)
+    taken = {tuple(sorted(parse_gremlins(w.get('gremlins')))) for w in waves}
+    numbers = [int(m.group(1)) for m in (WAVE_NUMBER.match(str(w.get('wave_id', ''))) for w in waves) if m]
+    next_number = max(numbers, default=0) + 1
+
+    rows = []
+    for band in bands:
+        candidates = []
+        for gremlins in search.compositions(band.low, band.high):
+            key = tuple(sorted(gremlins))
+            difficulty = scorer.wave_score(gremlins)
+            # Rounded per-mob scores can drift from the exact wave score at the edges
+            if key in taken or not band.low <= difficulty <= band.high:
+                continue
+            candidates.append((gremlins, difficulty))
+
+        picked = select(candidates, band, per_band)
+        for letter, (gremlins, difficulty) in zip('abcdefghijklmnopqrstuvwxyz', picked):
+            gremlins = sorted(gremlins, key=scorer.mob_score, reverse=True)
+            taken.add(tuple(sorted(gremlins)))
+            counts: Dict[str, int] = {}
+            for mob_id in gremlins:
+                counts[mob_id] = counts.get(mob_id, 0) + 1
+            names = [f"{n} {scorer.mobs[m].get('display_name', m)}" if n > 1 else scorer.mobs[m].get('display_name', m)
+                     for m, n in sorted(counts.items(), key=lambda item: -scorer.mob_score(item[0]))]
+            rows.append({
+                'wave_id': f'wave_{next_number}{letter}',
+                'display_name': ' + '.join(names),
+                'act': band.act,
+                'difficulty': difficulty,
+                'gremlins': '|'.join(gremlins),
+            })
+        if picked:
+            next_number += 1
+    return rows
+
+def main():
+    """Generate candidate waves for the requested (or missing) difficulty bands."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate waves that hit target difficulty bands")
+    parser.add_argument('--band', action='append', default=[], metavar='ACT:LOW-HIGH',
+                        help='Target band (repeatable); default: thin EndlessWaveManager windows')
+    parser.add_argument('--per-band', type=int, default=3, help='Waves to generate per band')
+    parser.add_argument('--waves', type=int, default=30, help='Endless waves to check for gaps')
+    parser.add_argument('--min-candidates', type=int, default=2, help='Windows with fewer waves count as gaps')
+    parser.add_argument('--include-bosses', action='store_true', help='Allow boss-size gremlins')
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with mob_data.json / wave_data.json')
+    parser.add_argument('-o', '--output', help='Write rows to this CSV instead of stdout')
+    args = parser.parse_args()
+
+    scorer = DifficultyScorer.from_data(Path(args.data))
+    waves = existing_waves(Path(args.data))
+    try:
+        bands = [Band.parse(text) for text in args.band]
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if not bands:
+        bands = gap_bands(waves, args.waves, args.min_candidates)
+        if not bands:
+            print("✅ Every endless window already has enough waves", file=sys.stderr)
+            return 0
+
+    rows = generate(scorer, bands, args.per_band, waves, args.include_bosses)
+    for band in bands:
+        hits = sum(1 for r in rows if r['act'] == band.act and band.low <= r['difficulty'] <= band.high)
+        marker = '✅' if hits else '⚠️ '
+        print(f"{marker} {band}: {hits} wave(s)", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS, lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"📄 Wrote {len(rows)} wave(s) to {args.output}", file=sys.stderr)
+    else:
+        writer = csv.DictWriter(sys.stdout, fieldnames=OUTPUT_FIELDS, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
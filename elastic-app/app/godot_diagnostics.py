@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Structured parser for Godot compile/check output.
+Turns raw stdout/stderr lines into (file, line, column, code, message) records,
+groups "Failed to compile depended scripts" cascades under their root cause
+and collapses identical errors.
+"""
+
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Header line of a two-line Godot report, e.g.
+#   SCRIPT ERROR: Parse Error: Identifier "Foo" not declared in the current scope.
+#   ERROR: Failed to load script "res://src/foo.gd" with error "Parse error".
+HEADER_PATTERN = re.compile(r'^\s*(SCRIPT ERROR|SCRIPT WARNING|ERROR|WARNING|USER ERROR|USER WARNING):\s*(.*)$')
+
+# Location line that follows a header, e.g.
+#   at: GDScript::reload (res://src/foo.gd:12)
+LOCATION_PATTERN = re.compile(r'^\s*at:\s*.*?\((res://[^:()]+?)(?::(\d+))?(?::(\d+))?\)\s*$')
+
+# Single-line form, e.g.
+#   res://src/foo.gd:12:5 - Parse Error: Expected end of statement
+INLINE_PATTERN = re.compile(r'^\s*(?:ERROR:\s*)?(res://\S+?\.gd):(\d+)(?::(\d+))?\s*-\s*(.*)$')
+
+# smart_compile_check.gd report lines, e.g.
+#   [DEBUG]   ❌ card.gd:42 - Missing ':' after function definition
+SMART_CHECK_PATTERN = re.compile(r'^(?:\[DEBUG\])?\s*(❌|⚠️)\s*(\S+\.gd):(\d+)\s*-\s*(.*)$')
+
+# smart_compile_check.gd report lines without a location, e.g.
+#   [DEBUG]   ❌ Autoload script not found: StaticData -> res://src/static_data.gd
+SMART_CHECK_UNLOCATED_PATTERN = re.compile(r'^(?:\[DEBUG\])?\s*(❌|⚠️)\s*(.+)$')
+
+# "Parse Error: message" / "Compile Error: message"
+KIND_PATTERN = re.compile(r'^(Parse Error|Compile Error|Runtime Error|Parser Bug|Analyzer Bug):\s*(.*)$')
+
+# Trailing warning code, e.g. "... never used. (UNUSED_VARIABLE)"
+TRAILING_CODE_PATTERN = re.compile(r'\s*\(([A-Z][A-Z0-9_]+)\)\s*$')
+
+# Follow-on error emitted after a script failed to parse
+LOAD_FAILED_PATTERN = re.compile(r'Failed to load script "(res://[^"]+)" with error "([^"]+)"')
+
+CASCADE_MARKER = 'Failed to compile depended scripts'
+
+# Codes for bare "ERROR:"/"WARNING:" headers that are not tied to a script:
+# resource loading, rendering/audio drivers and other engine output that a
+# headless run prints on a healthy project. They never count as compile errors.
+ENGINE_CODES = ('ENGINE_ERROR', 'ENGINE_WARNING')
+
+@dataclass(frozen=True)
+class Diagnostic:
+    file: str
+    line: int
+    column: int
+    code: str
+    message: str
+    severity: str = "ERROR"
+
+    @property
+    def is_cascade(self) -> bool:
+        """True for errors that only report a failure in another script."""
+        return self.code in ('DEPENDENCY_FAILED', 'LOAD_FAILED')
+
+    @property
+    def is_engine_noise(self) -> bool:
+        """True for engine messages that say nothing about the scripts."""
+        return self.code in ENGINE_CODES
+
+    def location(self) -> str:
+        if self.column:
+            return f"{self.file}:{self.line}:{self.column}"
+        return f"{self.file}:{self.line}"
+
+    def format(self) -> str:
+        if not self.file:
+            return f"[{self.code}] {self.message}"
+        return f"{self.location()}: [{self.code}] {self.message}"
+
+@dataclass
+class DiagnosticGroup:
+    """A root-cause diagnostic plus its duplicates and the cascades it caused."""
+    root: Diagnostic
+    count: int = 1
+    cascades: Dict[Diagnostic, int] = field(default_factory=dict)
+
+    def format(self, max_cascades: int = 5) -> str:
+        text = self.root.format()
+        if self.count > 1:
+            text += f" (x{self.count})"
+        if self.cascades:
+            files = sorted({d.file for d in self.cascades})
+            text += f"\n    ↳ caused {sum(self.cascades.values())} dependent failure(s) in {len(files)} file(s)"
+            for path in files[:max_cascades]:
+                text += f"\n      - {path}"
+            if len(files) > max_cascades:
+                text += f"\n      ... and {len(files) - max_cascades} more"
+        return text
+
+def _classify(message: str, severity: str) -> Tuple[str, str]:
+    """Derive a stable code from a Godot message and strip the prefix."""
+    message = message.strip()
+    if CASCADE_MARKER in message:
+        return 'DEPENDENCY_FAILED', CASCADE_MARKER
+
+    if LOAD_FAILED_PATTERN.search(message):
+        return 'LOAD_FAILED', message
+
+    code_match = TRAILING_CODE_PATTERN.search(message)
+    if code_match:
+        return code_match.group(1), message[:code_match.start()].rstrip()
+
+    kind_match = KIND_PATTERN.match(message)
+    if kind_match:
+        return kind_match.group(1).upper().replace(' ', '_'), kind_match.group(2).strip()
+
+    return ('SCRIPT_WARNING' if 'WARNING' in severity else 'SCRIPT_ERROR'), message
+
+def _header_code(code: str, severity: str, file_path: str) -> str:
+    """Reclassify a bare ERROR/WARNING header that is not about a script as engine output."""
+    if severity in ('ERROR', 'WARNING') and code in ('SCRIPT_ERROR', 'SCRIPT_WARNING') \
+            and not file_path.endswith('.gd'):
+        return 'ENGINE_' + severity
+    return code
+
+def parse_lines(lines: Iterable[str]) -> Iterator[Diagnostic]:
+    """
+    Parse Godot output line by line, yielding diagnostics as soon as they are
+    complete. Works on any iterable, so a subprocess pipe can be streamed.
+    """
+    pending: Optional[Tuple[str, str]] = None  # (severity, message) awaiting an "at:" line
+
+    for raw_line in lines:
+        line = raw_line.rstrip('\r\n')
+        if not line.strip():
+            continue
+
+        if pending:
+            location = LOCATION_PATTERN.match(line)
+            if location:
+                severity, message = pending
+                pending = None
+                code, text = _classify(message, severity)
+                yield Diagnostic(
+                    file=location.group(1),
+                    line=int(location.group(2) or 0),
+                    column=int(location.group(3) or 0),
+                    code=_header_code(code, severity, location.group(1)),
+                    message=text,
+                    severity='WARNING' if 'WARNING' in severity else 'ERROR',
+                )
+                continue
+            # Header without a usable location; flush it before handling this line
+            yield from _flush_unlocated(pending)
+            pending = None
+            if line.lstrip().startswith('at:'):
+                continue
+
+        inline = INLINE_PATTERN.match(line)
+        if inline:
+            code, text = _classify(inline.group(4), 'ERROR')
+            yield Diagnostic(inline.group(1), int(inline.group(2)), int(inline.group(3) or 0), code, text)
+            continue
+
+        header = HEADER_PATTERN.match(line)
+        if header:
+            pending = (header.group(1), header.group(2))
+            continue
+
+        smart = SMART_CHECK_PATTERN.match(line)
+        if smart:
+            severity = 'ERROR' if smart.group(1) == '❌' else 'WARNING'
+            code, text = _classify(smart.group(4), severity)
+            if code in ('SCRIPT_ERROR', 'SCRIPT_WARNING'):
+                code = 'CHECK_' + severity
+            yield Diagnostic(smart.group(2), int(smart.group(3)), 0, code, text, severity)
+            continue
+
+        unlocated = SMART_CHECK_UNLOCATED_PATTERN.match(line)
+        if unlocated:
+            # Kept ungrouped so checks that name no file:line are still reported
+            severity = 'ERROR' if unlocated.group(1) == '❌' else 'WARNING'
+            yield Diagnostic("", 0, 0, 'CHECK_' + severity, unlocated.group(2).strip(), severity)
+
+    if pending:
+        yield from _flush_unlocated(pending)
+
+def _flush_unlocated(pending: Tuple[str, str]) -> Iterator[Diagnostic]:
+    """Emit a header that had no "at:" line, recovering the file from the message if possible."""
+    severity, message = pending
+    code, text = _classify(message, severity)
+    load_failed = LOAD_FAILED_PATTERN.search(message)
+    file_path = load_failed.group(1) if load_failed else ""
+    code = _header_code(code, severity, file_path)
+    yield Diagnostic(file_path, 0, 0, code, text, 'WARNING' if 'WARNING' in severity else 'ERROR')
+
+class DiagnosticCollector:
+    """
+    Groups a diagnostic stream by root cause.
+
+    Identical diagnostics are collapsed into one group with a count. Cascade
+    diagnostics (dependent-script failures, follow-on load failures) are
+    attached to the root error in the same file if there is one, otherwise to
+    the most recent root error, since Godot reports the failing dependency
+    before the scripts that depend on it. Engine noise is counted and dropped
+    without affecting that attribution.
+    """
+
+    def __init__(self, ignore: Optional[Callable[[Diagnostic], bool]] = None):
+        self.ignore = ignore
+        self.groups: Dict[Diagnostic, DiagnosticGroup] = {}
+        self.root_by_file: Dict[str, DiagnosticGroup] = {}
+        self.last_root: Optional[DiagnosticGroup] = None
+        self.orphan_cascades: Dict[Diagnostic, int] = {}
+        self.absorbing = False
+        self.ignored = 0
+        self.engine = 0
+        self.total = 0
+
+    def add(self, diagnostic: Diagnostic) -> None:
+        self.total += 1
+        if diagnostic.is_engine_noise:
+            self.engine += 1
+            return
+        if self.ignore and self.ignore(diagnostic):
+            self.ignored += 1
+            if diagnostic.severity == 'ERROR' and not diagnostic.is_cascade:
+                # Cascades following an ignored root are noise as well
+                self.last_root = None
+                self.absorbing = True
+            return
+
+        if diagnostic.is_cascade:
+            owner = self.root_by_file.get(diagnostic.file) or self.last_root
+            if owner is None and self.absorbing:
+                self.ignored += 1
+            elif owner is None:
+                self.orphan_cascades[diagnostic] = self.orphan_cascades.get(diagnostic, 0) + 1
+            elif owner.root.file != diagnostic.file or diagnostic.code != 'LOAD_FAILED':
+                owner.cascades[diagnostic] = owner.cascades.get(diagnostic, 0) + 1
+            return
+
+        group = self.groups.get(diagnostic)
+        if group:
+            group.count += 1
+            return
+
+        group = DiagnosticGroup(diagnostic)
+        self.groups[diagnostic] = group
+        if diagnostic.severity == 'ERROR':
+            self.root_by_file.setdefault(diagnostic.file, group)
+            self.last_root = group
+            self.absorbing = False
+            if self.orphan_cascades:
+                # Cascades reported before any root belong to the first root we see
+                for cascade, count in self.orphan_cascades.items():
+                    if cascade.file != diagnostic.file or cascade.code != 'LOAD_FAILED':
+                        group.cascades[cascade] = group.cascades.get(cascade, 0) + count
+                self.orphan_cascades = {}
+
+    def extend(self, diagnostics: Iterable[Diagnostic]) -> 'DiagnosticCollector':
+        for diagnostic in diagnostics:
+            self.add(diagnostic)
+        return self
+
+    def results(self) -> List[DiagnosticGroup]:
+        """Root groups in first-seen order, plus any cascades that never found a root."""
+        groups = list(self.groups.values())
+        for cascade, count in self.orphan_cascades.items():
+            groups.append(DiagnosticGroup(cascade, count))
+        return groups
+
+    def errors(self) -> List[DiagnosticGroup]:
+        return [g for g in self.results() if g.root.severity == 'ERROR']
+
+    def root_errors(self) -> List[DiagnosticGroup]:
+        """Errors that are a root cause, excluding cascades that never found one."""
+        return [g for g in self.errors() if not g.root.is_cascade]
+
+    def warnings(self) -> List[DiagnosticGroup]:
+        return [g for g in self.results() if g.root.severity == 'WARNING']
+
+def format_groups(groups: List[DiagnosticGroup], limit: int = 20) -> str:
+    """Format grouped diagnostics for display, root causes first."""
+    lines = [group.format() for group in groups[:limit]]
+    if len(groups) > limit:
+        lines.append(f"... and {len(groups) - limit} more distinct errors")
+    return "\n".join(lines)
+
+def main():
+    """Parse Godot output from files or stdin and print the grouped report."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Group and de-duplicate Godot compile output")
+    parser.add_argument('files', nargs='*', help='Log files to parse (default: stdin)')
+    parser.add_argument('--limit', type=int, default=20, help='Maximum groups to show')
+    parser.add_argument('--warnings', action='store_true', help='Also show warnings')
+    args = parser.parse_args()
+
+    collector = DiagnosticCollector()
+    if args.files:
+        for path in args.files:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                collector.extend(parse_lines(f))
+    else:
+        collector.extend(parse_lines(sys.stdin))
+
+    errors = collector.errors()
+    print(f"📋 {collector.total} diagnostics -> {len(errors)} distinct root error(s)"
+          f" ({collector.engine} engine message(s) skipped)")
+    if errors:
+        print(format_groups(errors, args.limit))
+    if args.warnings and collector.warnings():
+        print("\n⚠️  Warnings:")
+        print(format_groups(collector.warnings(), args.limit))
+
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
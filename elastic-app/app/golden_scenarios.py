@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Golden battle scenarios: a regression oracle for data exports.
+Plays a fixed set of scenarios (a seed, a wave and either a gear layout or a
+deck) through the Python simulator and compares the results (outcome, beats
+elapsed, hero HP left) with the goldens stored in golden_scenarios.json. A
+sheet edit that changes a card's on_fire_effect or a mob's max_health shows
+up as a moved scenario.
+
+- Layout scenarios run battle_sim.Battle with the layout fixed; deck
+  scenarios play one wave with run_sim's card policy from a shuffled deck
+  ("starter" is the cards whose keywords contain "starter").
+- Every scenario stores a hash of each data record it depends on (its wave,
+  the wave's gremlins and what they summon, its cards, and max_hand_size for
+  decks), so a moved scenario is reported with the records that changed.
+- Results are cached in .golden_scenarios_cache.json by the hash of those
+  records, the scenario and the simulator sources: after an export only the
+  scenarios whose records changed are played, across a process pool.
+
+json_exporter.py runs the check after every successful export.
+
+Usage:
+    python3 golden_scenarios.py                    # Check every scenario
+    python3 golden_scenarios.py --update           # Accept the current results as goldens
+    python3 golden_scenarios.py --update --scenario starter_wave_1e
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from battle_sim import DEFAULT_MAX_TICKS, HERO_HP, MAX_GREMLIN_SLOTS, Battle
+from effect_compiler import MOVE_SUMMON
+from run_sim import RunBattle, RunData, play_wave
+from wave_difficulty import DATA_PATH, _load_records
+
+GOLDEN_FILE = Path("golden_scenarios.json")
+CACHE_FILE = Path(".golden_scenarios_cache.json")
+CACHE_VERSION = 1
+GOLDEN_VERSION = 1
+STARTER_DECK = 'starter'
+RESULT_FIELDS = ('outcome', 'beats', 'hero_hp')
+# A change to these files can move every scenario, so they are part of every cache key
+SIM_SOURCES = ('battle_sim.py', 'effect_compiler.py', 'run_sim.py', 'wave_difficulty.py', 'golden_scenarios.py')
+
+def record_digest(record: Optional[Dict]) -> Optional[str]:
+    if record is None:
+        return None
+    raw = json.dumps(record, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+def sources_digest() -> str:
+    """Hash of the simulator sources a cached result was computed with."""
+    digest = hashlib.sha1()
+    for name in SIM_SOURCES:
+        path = Path(__file__).resolve().parent / name
+        digest.update(path.read_bytes() if path.exists() else b'')
+    return digest.hexdigest()
+
+@dataclass
+class Scenario:
+    name: str
+    wave: str
+    seed: int
+    layout: Optional[List[Optional[str]]] = None
+    deck: Optional[Union[str, List[str]]] = None          # Card ids, or STARTER_DECK
+    hero_hp: int = HERO_HP
+    max_ticks: int = DEFAULT_MAX_TICKS
+    golden: Optional[Dict] = None
+    records: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, entry: Dict) -> 'Scenario':
+        scenario = cls(name=str(entry['name']), wave=str(entry['wave']), seed=int(entry.get('seed', 0)),
+                       layout=entry.get('layout'), deck=entry.get('deck'),
+                       hero_hp=int(entry.get('hero_hp', HERO_HP)),
+                       max_ticks=int(entry.get('max_ticks', DEFAULT_MAX_TICKS)),
+                       golden=entry.get('golden'), records=dict(entry.get('records') or {}))
+        if (scenario.layout is None) == (scenario.deck is None):
+            raise ValueError(f"Scenario '{scenario.name}' needs exactly one of 'layout' and 'deck'")
+        return scenario
+
+    def definition(self) -> Dict:
+        """What the scenario plays, without its stored results."""
+        entry = {'name': self.name, 'wave': self.wave, 'seed': self.seed}
+        if self.layout is not None:
+            entry['layout'] = self.layout
+        else:
+            entry['deck'] = self.deck
+        if self.hero_hp != HERO_HP:
+            entry['hero_hp'] = self.hero_hp
+        if self.max_ticks != DEFAULT_MAX_TICKS:
+            entry['max_ticks'] = self.max_ticks
+        return entry
+
+    def to_dict(self) -> Dict:
+        entry = self.definition()
+        if self.golden is not None:
+            entry['golden'] = self.golden
+            entry['records'] = dict(sorted(self.records.items()))
+        return entry
+
+class GoldenData(RunData):
+    """RunData plus the configuration records a scenario's results depend on."""
+
+    def __init__(self, data_path: Path = DATA_PATH):
+        super().__init__(data_path)
+        self.configuration = {str(c.get('configuration_name')): c
+                              for c in _load_records(data_path / 'configuration_data.json')}
+
+    def deck_cards(self, scenario: Scenario) -> List[str]:
+        return list(self.starter_deck) if scenario.deck == STARTER_DECK else list(scenario.deck)
+
+    def summons(self, mob_id: str) -> List[str]:
+        cycled, background = self.mob_moves.get(mob_id, ((), ()))
+        return [self.compiled.symbols[operand] for op, operand, _, _ in cycled + background if op == MOVE_SUMMON]
+
+    def records(self, scenario: Scenario) -> Dict[str, Optional[str]]:
+        """Hash of every data record the scenario's result depends on; None for missing records."""
+        records = {f'wave:{scenario.wave}': record_digest(self.waves.get(scenario.wave))}
+        pending = self.wave_gremlins(scenario.wave) if scenario.wave in self.waves else []
+        while pending:
+            mob_id = pending.pop()
+            if f'mob:{mob_id}' not in records:
+                records[f'mob:{mob_id}'] = record_digest(self.mobs.get(mob_id))
+                pending.extend(self.summons(mob_id))
+        if scenario.layout is not None:
+            cards = [card_id for card_id in scenario.layout if card_id]
+        else:
+            cards = self.deck_cards(scenario)
+            records['config:max_hand_size'] = record_digest(self.configuration.get('max_hand_size'))
+        for card_id in cards:
+            records[f'card:{card_id}'] = record_digest(self.cards.get(card_id))
+        return records
+
+def run_scenario(data: GoldenData, scenario: Scenario) -> Dict:
+    """Play one scenario; the result holds RESULT_FIELDS and whether the wave was cleared."""
+    rng = random.Random(scenario.seed)
+    if scenario.layout is not None:
+        gremlins = data.wave_gremlins(scenario.wave)[:MAX_GREMLIN_SLOTS]
+        battle = Battle(data, scenario.layout, gremlins, rng, scenario.hero_hp)
+        outcome = battle.run_events(scenario.max_ticks).outcome
+    else:
+        battle = RunBattle(data, rng, scenario.hero_hp, data.deck_cards(scenario))
+        outcome, _ = play_wave(battle, scenario.wave, scenario.max_ticks)
+        outcome = 'loss' if outcome == 'death' else outcome
+    return {'cleared': outcome == 'win', 'outcome': outcome, 'beats': battle.beat, 'hero_hp': battle.hero_hp}
+
+class ResultCache:
+    """Scenario results keyed by the hash of the scenario, its data records and the simulator sources."""
+
+    def __init__(self, cache_path: Optional[Path] = CACHE_FILE):
+        self.cache_path = cache_path
+        self.entries: Dict[str, Dict] = {}
+        self.used: set = set()
+        self.sources = sources_digest()
+        if cache_path and cache_path.exists():
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.entries = data.get("entries", {})
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def key(self, scenario: Scenario, records: Dict[str, Optional[str]]) -> str:
+        raw = json.dumps([self.sources, scenario.definition(), records], sort_keys=True)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        self.used.add(key)
+        return self.entries.get(key)
+
+    def put(self, key: str, result: Dict) -> None:
+        self.used.add(key)
+        self.entries[key] = result
+
+    def save(self) -> None:
+        """Persist entries for the scenarios checked in this run, dropping stale ones."""
+        if not self.cache_path:
+            return
+        entries = {k: v for k, v in self.entries.items() if k in self.used}
+        try:
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f)
+        except OSError as e:
+            print(f"Warning: could not write {self.cache_path}: {e}", file=sys.stderr)
+
+@dataclass
+class Check:
+    scenario: Scenario
+    result: Dict
+    records: Dict[str, Optional[str]]
+    cached: bool
+
+    @property
+    def status(self) -> str:
+        if 'error' in self.result:
+            return 'error'
+        if self.scenario.golden is None:
+            return 'new'
+        if any(self.result.get(k) != self.scenario.golden.get(k) for k in RESULT_FIELDS):
+            return 'moved'
+        return 'ok'
+
+    def changes(self) -> List[str]:
+        """Result fields that differ from the golden, as 'field golden -> now'."""
+        golden = self.scenario.golden or {}
+        return [f"{k} {golden.get(k)} -> {self.result.get(k)}" for k in RESULT_FIELDS
+                if self.result.get(k) != golden.get(k)]
+
+    def changed_records(self) -> List[str]:
+        """Records added, removed or edited since the golden was stored."""
+        stored = self.scenario.records
+        changed = []
+        for key in sorted(set(stored) | set(self.records)):
+            if key not in stored:
+                changed.append(f"{key} (new dependency)")
+            elif key not in self.records:
+                changed.append(f"{key} (no longer used)")
+            elif stored[key] != self.records[key]:
+                changed.append(f"{key} (removed)" if self.records[key] is None else key)
+        return changed
+
+# Each worker process loads the data once
+_worker_data: Optional[GoldenData] = None
+
+def _init_worker(data_path: str) -> None:
+    global _worker_data
+    _worker_data = GoldenData(Path(data_path))
+
+def _run_task(entry: Dict) -> Tuple[str, Dict]:
+    scenario = Scenario.from_dict(entry)
+    try:
+        return scenario.name, run_scenario(_worker_data, scenario)
+    except (KeyError, ValueError) as e:
+        return scenario.name, {'error': str(e)}
+
+def check_scenarios(scenarios: List[Scenario], data: GoldenData, cache: ResultCache,
+                    data_path: Path = DATA_PATH, workers: int = 1) -> List[Check]:
+    """Results for every scenario, playing only those the cache does not hold."""
+    records = {s.name: data.records(s) for s in scenarios}
+    keys = {s.name: cache.key(s, records[s.name]) for s in scenarios}
+    results = {s.name: cache.get(keys[s.name]) for s in scenarios}
+    misses = [s.definition() for s in scenarios if results[s.name] is None]
+
+    if misses:
+        workers = max(1, min(workers, len(misses)))
+        if workers == 1:
+            global _worker_data
+            _worker_data = data
+            played = map(_run_task, misses)
+        else:
+            pool = Pool(workers, initializer=_init_worker, initargs=(str(data_path),))
+            played = pool.imap_unordered(_run_task, misses)
+        for name, result in played:
+            results[name] = result
+            if 'error' not in result:
+                cache.put(keys[name], result)
+        if workers > 1:
+            pool.close()
+            pool.join()
+    played_names = {entry['name'] for entry in misses}
+    return [Check(s, results[s.name], records[s.name], s.name not in played_names) for s in scenarios]
+
+def load_scenarios(path: Path) -> List[Scenario]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    scenarios = [Scenario.from_dict(entry) for entry in data.get('scenarios', [])]
+    names = [s.name for s in scenarios]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate scenario names: {', '.join(duplicates)}")
+    return scenarios
+
+def save_scenarios(path: Path, scenarios: List[Scenario]) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': GOLDEN_VERSION, 'scenarios': [s.to_dict() for s in scenarios]}, f, indent=2)
+        f.write('\n')
+
+def print_checks(checks: List[Check]) -> None:
+    for check in checks:
+        scenario, status = check.scenario, check.status
+        if status == 'ok':
+            continue
+        if status == 'error':
+            print(f"❌ {scenario.name}: {check.result['error']}")
+        elif status == 'new':
+            print(f"📋 {scenario.name}: no golden yet ({check.result['outcome']}, "
+                  f"{check.result['beats']} beats, {check.result['hero_hp']} HP)")
+        else:
+            print(f"⚠️  {scenario.name} moved: {', '.join(check.changes())}")
+            changed = check.changed_records()
+            if changed:
+                print(f"   Changed data: {', '.join(changed)}")
+            else:
+                print("   No data record changed; the simulator did")
+
+def main():
+    """Check the golden scenarios against the current data, or store new goldens."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Golden battle scenarios checked against the exported data")
+    parser.add_argument('--update', action='store_true', help='Store the current results as the goldens')
+    parser.add_argument('--scenario', action='append', metavar='NAME',
+                        help='Only check (or update) this scenario; may be repeated')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: one per CPU)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not update the cache')
+    parser.add_argument('--golden', default=str(GOLDEN_FILE), help=f'Scenario file (default: {GOLDEN_FILE})')
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with the data JSONs')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        scenarios = load_scenarios(Path(args.golden))
+    except (OSError, KeyError, ValueError) as e:
+        print(f"❌ Could not read {args.golden}: {e}")
+        return 1
+    selected = scenarios
+    if args.scenario:
+        unknown = sorted(set(args.scenario) - {s.name for s in scenarios})
+        if unknown:
+            print(f"❌ Unknown scenario(s): {', '.join(unknown)}")
+            return 1
+        selected = [s for s in scenarios if s.name in args.scenario]
+
+    data_path = Path(args.data)
+    cache = ResultCache(None if args.no_cache else CACHE_FILE)
+    checks = check_scenarios(selected, GoldenData(data_path), cache, data_path, args.workers)
+    cache.save()
+    elapsed = time.perf_counter() - start
+
+    counts: Dict[str, int] = {}
+    for check in checks:
+        counts[check.status] = counts.get(check.status, 0) + 1
+    played = sum(1 for check in checks if not check.cached)
+    print(f"🔍 {len(checks)} golden scenario(s) in {elapsed:.2f}s ({played} played, "
+          f"{len(checks) - played} cached)")
+    print_checks(checks)
+
+    if args.update:
+        updated = 0
+        for check in checks:
+            if check.status != 'error' and (check.status != 'ok' or check.records != check.scenario.records):
+                check.scenario.golden = check.result
+                check.scenario.records = check.records
+                updated += 1
+        save_scenarios(Path(args.golden), scenarios)
+        print(f"📄 Updated {updated} golden(s) in {args.golden}")
+        return 1 if counts.get('error') else 0
+
+    if counts.get('moved') or counts.get('error') or counts.get('new'):
+        print(f"\n⚠️  {counts.get('moved', 0)} moved, {counts.get('new', 0)} without a golden, "
+              f"{counts.get('error', 0)} failed; review, then run with --update")
+        return 1
+    print(f"✅ All {len(checks)} scenario(s) match their goldens")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Declarative wave import.
+Reads wave definitions from CSV, JSON or YAML files and upserts them into the
+wave sheet by wave_id: new waves are appended, existing waves have only their
+changed cells updated, and everything is written in one batchUpdate.
+Gremlin ids are validated against mob_data.json, and every column must exist
+in the sheet header, before anything is written.
+
+difficulty is not imported: new waves get the score wave_difficulty.py
+computes, and existing rows keep theirs (wave_maintenance.py fix recomputes
+them), so re-importing a batch never undoes a recalculation. A difficulty
+column in the definitions is accepted and ignored.
+
+Usage:
+    python3 import_waves.py wave_batches/batch*.csv --dry-run
+    python3 import_waves.py wave_batches/batch1_easy.csv --local /tmp/waves
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from wave_difficulty import DATA_PATH, DifficultyScorer, parse_gremlins
+from wave_sheets import DEFAULT_SHEET, WaveSheet, use_local_backend
+
+REQUIRED_FIELDS = ('wave_id', 'gremlins')
+COMPUTED_FIELDS = ('difficulty',)   # Written by DifficultyScorer, never from definitions
+
+class WaveImportError(Exception):
+    """Raised when wave definitions are invalid; nothing is written."""
+
+def load_definitions(path: Path) -> List[Dict[str, Any]]:
+    """Wave definitions from a CSV (header row), JSON or YAML (list of mappings) file."""
+    suffix = path.suffix.lower()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if suffix == '.csv':
+            return [dict(row) for row in csv.DictReader(f)]
+        if suffix == '.json':
+            data = json.load(f)
+        elif suffix in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise WaveImportError(f"{path}: PyYAML is required for YAML files (pip install pyyaml)")
+            data = yaml.safe_load(f)
+        else:
+            raise WaveImportError(f"{path}: unsupported file type '{suffix}' (use .csv, .json or .yaml)")
+
+    if isinstance(data, dict):
+        data = data.get('waves', data)
+    if not isinstance(data, list) or not all(isinstance(w, dict) for w in data):
+        raise WaveImportError(f"{path}: expected a list of wave mappings")
+    return data
+
+def _cell(value: Any) -> Any:
+    """Sheet representation of a definition value; gremlin lists become "a|b"."""
+    if isinstance(value, list):
+        return '|'.join(str(v) for v in value)
+    return '' if value is None else value
+
+def validate(definitions: List[Tuple[str, Dict]], known_mobs: set) -> List[str]:
+    """Problems that block the import, as messages."""
+    problems = []
+    seen: Dict[str, str] = {}
+    for source, wave in definitions:
+        wave_id = str(wave.get('wave_id') or '').strip()
+        for field in REQUIRED_FIELDS:
+            if not str(_cell(wave.get(field))).strip():
+                problems.append(f"{source}: {wave_id or '<no wave_id>'} is missing '{field}'")
+        if not wave_id:
+            continue
+        if wave_id in seen:
+            problems.append(f"{source}: {wave_id} is also defined in {seen[wave_id]}")
+        seen[wave_id] = source
+        unknown = [g for g in parse_gremlins(wave.get('gremlins')) if g not in known_mobs]
+        if unknown:
+            problems.append(f"{source}: {wave_id} has unknown gremlins: {', '.join(unknown)}")
+    return problems
+
+def upsert_waves(sheet: WaveSheet, waves: List[Dict[str, Any]],
+                 scorer: Optional[DifficultyScorer] = None) -> Dict[str, List]:
+    """
+    Queue inserts/updates for the given waves, matched to sheet rows by wave_id.
+    New rows get their difficulty from scorer; existing rows keep theirs.
+    Returns {'added': [...], 'changed': [(wave_id, {field: (old, new)})], 'unchanged': [...]}.
+    """
+    headers = sheet.headers
+    wave_id_col = sheet.column('wave_id', 0)
+    report: Dict[str, List] = {'added': [], 'changed': [], 'unchanged': []}
+
+    rows_by_id = {}
+    for row_num, row in enumerate(sheet.rows, start=2):
+        if len(row) > wave_id_col and row[wave_id_col]:
+            rows_by_id.setdefault(row[wave_id_col], row_num)
+
+    new_rows = []
+    for wave in waves:
+        wave = {name: value for name, value in wave.items() if name not in COMPUTED_FIELDS}
+        wave_id = str(wave['wave_id']).strip()
+
+        row_num = rows_by_id.get(wave_id)
+        if row_num is None:
+            if scorer:
+                wave['difficulty'] = scorer.wave_score(parse_gremlins(wave.get('gremlins')), wave_id)
+            new_rows.append([_cell(wave.get(name, '')) for name in headers])
+            report['added'].append(wave_id)
+            continue
+
+        row = sheet.values[row_num - 1]
+        changes = {}
+        for name, value in wave.items():
+            column = sheet.column(name)
+            if column is None:
+                continue
+            old = row[column] if column < len(row) else ''
+            new = _cell(value)
+            if str(old) != str(new):
+                changes[name] = (old, new)
+                sheet.set_value(row_num, column, new)
+        if changes:
+            report['changed'].append((wave_id, changes))
+        else:
+            report['unchanged'].append(wave_id)
+
+    sheet.append_rows(new_rows)
+    return report
+
+def import_waves(paths: List[Path], sheet: WaveSheet = None, data_path: Path = DATA_PATH) -> Dict[str, List]:
+    """Load, validate and queue the waves in paths; raises WaveImportError before any edit."""
+    definitions = []
+    for path in paths:
+        definitions.extend((str(path), wave) for wave in load_definitions(Path(path)))
+
+    scorer = DifficultyScorer.from_data(data_path)
+    problems = validate(definitions, set(scorer.mobs))
+    if problems:
+        raise WaveImportError('\n'.join(f"  - {problem}" for problem in problems))
+
+    owns_sheet = sheet is None
+    if owns_sheet:
+        sheet = WaveSheet()
+    if not sheet.headers:
+        raise WaveImportError(f"{sheet.sheet_name} has no header row")
+    unknown = sorted({name for _, wave in definitions for name in wave
+                      if name not in sheet.headers and name not in COMPUTED_FIELDS})
+    if unknown:
+        raise WaveImportError(f"  - Unknown columns (not in the {sheet.sheet_name} header): {', '.join(unknown)}")
+    report = upsert_waves(sheet, [wave for _, wave in definitions], scorer)
+    if owns_sheet:
+        sheet.flush()
+    return report
+
+def print_report(report: Dict[str, List]) -> None:
+    """Print one line per added/changed wave and a summary."""
+    for wave_id in report['added']:
+        print(f"  + {wave_id}")
+    for wave_id, changes in report['changed']:
+        fields = ', '.join(f"{name}: {old!r} -> {new!r}" for name, (old, new) in changes.items())
+        print(f"  ~ {wave_id}: {fields}")
+    print(f"📋 {len(report['added'])} to add, {len(report['changed'])} to update, "
+          f"{len(report['unchanged'])} unchanged")
+
+def main():
+    """Validate wave definition files and upsert them into the wave sheet."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Upsert wave definitions into the wave sheet")
+    parser.add_argument('files', nargs='+', help='CSV, JSON or YAML wave definition files')
+    parser.add_argument('--sheet', default=DEFAULT_SHEET, help='Sheet (tab) name')
+    parser.add_argument('--local', metavar='DIR', help='Use CSV files in DIR instead of Google Sheets')
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with mob_data.json')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    args = parser.parse_args()
+
+    if args.local:
+        use_local_backend(args.local)
+    sheet = WaveSheet(args.sheet)
+    try:
+        report = import_waves([Path(path) for path in args.files], sheet, Path(args.data))
+    except (OSError, ValueError, WaveImportError) as e:
+        print(f"❌ Invalid wave definitions (nothing written):\n{e}")
+        return 1
+
+    print_report(report)
+    if args.dry_run:
+        print("🔍 Dry run: nothing written")
+        return 0
+    pending = sheet.pending
+    if not pending:
+        print("✅ Sheet already matches the definitions")
+        return 0
+    sheet.flush()
+    print(f"✅ Wrote {pending} row(s) in {sheet.api_calls} API call(s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Card-combo and synergy search over card_data.json.
+Enumerates the mainplate layouts a deck can build inside a width x height
+corner of the grid, plays each one with battle_sim.Battle against a training
+dummy (a gremlin with no moves and HP that never runs out) for a fixed number
+of ticks, and reports the layouts with the most damage, or the most forces
+generated, per tick: the best layout of each of the top --top card sets of
+every archetype (the tag most of the set's cards share).
+
+Most layouts behave like another one, so only one of each is simulated:
+
+- Only the Escapement Order of the gears matters unless a card reaches its
+  neighbours (activate_<direction> or a positional complex_ effect). Those
+  layouts are enumerated as gear sequences; the rest as placements, up to
+  translation (shifting a layout keeps both its order and its adjacency).
+- A layout whose cards never pay a cost (no consume_/pay_ keys) or read
+  forces (a complex_ effect in FORCE_COMPLEX) scores the same in every
+  order, so it is simulated once.
+- Gears without a production interval or effect never fire and are dropped
+  from the deck up front.
+- Each card set gets an optimistic bound (its damage or generate values per
+  interval, ignoring costs and force caps; unbounded when a card triggers
+  other gears or poisons). Card sets are searched best bound first, and a set
+  whose bound cannot beat the archetype's current top --top is skipped
+  unsimulated.
+
+Card sets are searched in fixed-size waves over a process pool; thresholds
+only change between waves, so the report is the same for any --workers.
+
+Usage:
+    python3 layout_search.py                               # Starter deck, 3x3, up to 4 gears
+    python3 layout_search.py --tag ORDER --max-gears 3 --score forces
+    python3 layout_search.py --deck red_gen_basic_1,red_gen_basic_1,red_dmg_basic_1 --width 4 --height 2
+"""
+
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from battle_sim import BEATS_PER_TICK, GRID_HEIGHT, GRID_WIDTH, Battle, BattleData
+from effect_compiler import (COLOR_INDEXES, COMPLEX_EFFECTS, CONSUME_OPS, DIRECTION_OFFSETS, FORCE_NAMES,
+                             OP_ACTIVATE, OP_COMPLEX, OP_CONSUME, OP_CONSUME_LARGEST, OP_CONSUME_SMALLEST,
+                             OP_DAMAGE, OP_GENERATE, OP_PIERCE_DAMAGE, OP_POISON, OP_POP_DAMAGE)
+from wave_difficulty import DATA_PATH, _number
+
+DUMMY_ID = 'training_dummy'
+DUMMY_HP = 10 ** 9
+SCORES = ('damage', 'forces')
+DEFAULT_TICKS = 100
+DEFAULT_MAX_GEARS = 4
+WAVE_SIZE = 64                 # Card sets per pruning wave
+DAMAGE_OPS = (OP_DAMAGE, OP_PIERCE_DAMAGE, OP_POP_DAMAGE)
+DIAGONAL_OFFSETS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+# battle_sim's positional complex_ effects, by the cells they look at
+ORTHOGONAL_COMPLEX = frozenset(('chain_reaction', 'adjacent_trigger', 'chaos_isolation'))
+ROW_COMPLEX = frozenset(('forge_support', 'row_production'))
+# battle_sim's complex_ effects that read or zero forces, so the order they fire in matters
+FORCE_COMPLEX = frozenset(('force_cascade', 'void_hunger', 'overheat', 'momentum_avalanche', 'red_blue_combo',
+                           'white_purple_combo', 'rainbow_burst', 'precision_strike', 'entropy_cascade'))
+
+# (card_id, x, y) per gear, in Escapement Order
+Layout = Tuple[Tuple[str, int, int], ...]
+
+class SearchData(BattleData):
+    """BattleData plus the training dummy and, per card, what the search needs to know."""
+
+    def __init__(self, data_path: Path = DATA_PATH):
+        super().__init__(data_path)
+        self.mobs[DUMMY_ID] = {'template_id': DUMMY_ID, 'max_health': DUMMY_HP}
+        self.mob_moves[DUMMY_ID] = ((), ())
+        self.interval: Dict[str, int] = {}
+        self.triples: Dict[str, List[Tuple[int, int, float]]] = {}
+        self.pays: Dict[str, bool] = {}
+        # Cells (offsets from the gear) a card's effects look at; row/grid: the whole row/layout
+        self.reach: Dict[str, Tuple[Tuple[int, int], ...]] = {}
+        self.row_reach: Dict[str, bool] = {}
+        self.grid_reach: Dict[str, bool] = {}
+        for card_id, card in self.cards.items():
+            code = self.card_effects[card_id]
+            triples = list(zip(code[0::3], code[1::3], code[2::3]))
+            self.interval[card_id] = int(_number(card.get('production_interval', 0)))
+            self.triples[card_id] = triples
+            complex_names = {COMPLEX_EFFECTS[operand] for op, operand, _ in triples if op == OP_COMPLEX}
+            self.pays[card_id] = (any(op in CONSUME_OPS for op, _, _ in triples)
+                                  or bool(complex_names & FORCE_COMPLEX))
+            reach = {DIRECTION_OFFSETS[operand] for op, operand, _ in triples if op == OP_ACTIVATE}
+            if complex_names & ORTHOGONAL_COMPLEX:
+                reach.update(DIRECTION_OFFSETS)
+            if 'diagonal_damage' in complex_names:
+                reach.update(DIAGONAL_OFFSETS)
+            self.reach[card_id] = tuple(sorted(reach))
+            self.row_reach[card_id] = bool(complex_names & ROW_COMPLEX)
+            self.grid_reach[card_id] = 'order_line' in complex_names
+
+    def fires(self, card_id: str) -> bool:
+        return self.interval.get(card_id, 0) > 0 and bool(self.card_effects.get(card_id))
+
+    def positional(self, card_id: str) -> bool:
+        return bool(self.reach[card_id]) or self.row_reach[card_id] or self.grid_reach[card_id]
+
+    def archetype(self, cards: Tuple[str, ...]) -> str:
+        """The tag most of the cards share; ties go to the first alphabetically."""
+        tags = Counter(tag for card_id in cards for tag in self.card_tags[card_id])
+        if not tags:
+            return 'untagged'
+        return min(tags, key=lambda tag: (-tags[tag], tag))
+
+    def bound(self, cards: Tuple[str, ...], score: str) -> float:
+        """
+        Damage or forces per tick no layout of the cards can beat. Each gear fires
+        at most once per interval plus every time an activate_ cascade reaches it,
+        and a gear that pays a force fires at most as often as the set's income
+        of that force covers; force caps are ignored. Complex effects (and poison,
+        when scoring damage) are unbounded.
+        """
+        triples = [self.triples[c] for c in cards]
+        if any(op == OP_COMPLEX or (op == OP_POISON and score == 'damage') for code in triples for op, _, _ in code):
+            return math.inf
+        natural = [1 / self.interval[c] for c in cards]
+        spread = [sum(value for op, _, value in code if op == OP_ACTIVATE) for code in triples]
+        activators = sum(1 for value in spread if value > 0)
+        # A cascade is a tree at most one level deep per activator (a firing gear cannot be re-triggered)
+        cascade = sum(max(spread) ** depth for depth in range(activators + 1))
+        triggered = sum(natural) * (cascade - 1)
+        fires = [rate + triggered for rate in natural]
+        for _ in range(len(cards)):
+            income = [0.0] * len(FORCE_NAMES)
+            for code, rate in zip(triples, fires):
+                for op, operand, value in code:
+                    if op == OP_GENERATE:
+                        income[operand] += rate * value
+            colors = sum(income[c] for c in COLOR_INDEXES)
+            for i, code in enumerate(triples):
+                for op, operand, value in code:
+                    if int(value) <= 0:
+                        continue
+                    if op == OP_CONSUME:
+                        fires[i] = min(fires[i], income[operand] / int(value))
+                    elif op in (OP_CONSUME_LARGEST, OP_CONSUME_SMALLEST):
+                        fires[i] = min(fires[i], colors / int(value))
+        ops = DAMAGE_OPS if score == 'damage' else (OP_GENERATE,)
+        return sum(rate * value for code, rate in zip(triples, fires) for op, _, value in code if op in ops)
+
+def card_sets(deck: List[str], max_gears: int, min_gears: int = 1) -> List[Tuple[str, ...]]:
+    """Every multiset of min_gears..max_gears cards the deck can supply, as sorted tuples."""
+    counts = Counter(deck)
+    cards = sorted(counts)
+    sets = []
+    for size in range(min_gears, max_gears + 1):
+        for combo in itertools.combinations_with_replacement(cards, size):
+            if all(combo.count(c) <= counts[c] for c in set(combo)):
+                sets.append(combo)
+    return sets
+
+def shapes(width: int, height: int, size: int) -> List[Tuple[Tuple[int, int], ...]]:
+    """The ways to pick `size` cells of a width x height grid, up to translation, cells in Escapement Order."""
+    cells = [(x, y) for y in range(height) for x in range(width)]
+    found = set()
+    for chosen in itertools.combinations(cells, size):
+        min_x = min(x for x, _ in chosen)
+        min_y = min(y for _, y in chosen)
+        found.add(tuple(sorted(((x - min_x, y - min_y) for x, y in chosen), key=lambda c: (c[1], c[0]))))
+    return sorted(found)
+
+def signature(data: SearchData, layout: Layout) -> tuple:
+    """
+    What a layout's behaviour depends on: the cards in Escapement Order and,
+    for gears that reach other gears, which gear (by index) is in each cell
+    they look at.
+    """
+    cards = tuple(card_id for card_id, _, _ in layout)
+    if any(data.grid_reach[c] for c in cards):
+        return layout
+    index = {(x, y): i for i, (_, x, y) in enumerate(layout)}
+    links = []
+    for card_id, x, y in layout:
+        links.append((tuple(index.get((x + dx, y + dy)) for dx, dy in data.reach[card_id]),
+                      tuple(i for i, (_, _, other_y) in enumerate(layout) if other_y == y)
+                      if data.row_reach[card_id] else ()))
+    return cards, tuple(links)
+
+def layouts(data: SearchData, cards: Tuple[str, ...], width: int, height: int) -> List[Layout]:
+    """One layout per distinct behaviour of a card set (see the module docstring)."""
+    positional = any(data.positional(c) for c in cards)
+    if not positional and not any(data.pays[c] for c in cards):
+        orders = [cards]
+    else:
+        orders = sorted(set(itertools.permutations(cards)))
+    if not positional:
+        cells = tuple((i % width, i // width) for i in range(len(cards)))
+        return [tuple((card_id, x, y) for card_id, (x, y) in zip(order, cells)) for order in orders]
+    found: Dict[tuple, Layout] = {}
+    for cells in shapes(width, height, len(cards)):
+        for order in orders:
+            layout = tuple((card_id, x, y) for card_id, (x, y) in zip(order, cells))
+            found.setdefault(signature(data, layout), layout)
+    return list(found.values())
+
+def placements(cards: Tuple[str, ...], width: int, height: int) -> int:
+    """Layouts the card set has in the grid before any are collapsed."""
+    orders = math.factorial(len(cards))
+    for count in Counter(cards).values():
+        orders //= math.factorial(count)
+    return math.comb(width * height, len(cards)) * orders
+
+def grid_layout(layout: Layout) -> List[Optional[str]]:
+    """The battle_sim layout list (Escapement Order over the whole mainplate) for a search layout."""
+    cells: List[Optional[str]] = [None] * (GRID_WIDTH * GRID_HEIGHT)
+    for card_id, x, y in layout:
+        cells[y * GRID_WIDTH + x] = card_id
+    return cells
+
+def score_layout(data: SearchData, layout: Layout, ticks: int, score: str, seed: int = 0) -> float:
+    """Damage dealt to, or forces generated against, the training dummy per tick."""
+    battle = Battle(data, grid_layout(layout), [DUMMY_ID], random.Random(f"{seed}:{layout}"))
+    result = battle.run_events(ticks)
+    total = result.damage_dealt if score == 'damage' else result.forces_generated
+    return total / (result.beats / BEATS_PER_TICK or 1)
+
+@dataclass
+class SearchReport:
+    score: str
+    card_sets: int = 0
+    skipped: int = 0               # Card sets pruned by their bound
+    placements: int = 0            # Layouts of the searched card sets before collapsing
+    simulated: int = 0
+    inert: List[str] = field(default_factory=list)
+    best: Dict[str, List[Tuple[float, Layout]]] = field(default_factory=dict)
+
+    def add(self, archetype: str, best: Tuple[float, Layout], top: int) -> None:
+        ranked = self.best.setdefault(archetype, [])
+        ranked.append(best)
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        del ranked[top:]
+
+    def threshold(self, archetype: str, top: int) -> float:
+        """The score a card set must beat to enter the archetype's table."""
+        ranked = self.best.get(archetype, [])
+        return ranked[-1][0] if len(ranked) >= top else -math.inf
+
+# Each worker process loads the data once
+_worker_data: Optional[SearchData] = None
+
+def _init_worker(data_path: str) -> None:
+    global _worker_data
+    _worker_data = SearchData(Path(data_path))
+
+def _search_set(task: Tuple[Tuple[str, ...], int, int, int, str, int]) -> Tuple[int, Tuple[float, Layout]]:
+    """Layouts simulated and the best (score, layout) of one card set."""
+    cards, width, height, ticks, score, seed = task
+    found = [(score_layout(_worker_data, layout, ticks, score, seed), layout)
+             for layout in layouts(_worker_data, cards, width, height)]
+    return len(found), min(found, key=lambda item: (-item[0], item[1]))
+
+def search(deck: List[str], data_path: Path = DATA_PATH, width: int = 3, height: int = 3,
+           max_gears: int = DEFAULT_MAX_GEARS, ticks: int = DEFAULT_TICKS, score: str = 'damage',
+           top: int = 5, workers: int = 1, seed: int = 0) -> SearchReport:
+    """The best layout of the top card sets per archetype; the report does not depend on `workers`."""
+    if not 1 <= width <= GRID_WIDTH or not 1 <= height <= GRID_HEIGHT:
+        raise ValueError(f"The mainplate is {GRID_WIDTH}x{GRID_HEIGHT}; got {width}x{height}")
+    _init_worker(str(data_path))
+    data = _worker_data
+    unknown = sorted(set(c for c in deck if c not in data.cards))
+    if unknown:
+        raise KeyError(f"Unknown card(s): {', '.join(unknown)}")
+
+    report = SearchReport(score)
+    report.inert = sorted(set(c for c in deck if not data.fires(c)))
+    deck = [c for c in deck if data.fires(c)]
+    bound = {cards: data.bound(cards, score) for cards in card_sets(deck, min(max_gears, width * height))}
+    # Best bound first, so the tables fill with strong layouts before weak sets are considered
+    queue = sorted(bound, key=lambda cards: (-bound[cards], cards))
+    report.card_sets = len(queue)
+
+    pool = Pool(workers, initializer=_init_worker, initargs=(str(data_path),)) if workers > 1 else None
+    try:
+        for start in range(0, len(queue), WAVE_SIZE):
+            wave = []
+            for cards in queue[start:start + WAVE_SIZE]:
+                if bound[cards] <= report.threshold(data.archetype(cards), top):
+                    report.skipped += 1
+                else:
+                    wave.append(cards)
+            tasks = [(cards, width, height, ticks, score, seed) for cards in wave]
+            results = pool.map(_search_set, tasks) if pool else [_search_set(task) for task in tasks]
+            for cards, (simulated, best) in zip(wave, results):
+                report.placements += placements(cards, width, height)
+                report.simulated += simulated
+                report.add(data.archetype(cards), best, top)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    return report
+
+def format_layout(layout: Layout) -> str:
+    return "  ".join(f"({x},{y}) {card_id}" for card_id, x, y in layout)
+
+def print_report(report: SearchReport, elapsed: float, ticks: int) -> None:
+    print("\n" + "=" * 60)
+    print(f"📊 {report.simulated} layouts simulated in {elapsed:.2f}s "
+          f"({report.simulated / max(elapsed, 1e-9):,.1f}/s), {ticks} ticks each")
+    print("=" * 60)
+    print(f"  Card sets: {report.card_sets}, skipped by bound: {report.skipped}")
+    print(f"  Layouts covered: {report.placements}, collapsed by symmetry: {report.placements - report.simulated}")
+    if report.inert:
+        print(f"  ⚠️  Never fire (no interval or effect), left out: {', '.join(report.inert)}")
+
+    unit = 'damage' if report.score == 'damage' else 'forces'
+    for archetype in sorted(report.best, key=lambda a: (-report.best[a][0][0], a)):
+        print(f"\n📋 {archetype}")
+        for value, layout in report.best[archetype]:
+            print(f"  {value:7.2f} {unit}/tick  {format_layout(layout)}")
+
+def main():
+    """Search layouts of a deck and report the strongest per archetype."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Card-combo and synergy search over card_data.json")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--deck', help='Comma-separated card ids; repeat an id for extra copies '
+                                       '(default: the starter deck)')
+    source.add_argument('--tag', help='Every card with this tag, one copy each')
+    parser.add_argument('--width', type=int, default=3, help='Columns of the mainplate to use (default: 3)')
+    parser.add_argument('--height', type=int, default=3, help='Rows of the mainplate to use (default: 3)')
+    parser.add_argument('--max-gears', type=int, default=DEFAULT_MAX_GEARS,
+                        help=f'Most gears in a layout (default: {DEFAULT_MAX_GEARS})')
+    parser.add_argument('--ticks', type=int, default=DEFAULT_TICKS,
+                        help=f'Ticks each layout is played for (default: {DEFAULT_TICKS})')
+    parser.add_argument('--score', choices=SCORES, default='damage',
+                        help='Rank by damage or by forces generated per tick (default: damage)')
+    parser.add_argument('--top', type=int, default=5, help='Card sets per archetype (default: 5)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for random effects (default: 0)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: one per CPU)')
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with the exported JSON files')
+    args = parser.parse_args()
+
+    data = SearchData(Path(args.data))
+    if args.deck:
+        deck = [c.strip() for c in args.deck.split(',') if c.strip()]
+    elif args.tag:
+        deck = sorted(c for c, tags in data.card_tags.items() if args.tag in tags)
+    else:
+        deck = [c for c, card in data.cards.items() if 'starter' in str(card.get('keywords', ''))]
+    if not deck:
+        print("❌ The deck is empty")
+        return 1
+    workers = max(1, args.workers)
+    print(f"🔍 {len(deck)}-card deck, {args.width}x{args.height} grid, up to {args.max_gears} gears, "
+          f"{args.score} per tick over {args.ticks} ticks, {workers} worker(s)")
+
+    start = time.perf_counter()
+    try:
+        report = search(deck, Path(args.data), args.width, args.height, args.max_gears, args.ticks,
+                        args.score, max(1, args.top), workers, args.seed)
+    except (KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    print_report(report, time.perf_counter() - start, args.ticks)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo run simulator for endless-mode progression.
+Plays whole runs headlessly on top of battle_sim.Battle, following the
+engine's run loop:
+
+- GlobalGameManager: the deck is the cards whose keywords contain "starter",
+  shuffled, with a starting hand of 5. Playing a card places it on the first
+  empty mainplate slot (or overbuilds the weakest gear once the plate is full),
+  runs its on_play_effect, then advances time by its time_cost. An empty hand
+  ends the turn: draw 5, reshuffling the discard pile when the deck runs out.
+- EndlessWaveManager.start_next_wave: wave N targets difficulty 5 + 10 * (N - 1)
+  and picks uniformly among the waves within +/- 30%, then within the doubled
+  range, then the closest wave. Hero HP, the mainplate, forces and the hand
+  carry over between waves.
+- _get_reward_card_pool: 3 offers, each rolling RARE/UNCOMMON/COMMON with the
+  wave's rarity weights and matching card_rarity by substring, so an UNCOMMON
+  roll (no card has that rarity) is refilled from all cards afterwards. The
+  picked card goes into the deck.
+
+Which card to play and which reward to take are policies (see PICK_POLICIES);
+they stand in for a player, so the curves show the pacing for that player.
+
+Runs are sharded across a process pool. Each run draws from its own RNG seeded
+with "<seed>:<run index>" and the report only sums integers, so the same seed
+gives the same report for any --workers.
+
+Usage:
+    python3 run_sim.py --runs 1000 --seed 7
+    python3 run_sim.py --runs 20000 --seed 7 --workers 8 --max-waves 25
+    python3 run_sim.py --runs 200 --seed 7 --check     # Event vs per-beat
+"""
+
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from battle_sim import (BEATS_PER_TICK, DEFAULT_MAX_TICKS, GRID_HEIGHT, GRID_WIDTH, HERO_HP, MAX_GREMLIN_SLOTS,
+                        Battle, BattleData)
+from effect_compiler import (CONSUME_OPS, OP_CONSUME, OP_DAMAGE, OP_GENERATE, OP_PIERCE_DAMAGE, OP_POISON,
+                             OP_POP_DAMAGE, compile_effect)
+from generate_waves import BASE_DIFFICULTY, DIFFICULTY_PER_WAVE, RANGE_HIGH, RANGE_LOW
+from wave_difficulty import DATA_PATH, _load_records, _number
+
+STARTING_HAND_SIZE = 5         # GlobalGameManager.starting_hand_size
+HAND_SIZE = 5                  # GlobalGameManager.hand_size, drawn by end_turn()
+DEFAULT_MAX_HAND_SIZE = 7      # Library.max_hand_size unless configuration_data sets it
+REWARD_CHOICES = 3
+RARITY_WEIGHTS = (10, 30)      # (rare, uncommon) out of 100; the rest is common
+LATE_RARITY_WEIGHTS = (20, 40)
+LATE_REWARD_WAVE = 5
+MAX_PLAYS_PER_WAVE = 500       # Guards against runs that loop zero-cost cards
+DEFAULT_MAX_WAVES = 20
+PICK_POLICIES = ('greedy', 'random', 'first')
+DAMAGE_OPS = (OP_DAMAGE, OP_PIERCE_DAMAGE, OP_POP_DAMAGE, OP_POISON)
+
+class RunData(BattleData):
+    """BattleData plus the wave ladder, starter deck, reward pools and card scores of a run."""
+
+    def __init__(self, data_path: Path = DATA_PATH):
+        super().__init__(data_path)
+        config = {str(c.get('configuration_name')): c.get('configuration_value')
+                  for c in _load_records(data_path / 'configuration_data.json')}
+        self.max_hand_size = int(_number(config.get('max_hand_size', DEFAULT_MAX_HAND_SIZE)))
+
+        # Stable sort, so equal difficulties keep wave_data order
+        self.waves_by_difficulty: List[Tuple[int, str]] = sorted(
+            ((int(_number(w.get('difficulty', 0))), wave_id) for wave_id, w in self.waves.items()),
+            key=lambda item: item[0])
+        self.card_ids = list(self.cards)
+        self.starter_deck = [c for c, card in self.cards.items() if 'starter' in str(card.get('keywords', ''))]
+        self.rarity_pools = {target: [c for c, card in self.cards.items()
+                                      if target in str(card.get('card_rarity', 'COMMON')).upper()]
+                             for target in ('RARE', 'UNCOMMON', 'COMMON')}
+
+        self.time_cost: Dict[str, float] = {}
+        self.on_play: Dict[str, Tuple[float, ...]] = {}
+        self.damage_rate: Dict[str, float] = {}
+        self.makes: Dict[str, frozenset] = {}
+        self.needs: Dict[str, frozenset] = {}
+        for card_id, card in self.cards.items():
+            self.time_cost[card_id] = _number(card.get('time_cost', 0))
+            self.on_play[card_id] = compile_effect(card.get('on_play_effect'), [])
+            code = self.card_effects[card_id]
+            triples = list(zip(code[0::3], code[1::3], code[2::3]))
+            interval = _number(card.get('production_interval', 0))
+            damage = sum(value for op, _, value in triples if op in DAMAGE_OPS)
+            self.damage_rate[card_id] = damage / interval if interval > 0 else 0.0
+            self.makes[card_id] = frozenset(operand for op, operand, _ in triples if op == OP_GENERATE)
+            # consume_largest/smallest need some colour, marked as -1
+            self.needs[card_id] = frozenset(operand if op == OP_CONSUME else -1
+                                            for op, operand, _ in triples if op in CONSUME_OPS)
+
+@dataclass
+class RunResult:
+    waves_cleared: int
+    end: str                          # 'death', 'timeout', 'exhausted' or 'max_waves'
+    final_wave_id: str = ''
+    hero_hp: int = 0
+    beats: int = 0
+    cards_played: int = 0
+    offers: List[str] = field(default_factory=list)
+    picks: List[str] = field(default_factory=list)
+
+class RunBattle(Battle):
+    """A Battle whose mainplate is filled by playing cards from a shuffled deck."""
+
+    def __init__(self, data: RunData, rng: random.Random, hero_hp: int = HERO_HP,
+                 deck: Optional[List[str]] = None):
+        super().__init__(data, [], [], rng, hero_hp)
+        self.deck = list(data.starter_deck if deck is None else deck)
+        self.hand: List[str] = []
+        self.graveyard: List[str] = []
+        rng.shuffle(self.deck)
+        self.draw(STARTING_HAND_SIZE)
+
+    def draw(self, count: int) -> None:
+        """Library.draw_card: deck first, then the reshuffled graveyard."""
+        for _ in range(count):
+            if not self.deck:
+                if not self.graveyard:
+                    return
+                self.deck, self.graveyard = self.graveyard, []
+                self.rng.shuffle(self.deck)
+            if len(self.hand) >= self.data.max_hand_size:
+                return
+            self.hand.append(self.deck.pop())
+            self.result.cards_drawn += 1
+
+    def end_turn(self) -> None:
+        self.graveyard.extend(self.hand)
+        self.hand = []
+        self.draw(min(HAND_SIZE, len(self.deck) + len(self.graveyard)))
+
+    def start_wave(self, gremlin_ids: List[str]) -> None:
+        self.gremlins = []
+        for template_id in [g for g in gremlin_ids if g in self.data.mobs][:MAX_GREMLIN_SLOTS]:
+            self.spawn(template_id)
+
+    def play(self, card_id: str, slot: Tuple[int, int]) -> None:
+        """Place a card from the hand; on_play effects resolve before time advances."""
+        self.hand.remove(card_id)
+        replaced = self.place(card_id, *slot)
+        if replaced is not None:
+            self.graveyard.append(replaced.card_id)
+        self.apply_effects(self.data.on_play[card_id], self.grid[slot])
+        self.sweep()
+
+    def sweep(self) -> None:
+        """Self-destructed gears leave the mainplate for the graveyard."""
+        for slot, gear in list(self.grid.items()):
+            if gear.removed:
+                del self.grid[slot]
+                if gear in self.gears:
+                    self.gears.remove(gear)
+                self.graveyard.append(gear.card_id)
+
+    # --- Player policy ---------------------------------------------------
+
+    def choose_card(self) -> str:
+        """
+        Prefer damage gears whose costs the plate already produces, then
+        generators of forces the plate lacks, then whatever deals most damage.
+        """
+        data = self.data
+        produced = set().union(*(data.makes[g.card_id] for g in self.grid.values()))
+        if produced:
+            produced.add(-1)
+
+        def priority(card_id: str):
+            return (data.needs[card_id] <= produced, data.damage_rate[card_id],
+                    bool(data.makes[card_id] - produced))
+        return max(self.hand, key=priority)
+
+    def choose_slot(self) -> Tuple[int, int]:
+        """The first empty slot in Escapement Order, else the gear dealing the least damage."""
+        for y in range(GRID_HEIGHT):
+            for x in range(GRID_WIDTH):
+                if (x, y) not in self.grid:
+                    return (x, y)
+        return min(self.grid, key=lambda slot: (self.data.damage_rate[self.grid[slot].card_id], slot[1], slot[0]))
+
+def select_wave(data: RunData, wave_number: int, rng: random.Random) -> Optional[str]:
+    """EndlessWaveManager.start_next_wave() wave choice."""
+    target = BASE_DIFFICULTY + (wave_number - 1) * DIFFICULTY_PER_WAVE
+    low, high = int(target * RANGE_LOW), int(target * RANGE_HIGH)
+    for min_diff, max_diff in ((low, high), (low // 2, high * 2)):
+        candidates = [wave_id for difficulty, wave_id in data.waves_by_difficulty if min_diff <= difficulty <= max_diff]
+        if candidates:
+            return candidates[rng.randrange(len(candidates))]
+    if not data.waves_by_difficulty:
+        return None
+    return min(data.waves_by_difficulty, key=lambda item: abs(item[0] - target))[1]
+
+def reward_offers(data: RunData, wave_number: int, rng: random.Random) -> List[str]:
+    """EndlessWaveManager._get_reward_card_pool(), including its refill of unmatched rolls."""
+    rare, uncommon = LATE_RARITY_WEIGHTS if wave_number >= LATE_REWARD_WAVE else RARITY_WEIGHTS
+    offers = []
+    for _ in range(REWARD_CHOICES):
+        roll = rng.randrange(100)
+        target = 'RARE' if roll < rare else 'UNCOMMON' if roll < rare + uncommon else 'COMMON'
+        matching = data.rarity_pools[target]
+        if matching:
+            offers.append(matching[rng.randrange(len(matching))])
+    while len(offers) < REWARD_CHOICES and data.card_ids:
+        offers.append(data.card_ids[rng.randrange(len(data.card_ids))])
+    return offers
+
+def pick_reward(data: RunData, offers: List[str], policy: str, rng: random.Random) -> str:
+    if policy == 'random':
+        return offers[rng.randrange(len(offers))]
+    if policy == 'first':
+        return offers[0]
+    return max(offers, key=lambda card_id: data.damage_rate[card_id])
+
+def play_wave(battle: RunBattle, wave_id: str, max_ticks: int = DEFAULT_MAX_TICKS,
+              per_beat: bool = False) -> Tuple[str, int]:
+    """
+    Play cards against one wave until it is decided or stalls; returns the
+    outcome ('win', 'death', 'timeout' or 'exhausted') and the cards played.
+    """
+    data = battle.data
+    battle.start_wave(data.wave_gremlins(wave_id))
+    deadline = battle.beat + max_ticks * BEATS_PER_TICK
+
+    outcome = battle.outcome()
+    plays = 0
+    while outcome is None and battle.beat < deadline and plays < MAX_PLAYS_PER_WAVE:
+        if not battle.hand:
+            battle.end_turn()
+            if not battle.hand:
+                break
+        card_id = battle.choose_card()
+        battle.play(card_id, battle.choose_slot())
+        plays += 1
+        until = min(deadline, battle.beat + int(data.time_cost[card_id] * BEATS_PER_TICK))
+        outcome = battle.advance_to(until, per_beat)
+        battle.sweep()
+
+    if outcome == 'loss':
+        return 'death', plays
+    if outcome != 'win':
+        return ('exhausted' if not battle.hand and battle.beat < deadline else 'timeout'), plays
+    return 'win', plays
+
+def play_run(data: RunData, rng: random.Random, max_waves: int = DEFAULT_MAX_WAVES,
+             max_ticks: int = DEFAULT_MAX_TICKS, policy: str = 'greedy', per_beat: bool = False) -> RunResult:
+    """One run from the starter deck until the hero dies, a wave stalls or max_waves are cleared."""
+    battle = RunBattle(data, rng)
+    result = RunResult(0, 'max_waves')
+    for wave_number in range(1, max_waves + 1):
+        wave_id = select_wave(data, wave_number, rng)
+        if wave_id is None:
+            result.end = 'exhausted'
+            break
+        result.final_wave_id = wave_id
+        outcome, plays = play_wave(battle, wave_id, max_ticks, per_beat)
+        result.cards_played += plays
+
+        if outcome != 'win':
+            result.end = outcome
+            break
+        result.waves_cleared = wave_number
+        if wave_number == max_waves:
+            break
+        offers = reward_offers(data, wave_number, rng)
+        if offers:
+            pick = pick_reward(data, offers, policy, rng)
+            result.offers.extend(offers)
+            result.picks.append(pick)
+            battle.deck.append(pick)
+    result.hero_hp = battle.hero_hp
+    result.beats = battle.beat
+    return result
+
+@dataclass
+class RunReport:
+    """Integer tallies over many runs; merging shards in any order gives the same report."""
+    max_waves: int
+    runs: int = 0
+    cleared: List[int] = field(default_factory=list)        # cleared[i]: runs that cleared wave i + 1
+    deaths: List[int] = field(default_factory=list)         # deaths[i]: runs that died on wave i + 1
+    ends: Dict[str, int] = field(default_factory=dict)
+    death_waves: Dict[str, int] = field(default_factory=dict)
+    offers: Dict[str, int] = field(default_factory=dict)
+    picks: Dict[str, int] = field(default_factory=dict)
+    cards_played: int = 0
+    beats: int = 0
+
+    def __post_init__(self):
+        self.cleared = self.cleared or [0] * self.max_waves
+        self.deaths = self.deaths or [0] * self.max_waves
+
+    def add(self, result: RunResult) -> None:
+        self.runs += 1
+        for i in range(result.waves_cleared):
+            self.cleared[i] += 1
+        self.ends[result.end] = self.ends.get(result.end, 0) + 1
+        if result.end == 'death':
+            self.deaths[result.waves_cleared] += 1
+            self.death_waves[result.final_wave_id] = self.death_waves.get(result.final_wave_id, 0) + 1
+        for card_id in result.offers:
+            self.offers[card_id] = self.offers.get(card_id, 0) + 1
+        for card_id in result.picks:
+            self.picks[card_id] = self.picks.get(card_id, 0) + 1
+        self.cards_played += result.cards_played
+        self.beats += result.beats
+
+    def merge(self, other: 'RunReport') -> None:
+        self.runs += other.runs
+        self.cleared = [a + b for a, b in zip(self.cleared, other.cleared)]
+        self.deaths = [a + b for a, b in zip(self.deaths, other.deaths)]
+        for mine, theirs in ((self.ends, other.ends), (self.death_waves, other.death_waves),
+                             (self.offers, other.offers), (self.picks, other.picks)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        self.cards_played += other.cards_played
+        self.beats += other.beats
+
+    def survival(self) -> List[float]:
+        """Fraction of runs that cleared each wave."""
+        return [count / (self.runs or 1) for count in self.cleared]
+
+    def pick_rates(self) -> Dict[str, float]:
+        """Times picked per time offered, by card."""
+        return {card_id: self.picks.get(card_id, 0) / offered for card_id, offered in self.offers.items()}
+
+# Each worker process loads the data once
+_worker_data: Optional[RunData] = None
+
+def _init_worker(data_path: str) -> None:
+    global _worker_data
+    _worker_data = RunData(Path(data_path))
+
+def _run_shard(task: Tuple[int, int, int, int, int, str, bool]) -> RunReport:
+    seed, start, stop, max_waves, max_ticks, policy, per_beat = task
+    report = RunReport(max_waves)
+    for index in range(start, stop):
+        rng = random.Random(f"{seed}:{index}")
+        report.add(play_run(_worker_data, rng, max_waves, max_ticks, policy, per_beat))
+    return report
+
+def simulate_runs(runs: int, seed: int, data_path: Path = DATA_PATH, workers: int = 1,
+                  max_waves: int = DEFAULT_MAX_WAVES, max_ticks: int = DEFAULT_MAX_TICKS,
+                  policy: str = 'greedy', per_beat: bool = False) -> RunReport:
+    """Play `runs` runs split into shards over `workers` processes; the report does not depend on `workers`."""
+    shard_size = max(1, -(-runs // (workers * 8)))
+    tasks = [(seed, start, min(start + shard_size, runs), max_waves, max_ticks, policy, per_beat)
+             for start in range(0, runs, shard_size)]
+    report = RunReport(max_waves)
+    if workers <= 1:
+        _init_worker(str(data_path))
+        for task in tasks:
+            report.merge(_run_shard(task))
+        return report
+    with Pool(workers, initializer=_init_worker, initargs=(str(data_path),)) as pool:
+        for shard in pool.imap_unordered(_run_shard, tasks):
+            report.merge(shard)
+    return report
+
+def print_report(report: RunReport, elapsed: float, top: int) -> None:
+    print("\n" + "=" * 60)
+    print(f"📊 {report.runs} runs in {elapsed:.2f}s ({report.runs / max(elapsed, 1e-9):,.1f}/s)")
+    print("=" * 60)
+    for end, count in sorted(report.ends.items(), key=lambda item: -item[1]):
+        print(f"  {end:<10} {count:>7}  {count / (report.runs or 1):6.1%}")
+    print(f"  Mean cards played: {report.cards_played / (report.runs or 1):.1f}, "
+          f"mean run length: {report.beats / BEATS_PER_TICK / (report.runs or 1):.1f} ticks")
+
+    print("\n📋 Survival by wave")
+    print(f"  {'Wave':>4}  {'Cleared':>8}  {'Survival':>8}  {'Deaths':>7}")
+    survival = report.survival()
+    for i, (cleared, deaths) in enumerate(zip(report.cleared, report.deaths)):
+        bar = "█" * int(survival[i] * 30)
+        print(f"  {i + 1:>4}  {cleared:>8}  {survival[i]:8.1%}  {deaths:>7}  {bar}")
+        if not cleared and not deaths:
+            break
+
+    if report.death_waves:
+        print(f"\n💀 Deadliest waves")
+        for wave_id, count in sorted(report.death_waves.items(), key=lambda item: (-item[1], item[0]))[:top]:
+            print(f"  {wave_id:<24} {count:>6}")
+
+    if report.offers:
+        print(f"\n🃏 Reward pick rates (top {top} by times picked)")
+        rates = report.pick_rates()
+        for card_id in sorted(report.offers, key=lambda c: (-report.picks.get(c, 0), c))[:top]:
+            print(f"  {card_id:<32} picked {report.picks.get(card_id, 0):>6} / offered "
+                  f"{report.offers[card_id]:>6}  ({rates[card_id]:.0%})")
+
+def main():
+    """Simulate endless runs and report survival, deaths and reward picks."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Monte Carlo simulator for endless-mode runs")
+    parser.add_argument('--runs', type=int, default=1000, help='Runs to simulate (default: 1000)')
+    parser.add_argument('--seed', type=int, help='Random seed (default: random, printed)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: one per CPU)')
+    parser.add_argument('--max-waves', type=int, default=DEFAULT_MAX_WAVES,
+                        help=f'Stop a run after this many waves (default: {DEFAULT_MAX_WAVES})')
+    parser.add_argument('--max-ticks', type=int, default=DEFAULT_MAX_TICKS,
+                        help=f'Ticks before a wave counts as stalled (default: {DEFAULT_MAX_TICKS})')
+    parser.add_argument('--policy', choices=PICK_POLICIES, default='greedy',
+                        help='Reward pick: most damage per tick, random or first offer (default: greedy)')
+    parser.add_argument('--top', type=int, default=15, help='Rows in the death and pick tables (default: 15)')
+    parser.add_argument('--per-beat', action='store_true', help='Step every beat instead of jumping between events')
+    parser.add_argument('--check', action='store_true',
+                        help='Run both time-advance modes and verify they give identical reports')
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with the exported JSON files')
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 31)
+    workers = max(1, args.workers)
+    data = RunData(Path(args.data))
+    if not data.starter_deck:
+        print("❌ No card has the 'starter' keyword; there is no deck to start a run with")
+        return 1
+    if not data.waves_by_difficulty:
+        print("❌ wave_data.json has no waves")
+        return 1
+    print(f"🔍 {args.runs} runs, seed {seed}, {workers} worker(s), up to {args.max_waves} waves, "
+          f"{args.policy} rewards, {len(data.starter_deck)}-card starter deck")
+
+    if args.check:
+        timings = {}
+        reports = {}
+        for per_beat in (True, False):
+            start = time.perf_counter()
+            reports[per_beat] = simulate_runs(args.runs, seed, Path(args.data), workers, args.max_waves,
+                                              args.max_ticks, args.policy, per_beat)
+            timings[per_beat] = time.perf_counter() - start
+        print(f"\n📊 Per-beat {timings[True]:.2f}s, event-skipping {timings[False]:.2f}s "
+              f"({timings[True] / max(timings[False], 1e-9):.1f}x)")
+        if reports[True] != reports[False]:
+            print("❌ The two modes give different reports")
+            return 1
+        print(f"✅ Identical reports over {args.runs} runs")
+        return 0
+
+    start = time.perf_counter()
+    report = simulate_runs(args.runs, seed, Path(args.data), workers, args.max_waves,
+                           args.max_ticks, args.policy, args.per_beat)
+    print_report(report, time.perf_counter() - start, args.top)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
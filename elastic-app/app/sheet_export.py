@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Export-after-edit: regenerate only the data JSON of the spreadsheet a
+WaveSheet just wrote, then cross-check it against the other cached JSONs.
+
+The spreadsheet -> JSON file mapping is json_exporter.SHEETS_TO_EXPORT. By
+default the JSON is converted from the sheet snapshot the edit already holds
+(the same rows that were just written), so nothing is fetched again;
+refetch=True re-downloads that one sheet through the public CSV export instead.
+Exporting card or mob data also rewrites compiled_effects.json (see
+effect_compiler.py); if an effect key fails to compile, the stale
+compiled_effects.json is removed and EffectCompileError is raised.
+
+Usage:
+    with WaveSheet() as sheet:
+        ...
+    export_sheet(sheet)
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+from check_data_references import Problem, check_references
+from effect_compiler import COMPILED_FILE, SOURCE_FILES, EffectCompileError, compile_data_dir, write_compiled
+from wave_difficulty import DATA_PATH
+from wave_sheets import WaveSheet
+
+ARRAY_SEPARATOR = "|"
+
+def _exporter_module(data_path: Path):
+    # json_exporter lives next to the JSON files it writes
+    if str(data_path.resolve()) not in sys.path:
+        sys.path.insert(0, str(data_path.resolve()))
+    import json_exporter
+    return json_exporter
+
+def export_sheet(sheet: WaveSheet, data_path: Path = DATA_PATH, refetch: bool = False) -> Path:
+    """Rewrite the JSON file configured for sheet's spreadsheet; returns its path."""
+    json_exporter = _exporter_module(data_path)
+    filename = json_exporter.SHEETS_TO_EXPORT.get(sheet.spreadsheet_id)
+    if filename is None:
+        raise ValueError(f"Spreadsheet {sheet.spreadsheet_id} is not configured in json_exporter.SHEETS_TO_EXPORT")
+    if sheet.pending:
+        raise ValueError("Sheet has unflushed edits; flush() before exporting")
+
+    output = data_path / filename
+    exporter = json_exporter.PublicSheetsToJsonExporter(array_separator=ARRAY_SEPARATOR)
+    if refetch:
+        exporter.export_sheet_to_json(sheet.spreadsheet_id, str(output))
+    else:
+        # The exporter expects cells as the CSV export returns them: strings
+        rows = [['' if cell is None else str(cell) for cell in row] for row in sheet.values]
+        exporter.export_to_file(exporter.convert_to_json(rows), str(output))
+    if output.name in SOURCE_FILES:
+        # Keep compiled_effects.json in step, and never leave an outdated one behind
+        compiled = compile_data_dir(data_path)
+        if compiled.errors:
+            (data_path / COMPILED_FILE).unlink(missing_ok=True)
+            details = "\n".join(f"  {file}: {record}: {message}" for file, record, message in compiled.errors[:10])
+            raise EffectCompileError(f"{output.name} exported, but {len(compiled.errors)} effect(s) "
+                                     f"failed to compile:\n{details}")
+        write_compiled(compiled, data_path)
+    return output
+
+def export_and_check(sheet: WaveSheet, data_path: Path = DATA_PATH,
+                     refetch: bool = False) -> Tuple[Path, List[Problem]]:
+    """export_sheet(), then the cross-reference problems that involve the exported file."""
+    output = export_sheet(sheet, data_path, refetch)
+    problems = [p for p in check_references(data_path) if p.file == output.name]
+    return output, problems
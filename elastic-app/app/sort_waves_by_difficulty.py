@@ -1,69 +1,71 @@
 #!/usr/bin/env python3
 """
 Sort waves in spreadsheet by difficulty value
+
+Rows are ordered by difficulty, then act, then wave_id (numbers inside ids
+compare numerically, so wave_9a sorts before wave_10a). The sort is stable, so
+repeated runs never churn rows. Only rows whose contents change position are
+rewritten, as a single batchUpdate; an already-sorted sheet is not written.
 """
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+import re
+import sys
 
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
-SERVICE_ACCOUNT_FILE = '/home/rosswolf/Code/google-sheets-mcp/service-account-key.json'
-SPREADSHEET_ID = '1Bv6R-AZtzmG_ycwudZ5Om6dKrJgl6Ut9INw7GTJFUlw'
+from wave_sheets import WaveSheet
 
-def get_sheets_service():
-    creds = service_account.Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-    return build('sheets', 'v4', credentials=creds)
+def _as_int(row, col):
+    value = str(row[col]).strip() if col is not None and len(row) > col else ''
+    return int(value) if value.lstrip('-').isdigit() else 0
 
-def sort_waves_by_difficulty():
-    service = get_sheets_service()
-    sheet = service.spreadsheets()
-    
-    # Get all data
-    result = sheet.values().get(
-        spreadsheetId=SPREADSHEET_ID,
-        range='Sheet1!A:H'
-    ).execute()
+def _natural_key(value):
+    """Split digits out so 'wave_10a' sorts after 'wave_9a'."""
+    return tuple(int(part) if part.isdigit() else part for part in re.split(r'(\d+)', str(value)))
+
+def wave_sort_key(sheet: WaveSheet):
+    """Key function ordering rows by (difficulty, act, wave_id)."""
+    difficulty_col = sheet.column('difficulty', 3)
+    act_col = sheet.column('act', 2)
+    wave_id_col = sheet.column('wave_id', 0)
+
+    def key(row):
+        wave_id = row[wave_id_col] if len(row) > wave_id_col else ''
+        return (_as_int(row, difficulty_col), _as_int(row, act_col), _natural_key(wave_id))
+    return key
+
+def sort_waves_by_difficulty(sheet: WaveSheet = None, dry_run: bool = False):
+    """Sort the wave rows; pass a shared sheet to batch with other steps."""
+    owns_sheet = sheet is None
+    sheet = sheet or WaveSheet()
     
-    values = result.get('values', [])
-    if not values:
+    if not sheet.values:
         print("No data found")
         return
     
-    headers = values[0]
-    data_rows = values[1:]
+    difficulty_col = sheet.column('difficulty', 3)
     
-    # Find difficulty column
-    difficulty_col = headers.index('difficulty') if 'difficulty' in headers else 3
+    # Python's sort is stable, so rows with equal keys keep their current order
+    sorted_rows = sorted(sheet.rows, key=wave_sort_key(sheet))
     
-    # Sort data rows by difficulty (convert to int for proper sorting)
-    sorted_rows = sorted(data_rows, key=lambda row: int(row[difficulty_col]) if len(row) > difficulty_col and row[difficulty_col].isdigit() else 0)
-    
-    # Rebuild the full data
-    all_data = [headers] + sorted_rows
-    
-    # Clear and rewrite entire sheet
-    # First clear
-    sheet.values().clear(
-        spreadsheetId=SPREADSHEET_ID,
-        range='Sheet1!A:H'
-    ).execute()
-    
-    # Then write sorted data
-    body = {'values': all_data}
+    # Only rows that moved are marked for writing
+    sheet.replace_rows(sorted_rows)
+    updates = sheet.pending_updates()
+    if not updates:
+        print(f"✅ {len(sorted_rows)} waves already sorted - nothing to write")
+        return
     
-    result = sheet.values().update(
-        spreadsheetId=SPREADSHEET_ID,
-        range='Sheet1!A:H',
-        valueInputOption='RAW',
-        body=body
-    ).execute()
+    moved = sum(len(update['values']) for update in updates)
+    print(f"Sorted {len(sorted_rows)} waves by difficulty: {moved} row(s) in {len(updates)} range(s) change")
+    for update in updates:
+        print(f"  {update['range']}")
+    if dry_run:
+        return
+    if owns_sheet:
+        sheet.flush()
     
-    print(f"Sorted {len(sorted_rows)} waves by difficulty")
     print("Difficulty range:", 
-          int(sorted_rows[0][difficulty_col]) if sorted_rows and len(sorted_rows[0]) > difficulty_col else 0,
+          _as_int(sorted_rows[0], difficulty_col) if sorted_rows else 0,
           "to",
-          int(sorted_rows[-1][difficulty_col]) if sorted_rows and len(sorted_rows[-1]) > difficulty_col else 0)
+          _as_int(sorted_rows[-1], difficulty_col) if sorted_rows else 0)
 
 if __name__ == "__main__":
-    sort_waves_by_difficulty()
\ No newline at end of file
+    sort_waves_by_difficulty(dry_run='--dry-run' in sys.argv[1:])
@@ -1,11 +1,57 @@
 import json
 import csv
 import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from urllib3.util.retry import Retry  # type: ignore
 import argparse
 import sys
 import os
+import subprocess
 from io import StringIO
 
+# Throttled (429) and transient server errors are retried with exponential
+# backoff, honouring the server's Retry-After header
+FETCH_RETRIES = Retry(
+    total=6,
+    backoff_factor=1.0,
+    status_forcelist=(408, 429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    respect_retry_after_header=True,
+)
+FETCH_TIMEOUT = 60  # Seconds
+
+# Hardcoded mapping of spreadsheet IDs to output filenames
+# Each entry represents one complete Google Sheets document (always reads GID 0)
+SHEETS_TO_EXPORT = {
+    # Tourbillon card spreadsheet (new format)
+    "1zoNrBnX2od6nrTL3G4wS_QMYig69laRn0XYH-KOUqTk": "card_data.json",
+    # Add more spreadsheet IDs here:
+    "1TlOn39AXlw0y2tlkE4kvIpvoZ9SpNQTkDGgOptvqSgM": "mob_data.json",
+    "1vqf7i3FQPI4C9p0ME3kDnCa9u6fGjIg7Z1loQryfIz0": "configuration_data.json",
+    "1xa8_S08EFnjsSBAaKCZ4okflLWUSzm9vcjAQcHIY2os": "goals_data.json",
+    "163_WvC6Vsa9Q5mAgRh296npPyaEmd2iEPF7OAki7b5Q": "relic_data.json",
+    "1rJPpGNARZ-ZtTRWjehFTeM_ru6Urf6qB-UuxzzeSsMY": "icon_data.json",
+    "1fIkbi6B80U6fXNYX1Gq3w4UqOP-z_vpqEsyAEKcb2ss": "hero_data.json",
+    "1Bv6R-AZtzmG_ycwudZ5Om6dKrJgl6Ut9INw7GTJFUlw": "wave_data.json"
+}
+
+
+def select_sheets(names):
+    """
+    Entries of SHEETS_TO_EXPORT whose output file matches one of names
+    ("wave", "wave_data" or "wave_data.json"); all of them when names is empty.
+    """
+    if not names:
+        return dict(SHEETS_TO_EXPORT)
+    wanted = {name[:-len('.json')] if name.endswith('.json') else name for name in names}
+    return {
+        spreadsheet_id: output_filename
+        for spreadsheet_id, output_filename in SHEETS_TO_EXPORT.items()
+        if output_filename[:-len('.json')] in wanted
+        or output_filename[:-len('_data.json')] in wanted
+    }
+
+
 class PublicSheetsToJsonExporter:
     def __init__(self, array_separator="|"):
         """
@@ -15,6 +61,8 @@ class PublicSheetsToJsonExporter:
             array_separator (str): Character(s) used to separate array values in cells (default: "|")
         """
         self.array_separator = array_separator
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(max_retries=FETCH_RETRIES))
     
     def get_public_sheet_data(self, spreadsheet_id, gid=0):
         """
@@ -33,8 +81,8 @@ class PublicSheetsToJsonExporter:
             
             print(f"Fetching data from GID {gid}")
             
-            # Make the request
-            response = requests.get(url)
+            # Make the request (retried on throttling, see FETCH_RETRIES)
+            response = self.session.get(url, timeout=FETCH_TIMEOUT)
             response.raise_for_status()  # Raise an exception for bad status codes
             
             # Parse the CSV data
@@ -473,6 +521,36 @@ class PublicSheetsToJsonExporter:
         return json_data
 
 
+def check_golden_scenarios():
+    """
+    Re-run the golden battle scenarios (elastic-app/app/golden_scenarios.py)
+    against the freshly exported JSONs and report the ones that moved.
+    Returns True when every scenario still matches its golden.
+    """
+    app_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+    oracle = os.path.join(app_dir, 'golden_scenarios.py')
+    if not os.path.exists(oracle):
+        return True
+    print("\n🔍 Checking golden battle scenarios...")
+    # The exported files were written to the working directory
+    return subprocess.call([sys.executable, oracle, '--data', os.getcwd()], cwd=app_dir) == 0
+
+
+def compile_effects():
+    """
+    Compile the freshly exported card and mob JSONs with
+    elastic-app/app/effect_compiler.py, which rejects unknown effect keys and
+    rewrites compiled_effects.json. Returns True when everything compiled.
+    """
+    app_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+    compiler = os.path.join(app_dir, 'effect_compiler.py')
+    if not os.path.exists(compiler):
+        return True
+    print("\n🔧 Compiling card effects and gremlin moves...")
+    # The exported files were written to the working directory
+    return subprocess.call([sys.executable, compiler, '--data', os.getcwd()], cwd=app_dir) == 0
+
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -534,24 +612,16 @@ Examples:
 
 
 def main():
-    """Main function - exports specified sheets from hardcoded spreadsheet IDs."""
+    """Main function - exports the configured sheets (or those named on the command line)."""
     
     ARRAY_SEPARATOR = "|"  # Change this to use a different separator
     
-    # Hardcoded mapping of spreadsheet IDs to output filenames
-    # Each entry represents one complete Google Sheets document (always reads GID 0)
-    sheets_to_export = {
-        # Tourbillon card spreadsheet (new format)
-        "1zoNrBnX2od6nrTL3G4wS_QMYig69laRn0XYH-KOUqTk": "card_data.json",
-        # Add more spreadsheet IDs here:
-        "1TlOn39AXlw0y2tlkE4kvIpvoZ9SpNQTkDGgOptvqSgM": "mob_data.json",
-        "1vqf7i3FQPI4C9p0ME3kDnCa9u6fGjIg7Z1loQryfIz0": "configuration_data.json",
-        "1xa8_S08EFnjsSBAaKCZ4okflLWUSzm9vcjAQcHIY2os": "goals_data.json",
-        "163_WvC6Vsa9Q5mAgRh296npPyaEmd2iEPF7OAki7b5Q": "relic_data.json",
-        "1rJPpGNARZ-ZtTRWjehFTeM_ru6Urf6qB-UuxzzeSsMY": "icon_data.json",
-        "1fIkbi6B80U6fXNYX1Gq3w4UqOP-z_vpqEsyAEKcb2ss": "hero_data.json",
-        "1Bv6R-AZtzmG_ycwudZ5Om6dKrJgl6Ut9INw7GTJFUlw": "wave_data.json"
-    }
+    # Optional filters: "python3 json_exporter.py wave" exports only wave_data.json
+    sheets_to_export = select_sheets(sys.argv[1:])
+    if not sheets_to_export:
+        print(f"❌ No configured sheet matches: {' '.join(sys.argv[1:])}")
+        print(f"   Available: {', '.join(SHEETS_TO_EXPORT.values())}")
+        sys.exit(1)
 
     print("📊 Hardcoded Google Sheets to JSON Exporter")
     print("=" * 60)
@@ -606,8 +676,13 @@ def main():
         if failed_exports > 0:
             print(f"\n⚠️  {failed_exports} exports failed. Check the error messages above.")
             sys.exit(1)
+        elif set(sheets_to_export.values()) & {'card_data.json', 'mob_data.json'} and not compile_effects():
+            print("\n❌ Effect compilation failed; fix the keys above in the sheet and export again")
+            sys.exit(1)
         else:
             print(f"\n🎉 All exports completed successfully!")
+            if not check_golden_scenarios():
+                print("\n⚠️  Golden scenarios moved; review them, then run golden_scenarios.py --update")
         
     except KeyboardInterrupt:
         print("\n⏹️  Operation cancelled by user")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Gremlin move-pattern threat profiler.
+Works out each gremlin's threat timeline analytically from the move_N /
+move_N_ticks columns of mob_data.json, then lines up whole waves without
+stepping time.
+
+A gremlin cycles through its moves as Gremlin.set_move_queue does: a move
+with N ticks completes N ticks after the previous one, so one cycle lasts the
+sum of the move ticks, and attacks, drains, discards and summons land at the
+end of their move. Caps hold while their move is loaded; 0-tick moves apply
+for the whole battle (GremlinDownsideProcessor). A wave's timeline repeats
+every LCM of its gremlins' cycles; each gremlin's per-tick arrays are tiled
+to that period and summed, so average rates, the worst --window-tick burst
+and the ticks where several attacks land together (spikes) are array
+operations. Summoned gremlins are listed, not added to the timeline.
+
+spike_threat puts a wave's worst burst into wave_difficulty's difficulty
+points (its excess over the average rate, weighted like an attack per tick),
+so it can be added to a DifficultyScorer wave score.
+
+Usage:
+    python3 threat_profile.py                      # Waves with the highest spike threat
+    python3 threat_profile.py --wave wave_6d
+    python3 threat_profile.py --mob oil_thief
+    python3 threat_profile.py --json --window 5
+"""
+
+import json
+import math
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from effect_compiler import (ALL_FORCES, DRAIN_ALL, DRAIN_LARGEST, DRAIN_RANDOM, FORCE_INDEXES, FORCE_NAMES,
+                             MOVE_ATTACK, MOVE_CARD_COST_PENALTY, MOVE_DRAIN, MOVE_FORCE_DISCARD, MOVE_HARD_CAP,
+                             MOVE_NAMES, MOVE_SOFT_CAP, MOVE_SUMMON, CompiledData)
+from wave_difficulty import ATTACK_WEIGHT, DATA_PATH, _load_records, parse_gremlins
+
+DEFAULT_WINDOW = 3             # Ticks in a burst window
+SPIKE_ATTACKS = 2              # Attacks on one tick that make it a spike
+MAX_PERIOD = 100_000           # Longer wave periods are profiled over their first MAX_PERIOD ticks
+DRAIN_TARGETS = {DRAIN_RANDOM: 'random', DRAIN_ALL: 'all', DRAIN_LARGEST: 'largest'}
+
+@dataclass
+class MobThreat:
+    """One gremlin's move cycle as per-tick arrays; index t is tick t + 1 of the cycle."""
+    mob_id: str
+    cycle: int
+    damage: np.ndarray
+    attacks: np.ndarray
+    drain: np.ndarray
+    disruption: np.ndarray
+    events: List[Tuple[int, str]] = field(default_factory=list)          # (tick, description)
+    # (kind, force, cap, first tick, last tick); permanent caps have no ticks
+    caps: List[Tuple[str, str, int, Optional[int], Optional[int]]] = field(default_factory=list)
+
+    @property
+    def damage_per_tick(self) -> float:
+        return float(self.damage.sum()) / self.cycle if self.cycle else 0.0
+
+    @property
+    def drain_per_tick(self) -> float:
+        return float(self.drain.sum()) / self.cycle if self.cycle else 0.0
+
+@dataclass
+class WaveThreat:
+    gremlins: List[str]
+    period: int
+    truncated: bool
+    damage_per_tick: float
+    drain_per_tick: float
+    disruption_per_tick: float
+    peak: int                      # Most damage on a single tick
+    burst: int                     # Most damage in any window of `window` ticks
+    burst_tick: int                # First tick of that window
+    window: int
+    spikes: List[Tuple[int, int, int]]     # (tick, attacks, damage) where SPIKE_ATTACKS+ attacks land
+    caps: Dict[str, Dict[str, Dict[str, float]]]    # kind -> force -> {'min', 'coverage'}
+
+    @property
+    def spike_threat(self) -> float:
+        """Excess of the worst burst over the average rate, in difficulty points."""
+        excess = self.burst - self.damage_per_tick * self.window
+        return max(0.0, excess / self.window * ATTACK_WEIGHT)
+
+    def to_dict(self) -> Dict:
+        return {
+            'gremlins': self.gremlins, 'period': self.period, 'truncated': self.truncated,
+            'damage_per_tick': round(self.damage_per_tick, 3), 'drain_per_tick': round(self.drain_per_tick, 3),
+            'disruption_per_tick': round(self.disruption_per_tick, 3), 'peak': self.peak,
+            'burst': self.burst, 'burst_tick': self.burst_tick, 'window': self.window,
+            'spike_ticks': len(self.spikes), 'worst_spike': max((s[2] for s in self.spikes), default=0),
+            'spike_threat': round(self.spike_threat, 2), 'caps': self.caps,
+        }
+
+def _force_name(operand: int) -> str:
+    return 'all' if operand == ALL_FORCES else FORCE_NAMES[operand]
+
+def profile_mob(mob_id: str, mob: Dict, compiled: Optional[CompiledData] = None) -> MobThreat:
+    """The threat timeline of one gremlin's move cycle."""
+    compiled = compiled or CompiledData()
+    cycled, background = compiled.compile_moves(mob, [])
+    cycle = sum(move[3] for move in cycled)
+    damage = np.zeros(cycle, dtype=np.int64)
+    attacks = np.zeros(cycle, dtype=np.int64)
+    drain = np.zeros(cycle, dtype=np.int64)
+    disruption = np.zeros(cycle, dtype=np.int64)
+    profile = MobThreat(mob_id, cycle, damage, attacks, drain, disruption)
+
+    for op, operand, value, _ in background:
+        if op in (MOVE_HARD_CAP, MOVE_SOFT_CAP):
+            profile.caps.append((MOVE_NAMES[op], _force_name(operand), value, None, None))
+    start = 0
+    for op, operand, value, ticks in cycled:
+        end = start + ticks            # The move completes on tick `end`
+        if op == MOVE_ATTACK:
+            damage[end - 1] += value
+            attacks[end - 1] += 1
+            profile.events.append((end, f"attack {value}"))
+        elif op == MOVE_DRAIN:
+            # drain_all_types takes value from every force
+            drain[end - 1] += value * (len(FORCE_INDEXES) if operand == DRAIN_ALL else 1)
+            target = DRAIN_TARGETS.get(operand) or FORCE_NAMES[operand]
+            profile.events.append((end, f"drain {target} {value}"))
+        elif op in (MOVE_FORCE_DISCARD, MOVE_CARD_COST_PENALTY):
+            disruption[end - 1] += value
+            profile.events.append((end, f"{MOVE_NAMES[op]} {value}"))
+        elif op == MOVE_SUMMON:
+            profile.events.append((end, f"summon {compiled.symbols[operand]}"))
+        elif op in (MOVE_HARD_CAP, MOVE_SOFT_CAP):
+            profile.caps.append((MOVE_NAMES[op], _force_name(operand), value, start + 1, end))
+        start = end
+    return profile
+
+def _cap_arrays(profiles: List[MobThreat], length: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Tightest cap per kind and force over the period, and the fraction of ticks it is capped."""
+    arrays: Dict[Tuple[str, str], np.ndarray] = {}
+    for profile in profiles:
+        for kind, force, cap, first, last in profile.caps:
+            capped = arrays.setdefault((kind, force), np.full(length, np.inf))
+            if first is None:
+                np.minimum(capped, cap, out=capped)
+                continue
+            window = np.full(profile.cycle, np.inf)
+            window[first - 1:last] = cap
+            np.minimum(capped, np.resize(window, length), out=capped)
+    caps: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for (kind, force), capped in sorted(arrays.items()):
+        active = np.isfinite(capped)
+        caps.setdefault(kind, {})[force] = {'min': int(capped[active].min()),
+                                            'coverage': round(float(active.mean()), 3)}
+    return caps
+
+def combine(gremlins: List[str], profiles: List[MobThreat], window: int = DEFAULT_WINDOW) -> WaveThreat:
+    """A wave's threat timeline: every gremlin's cycle tiled to the LCM of the cycles."""
+    cyclic = [p for p in profiles if p.cycle > 0]
+    period = math.lcm(*[p.cycle for p in cyclic]) if cyclic else 0
+    length = min(period, MAX_PERIOD)
+
+    def timeline(name: str) -> np.ndarray:
+        total = np.zeros(length, dtype=np.int64)
+        for p in cyclic:
+            total += np.resize(getattr(p, name), length)
+        return total
+
+    damage = timeline('damage')
+    attacks = timeline('attacks')
+    spikes = [(int(t) + 1, int(attacks[t]), int(damage[t])) for t in np.nonzero(attacks >= SPIKE_ATTACKS)[0]]
+    burst = burst_tick = 0
+    if length:
+        # The timeline repeats, so windows wrap around the end of the period
+        width = min(window, length)
+        wrapped = np.concatenate((damage, damage[:width - 1]))
+        sums = np.convolve(wrapped, np.ones(width, dtype=np.int64), mode='valid')[:length]
+        burst_tick = int(sums.argmax()) + 1
+        burst = int(sums.max())
+    return WaveThreat(
+        gremlins=gremlins, period=period, truncated=period > MAX_PERIOD,
+        damage_per_tick=sum(p.damage_per_tick for p in cyclic),
+        drain_per_tick=sum(p.drain_per_tick for p in cyclic),
+        disruption_per_tick=sum(float(p.disruption.sum()) / p.cycle for p in cyclic),
+        peak=int(damage.max()) if length else 0, burst=burst, burst_tick=burst_tick, window=window,
+        spikes=spikes, caps=_cap_arrays(profiles, length) if length else _cap_arrays(profiles, 1))
+
+class ThreatProfiler:
+    """Profiles gremlins once each and combines them into wave timelines."""
+
+    def __init__(self, mobs: Dict[str, Dict]):
+        self.mobs = mobs
+        self.compiled = CompiledData()
+        self._profiles: Dict[str, MobThreat] = {}
+
+    @classmethod
+    def from_data(cls, data_path: Path = DATA_PATH) -> 'ThreatProfiler':
+        mobs = {m['template_id']: m for m in _load_records(data_path / 'mob_data.json') if m.get('template_id')}
+        return cls(mobs)
+
+    def mob(self, mob_id: str) -> MobThreat:
+        if mob_id not in self._profiles:
+            self._profiles[mob_id] = profile_mob(mob_id, self.mobs[mob_id], self.compiled)
+        return self._profiles[mob_id]
+
+    def wave(self, gremlins: List[str], window: int = DEFAULT_WINDOW) -> WaveThreat:
+        """Unknown gremlin ids are left out, as GremlinSpawnController skips them."""
+        known = [g for g in gremlins if g in self.mobs]
+        return combine(known, [self.mob(g) for g in known], window)
+
+def print_mob(profile: MobThreat) -> None:
+    print(f"📋 {profile.mob_id}: {profile.cycle}-tick cycle, {profile.damage_per_tick:.2f} damage/tick, "
+          f"{profile.drain_per_tick:.2f} drain/tick")
+    for tick, description in profile.events:
+        print(f"  tick {tick:>4}  {description}")
+    for kind, force, cap, first, last in profile.caps:
+        when = "always" if first is None else f"ticks {first}-{last}"
+        print(f"  {kind:<10} {force:<10} {cap:>3}  {when}")
+
+def print_wave(wave_id: str, threat: WaveThreat) -> None:
+    print(f"📋 {wave_id}: {', '.join(threat.gremlins) or 'no known gremlins'}")
+    truncated = f" (profiled over the first {MAX_PERIOD})" if threat.truncated else ""
+    print(f"  Period {threat.period} ticks{truncated}")
+    print(f"  Damage {threat.damage_per_tick:.2f}/tick, peak {threat.peak} on one tick, "
+          f"{threat.burst} in {threat.window} ticks from tick {threat.burst_tick}")
+    print(f"  Drain {threat.drain_per_tick:.2f}/tick, disruption {threat.disruption_per_tick:.2f}/tick")
+    for kind, forces in threat.caps.items():
+        for force, cap in forces.items():
+            print(f"  {kind:<10} {force:<10} min {cap['min']:>3}, {cap['coverage']:.0%} of the time")
+    if threat.spikes:
+        worst = sorted(threat.spikes, key=lambda s: (-s[2], s[0]))[:5]
+        print(f"  ⚠️  {len(threat.spikes)} spike tick(s) per period; worst: "
+              + ", ".join(f"tick {tick} ({count} attacks, {damage})" for tick, count, damage in worst))
+    print(f"  Spike threat {threat.spike_threat:.1f} difficulty points")
+
+def main():
+    """Profile gremlin move cycles and wave threat timelines."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gremlin move-pattern threat profiler")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--mob', help='Print one gremlin\'s move cycle')
+    target.add_argument('--wave', help='Print one wave\'s threat timeline')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                        help=f'Ticks in a burst window (default: {DEFAULT_WINDOW})')
+    parser.add_argument('--top', type=int, default=15, help='Waves to list (default: 15)')
+    parser.add_argument('--json', action='store_true', help='Print every wave\'s profile as JSON')
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with mob_data.json / wave_data.json')
+    args = parser.parse_args()
+
+    profiler = ThreatProfiler.from_data(Path(args.data))
+    window = max(1, args.window)
+    if args.mob:
+        if args.mob not in profiler.mobs:
+            print(f"❌ Unknown gremlin: {args.mob}")
+            return 1
+        print_mob(profiler.mob(args.mob))
+        return 0
+
+    waves = {str(w.get('wave_id')): w for w in _load_records(Path(args.data) / 'wave_data.json') if w.get('wave_id')}
+    if args.wave:
+        if args.wave not in waves:
+            print(f"❌ Unknown wave: {args.wave}")
+            return 1
+        print_wave(args.wave, profiler.wave(parse_gremlins(waves[args.wave].get('gremlins')), window))
+        return 0
+
+    threats = {wave_id: profiler.wave(parse_gremlins(wave.get('gremlins')), window) for wave_id, wave in waves.items()}
+    if args.json:
+        print(json.dumps({wave_id: threat.to_dict() for wave_id, threat in threats.items()}, indent=2))
+        return 0
+
+    print(f"📊 {len(threats)} waves, {window}-tick burst window")
+    print(f"  {'Wave':<14} {'Diff':>5} {'Dmg/t':>6} {'Burst':>6} {'Spikes':>7} {'Worst':>6} {'Spike threat':>13}")
+    ranked = sorted(threats.items(), key=lambda item: (-item[1].spike_threat, item[0]))
+    for wave_id, threat in ranked[:args.top]:
+        worst = max((s[2] for s in threat.spikes), default=0)
+        print(f"  {wave_id:<14} {waves[wave_id].get('difficulty', ''):>5} {threat.damage_per_tick:6.2f} "
+              f"{threat.burst:>6} {len(threat.spikes):>7} {worst:>6} {threat.spike_threat:13.1f}")
+    spiky = sum(1 for threat in threats.values() if threat.spikes)
+    print(f"\n⚠️  {spiky} wave(s) where {SPIKE_ATTACKS}+ attacks land on the same tick")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
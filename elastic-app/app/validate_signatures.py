@@ -10,6 +10,8 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from gdscript_calls import CallSite, extract_call_sites
+
 class SignatureValidator:
     def __init__(self, signatures_path: Path):
         self.signatures = {}
@@ -38,9 +40,10 @@ class SignatureValidator:
             # Extract the class context
             class_context = self._get_class_context(content)
             
-            # Find all function calls
-            self._validate_constructor_calls(content, filepath, class_context)
-            self._validate_method_calls(content, filepath, class_context)
+            # One bracket-aware scan feeds every call check
+            calls = extract_call_sites(content)
+            self._validate_constructor_calls(calls, filepath, class_context)
+            self._validate_method_calls(calls, filepath, class_context)
             
         except Exception as e:
             self.errors.append(f"Error processing {filepath}: {e}")
@@ -78,26 +81,22 @@ class SignatureValidator:
             
         return context
     
-    def _validate_constructor_calls(self, content: str, filepath: Path, context: Dict):
+    def _validate_constructor_calls(self, calls: List[CallSite], filepath: Path, context: Dict):
         """Validate ClassName.new() constructor calls"""
-        # Pattern for ClassName.new(args)
-        pattern = r'\b(\w+)\.new\s*\((.*?)\)'
-        
-        for match in re.finditer(pattern, content):
-            class_name = match.group(1)
-            args_str = match.group(2).strip()
-            
-            # Count arguments (simple count, doesn't handle nested calls perfectly)
-            arg_count = self._count_arguments(args_str)
+        for call in calls:
+            if call.name != "new" or not call.receiver_name:
+                continue
+                
+            class_name = call.receiver_name
+            arg_count = call.arg_count
             
             # Check if this is a known class
             signature = self._get_constructor_signature(class_name)
             if signature:
                 expected = self._get_expected_arg_count(signature)
                 if not self._args_match(arg_count, expected):
-                    line_num = content[:match.start()].count('\n') + 1
                     self.errors.append(
-                        f"{filepath}:{line_num} - {class_name}.new() expects "
+                        f"{filepath}:{call.line} - {class_name}.new() expects "
                         f"{self._format_arg_count(expected)} arguments, got {arg_count}"
                     )
             elif class_name in self.godot_builtins:
@@ -106,27 +105,20 @@ class SignatureValidator:
                 if "constructor" in builtin:
                     expected = self._get_expected_arg_count(builtin["constructor"])
                     if not self._args_match(arg_count, expected):
-                        line_num = content[:match.start()].count('\n') + 1
                         self.errors.append(
-                            f"{filepath}:{line_num} - {class_name}.new() expects "
+                            f"{filepath}:{call.line} - {class_name}.new() expects "
                             f"{self._format_arg_count(expected)} arguments, got {arg_count}"
                         )
     
-    def _validate_method_calls(self, content: str, filepath: Path, context: Dict):
+    def _validate_method_calls(self, calls: List[CallSite], filepath: Path, context: Dict):
         """Validate object.method() calls"""
-        # Pattern for object.method(args) - excluding .new()
-        pattern = r'\b(\w+)\.(\w+)\s*\((.*?)\)'
-        
-        for match in re.finditer(pattern, content):
-            if match.group(2) == "new":
-                continue  # Skip constructors, handled separately
+        for call in calls:
+            if call.name == "new" or not call.receiver_name:
+                continue  # Constructors are handled separately, bare calls have no receiver
                 
-            object_name = match.group(1)
-            method_name = match.group(2)
-            args_str = match.group(3).strip()
-            
-            # Count arguments
-            arg_count = self._count_arguments(args_str)
+            object_name = call.receiver_name
+            method_name = call.name
+            arg_count = call.arg_count
             
             # Try to determine object type
             object_type = self._infer_object_type(object_name, context)
@@ -138,41 +130,20 @@ class SignatureValidator:
             if signature:
                 expected = self._get_expected_arg_count(signature)
                 if not self._args_match(arg_count, expected):
-                    line_num = content[:match.start()].count('\n') + 1
-                    
                     # Determine if it's a warning or error
                     if object_type in self.godot_builtins:
                         # Error for Godot builtins
                         self.errors.append(
-                            f"{filepath}:{line_num} - {object_type}.{method_name}() expects "
+                            f"{filepath}:{call.line} - {object_type}.{method_name}() expects "
                             f"{self._format_arg_count(expected)} arguments, got {arg_count}"
                         )
                     else:
                         # Warning for user classes (might be overridden)
                         self.warnings.append(
-                            f"{filepath}:{line_num} - {object_type}.{method_name}() expects "
+                            f"{filepath}:{call.line} - {object_type}.{method_name}() expects "
                             f"{self._format_arg_count(expected)} arguments, got {arg_count}"
                         )
     
-    def _count_arguments(self, args_str: str) -> int:
-        """Count the number of arguments in a call"""
-        if not args_str:
-            return 0
-            
-        # Simple counting - split by comma at depth 0
-        depth = 0
-        arg_count = 1
-        
-        for char in args_str:
-            if char in '([{':
-                depth += 1
-            elif char in ')]}':
-                depth -= 1
-            elif char == ',' and depth == 0:
-                arg_count += 1
-                
-        return arg_count
-    
     def _get_expected_arg_count(self, signature: Dict) -> Tuple[int, int]:
         """Get min and max expected arguments from signature"""
         params = signature.get("params", [])
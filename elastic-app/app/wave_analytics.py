@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Wave pool analytics over the exported JSON.
+Loads wave_data.json and mob_data.json into columnar NumPy arrays once (a
+wave x mob count matrix plus per-mob stat vectors) and answers the usual
+balance questions as array operations instead of loops over sheet rows:
+
+- difficulty distribution per act
+- how often each gremlin is used, and which are never used
+- coverage of the difficulty windows EndlessWaveManager selects from
+  (target = 5 + 10 * (wave - 1), +/- 30%)
+- HP and damage budgets per wave, and waves whose difficulty is out of line
+  with their budget
+
+Usage:
+    python3 wave_analytics.py
+    python3 wave_analytics.py --waves 40 --json
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from wave_difficulty import (DATA_PATH, MOVE_PATTERN, DifficultyScorer, _load_records, _number,
+                             parse_gremlins)
+
+# Mirrors EndlessWaveManager.start_next_wave()
+BASE_DIFFICULTY = 5
+DIFFICULTY_PER_WAVE = 10
+RANGE_LOW = 0.7
+RANGE_HIGH = 1.3
+
+OUTLIER_COUNT = 5
+
+class WavePool:
+    """Columnar view of the wave and mob exports."""
+
+    def __init__(self, waves: List[Dict], mobs: Dict[str, Dict]):
+        scorer = DifficultyScorer(mobs)
+        self.mob_ids = np.array(sorted(mobs))
+        mob_index = {mob_id: i for i, mob_id in enumerate(self.mob_ids)}
+
+        self.wave_ids = np.array([str(w.get('wave_id', '')) for w in waves])
+        self.acts = np.array([int(w.get('act') or 0) for w in waves])
+        self.difficulty = np.array([float(w.get('difficulty') or 0) for w in waves])
+        self.is_boss = np.array([bool(w.get('is_boss')) for w in waves])
+
+        # counts[w, m] = how many of mob m wave w spawns
+        self.counts = np.zeros((len(waves), len(self.mob_ids)), dtype=np.int32)
+        self.unknown: Dict[str, List[str]] = {}
+        for row, wave in enumerate(waves):
+            for gremlin in parse_gremlins(wave.get('gremlins')):
+                if gremlin in mob_index:
+                    self.counts[row, mob_index[gremlin]] += 1
+                else:
+                    self.unknown.setdefault(gremlin, []).append(str(self.wave_ids[row]))
+
+        def stat(field: str) -> np.ndarray:
+            return np.array([float(mobs[m].get(field) or 0) for m in self.mob_ids])
+
+        self.health = stat('max_health')
+        self.armor = stat('max_armor')
+        self.shields = stat('max_shields')
+        self.barriers = stat('barrier_count')
+        self.attack_per_tick = np.array([self._attack_per_tick(scorer, mobs[m]) for m in self.mob_ids])
+        self.mob_score = np.array([scorer.mob_score(m) for m in self.mob_ids])
+
+    @staticmethod
+    def _attack_per_tick(scorer: DifficultyScorer, mob: Dict) -> float:
+        """Average attack over one full move cycle."""
+        cycle = sum(_number(mob.get(f'{field}_ticks')) for field in mob if MOVE_PATTERN.match(field))
+        attack = sum(_number(value) for key, value, _ in scorer.moves(mob) if key == 'attack')
+        return attack / cycle if cycle > 0 else 0.0
+
+    @classmethod
+    def from_data(cls, data_path: Path = DATA_PATH) -> 'WavePool':
+        waves = _load_records(data_path / 'wave_data.json')
+        mobs = {m['template_id']: m for m in _load_records(data_path / 'mob_data.json') if m.get('template_id')}
+        return cls(waves, mobs)
+
+    # Budgets
+
+    @property
+    def effective_hp(self) -> np.ndarray:
+        """Per-mob health + armor + shields."""
+        return self.health + self.armor + self.shields
+
+    @property
+    def wave_hp(self) -> np.ndarray:
+        return self.counts @ self.effective_hp
+
+    @property
+    def wave_damage(self) -> np.ndarray:
+        """Expected attack per tick of the whole wave."""
+        return self.counts @ self.attack_per_tick
+
+    @property
+    def wave_size(self) -> np.ndarray:
+        return self.counts.sum(axis=1)
+
+    # Reports
+
+    def act_distribution(self) -> List[Dict]:
+        rows = []
+        for act in np.unique(self.acts):
+            values = self.difficulty[self.acts == act]
+            p25, median, p75 = np.percentile(values, [25, 50, 75])
+            rows.append({
+                'act': int(act), 'waves': int(values.size),
+                'min': float(values.min()), 'p25': float(p25), 'median': float(median),
+                'p75': float(p75), 'max': float(values.max()), 'mean': float(values.mean()),
+            })
+        return rows
+
+    def mob_frequency(self) -> List[Dict]:
+        spawned = self.counts.sum(axis=0)
+        in_waves = (self.counts > 0).sum(axis=0)
+        order = np.argsort(-spawned, kind='stable')
+        return [{'mob': str(self.mob_ids[i]), 'spawned': int(spawned[i]), 'waves': int(in_waves[i])}
+                for i in order]
+
+    def coverage(self, wave_count: int) -> List[Dict]:
+        """Candidate waves in EndlessWaveManager's window for waves 1..wave_count."""
+        numbers = np.arange(1, wave_count + 1)
+        targets = BASE_DIFFICULTY + (numbers - 1) * DIFFICULTY_PER_WAVE
+        low = (targets * RANGE_LOW).astype(int)
+        high = (targets * RANGE_HIGH).astype(int)
+        ordered = np.sort(self.difficulty)
+        candidates = np.searchsorted(ordered, high, side='right') - np.searchsorted(ordered, low, side='left')
+        return [{'wave': int(n), 'target': int(t), 'low': int(lo), 'high': int(hi), 'candidates': int(c)}
+                for n, t, lo, hi, c in zip(numbers, targets, low, high, candidates)]
+
+    def budget_outliers(self, count: int = OUTLIER_COUNT) -> Dict[str, List[Dict]]:
+        """Waves whose listed difficulty is furthest above/below their HP budget."""
+        hp = self.wave_hp
+        valid = (hp > 0) & (self.difficulty > 0)
+        ratio = np.full(self.difficulty.shape, np.nan)
+        ratio[valid] = self.difficulty[valid] / hp[valid]
+        # Compare in log space so "twice as hard" and "half as hard" weigh the same
+        log_ratio = np.zeros(self.difficulty.shape)
+        log_ratio[valid] = np.log(ratio[valid])
+        order = np.argsort(log_ratio, kind='stable')
+
+        def describe(i: int) -> Dict:
+            return {'wave_id': str(self.wave_ids[i]), 'difficulty': float(self.difficulty[i]),
+                    'hp': float(hp[i]), 'damage_per_tick': float(self.wave_damage[i]),
+                    'ratio': float(ratio[i])}
+
+        ranked = [int(i) for i in order if valid[i]]
+        return {'overrated': [describe(i) for i in ranked[::-1][:count]],
+                'underrated': [describe(i) for i in ranked[:count]]}
+
+    def report(self, wave_count: int) -> Dict:
+        hp, damage = self.wave_hp, self.wave_damage
+        return {
+            'waves': int(self.wave_ids.size),
+            'mobs': int(self.mob_ids.size),
+            'boss_waves': int(self.is_boss.sum()),
+            'unknown_gremlins': self.unknown,
+            'acts': self.act_distribution(),
+            'mob_frequency': self.mob_frequency(),
+            'coverage': self.coverage(wave_count),
+            'budgets': {
+                'hp': {'min': float(hp.min()), 'median': float(np.median(hp)), 'max': float(hp.max())},
+                'damage_per_tick': {'min': float(damage.min()), 'median': float(np.median(damage)),
+                                    'max': float(damage.max())},
+                'wave_size': {'min': int(self.wave_size.min()), 'max': int(self.wave_size.max())},
+            },
+            'outliers': self.budget_outliers(),
+        }
+
+def print_report(report: Dict) -> None:
+    print("=" * 60)
+    print(f"📊 {report['waves']} waves ({report['boss_waves']} boss), {report['mobs']} gremlin types")
+    print("=" * 60)
+
+    print("\nDifficulty by act:")
+    print(f"  {'act':>3} {'waves':>5} {'min':>6} {'p25':>6} {'median':>6} {'p75':>6} {'max':>6}")
+    for row in report['acts']:
+        print(f"  {row['act']:>3} {row['waves']:>5} {row['min']:>6.0f} {row['p25']:>6.0f} "
+              f"{row['median']:>6.0f} {row['p75']:>6.0f} {row['max']:>6.0f}")
+
+    print("\nGremlin usage (spawned / waves):")
+    for row in report['mob_frequency']:
+        marker = '  ⚠️  never used' if row['spawned'] == 0 else ''
+        print(f"  {row['mob']:<28} {row['spawned']:>3} / {row['waves']:<3}{marker}")
+
+    gaps = [row for row in report['coverage'] if row['candidates'] == 0]
+    thin = [row for row in report['coverage'] if row['candidates'] == 1]
+    print(f"\nEndlessWaveManager coverage (waves 1-{len(report['coverage'])}):")
+    for row in gaps:
+        print(f"  ❌ wave {row['wave']:>3}: no waves in {row['low']}-{row['high']} (target {row['target']})")
+    for row in thin:
+        print(f"  ⚠️  wave {row['wave']:>3}: only one wave in {row['low']}-{row['high']}")
+    if not gaps and not thin:
+        print("  ✅ every window has at least two candidate waves")
+
+    budgets = report['budgets']
+    print("\nBudgets per wave:")
+    print(f"  HP:              {budgets['hp']['min']:.0f} - {budgets['hp']['max']:.0f} "
+          f"(median {budgets['hp']['median']:.0f})")
+    print(f"  Damage per tick: {budgets['damage_per_tick']['min']:.2f} - {budgets['damage_per_tick']['max']:.2f} "
+          f"(median {budgets['damage_per_tick']['median']:.2f})")
+    for label, rows in (('Difficulty high for HP', report['outliers']['overrated']),
+                        ('Difficulty low for HP', report['outliers']['underrated'])):
+        print(f"  {label}:")
+        for row in rows:
+            print(f"    {row['wave_id']:<12} difficulty {row['difficulty']:>5.0f}  hp {row['hp']:>5.0f}  "
+                  f"dmg/tick {row['damage_per_tick']:.2f}")
+
+    if report['unknown_gremlins']:
+        print("\n⚠️  Gremlins missing from mob_data.json:")
+        for gremlin, waves in report['unknown_gremlins'].items():
+            print(f"  {gremlin}: {', '.join(waves)}")
+
+def main():
+    """Load the exports and print the wave pool report."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Wave pool analytics over the exported JSON")
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with wave_data.json / mob_data.json')
+    parser.add_argument('--waves', type=int, default=30, help='Endless waves to check coverage for')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    pool = WavePool.from_data(Path(args.data))
+    report = pool.report(args.waves)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+        print(f"\n⏱️  {elapsed * 1000:.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
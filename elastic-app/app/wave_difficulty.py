@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Wave difficulty scoring engine.
+Computes each wave's difficulty from the stats of its gremlins in
+mob_data.json and writes back only the difficulty cells that changed.
+
+A gremlin's score is its effective health (health, armor, shields, regen,
+barriers, damage caps) plus its threat (attack, drain and disruption per
+tick, persistent caps and expected summons). Scores are memoised per mob, so
+a wave list is scored in one pass over the gremlin ids. Boss waves (wave_id
+"boss_...") are scaled by BOSS_WAVE_MULTIPLIER.
+
+EndlessWaveManager picks wave N from the difficulties within +/- 30% of
+5 + 10 * (N - 1). The weights are fitted to the hand-set difficulties in
+wave_data.json (least squares on the relative error), so recomputed scores
+keep waves in the windows they were tuned for; re-fit them rather than
+changing one weight when the pacing moves.
+
+Usage:
+    python3 wave_difficulty.py --json             # Compare against wave_data.json
+    python3 wave_difficulty.py --dry-run          # Show sheet cells that would change
+    python3 wave_difficulty.py --explain oil_thief
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+DATA_PATH = Path(__file__).resolve().parent / 'src' / 'scenes' / 'data'
+GREMLIN_SEPARATOR = re.compile(r'[|,]')
+
+# Weights converting each stat into difficulty points (fitted, see above)
+HEALTH_WEIGHT = 0.9
+ARMOR_WEIGHT = 1.4             # Per point of armor
+SHIELD_WEIGHT = 0.25           # Per point of max shields
+SHIELD_REGEN_WEIGHT = 0.25     # Per shield regenerated each tick
+BARRIER_WEIGHT = 0.5           # Per barrier (absorbs one hit)
+DAMAGE_CAP_MULTIPLIER = 1.25   # Health multiplier when hits are capped
+REFLECT_WEIGHT = 0.2           # Fraction of health added per 100% reflect
+EXECUTE_IMMUNITY_WEIGHT = 0.25 # Per point of execute immunity threshold
+
+ATTACK_WEIGHT = 0.2            # Per point of damage per tick
+DRAIN_WEIGHT = 3.0             # Per resource drained per tick
+DISRUPTION_WEIGHT = 6.0        # Per discard / cost penalty per tick
+SOFT_CAP_THREAT = 0.25         # Flat threat of a persistent soft cap
+HARD_CAP_THREAT = 2.0          # Flat threat of a persistent hard cap
+SUMMON_WEIGHT = 0.5            # Fraction of a summoned gremlin's score per summon
+SUMMON_HORIZON_TICKS = 12      # Summons expected within this many ticks
+BOSS_WAVE_PREFIX = 'boss_'
+BOSS_WAVE_MULTIPLIER = 1.55    # Boss waves are paced well above their gremlins' stats
+
+MOVE_PATTERN = re.compile(r'^move_(\d+)$')
+
+def _number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def _load_records(path: Path) -> List[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return list(data.values()) if isinstance(data, dict) else data
+
+def parse_gremlins(value) -> List[str]:
+    """Gremlin ids from a wave's gremlins field ("a|b", "a,b" or a list)."""
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [part.strip() for part in GREMLIN_SEPARATOR.split(str(value or '')) if part.strip()]
+
+class DifficultyScorer:
+    """Scores gremlins and waves from mob data, memoising each mob's score."""
+
+    def __init__(self, mobs: Dict[str, Dict]):
+        self.mobs = mobs
+        self._scores: Dict[str, float] = {}
+        self._scoring: set = set()   # Guards summon cycles (a summons b summons a)
+
+    @classmethod
+    def from_data(cls, data_path: Path = DATA_PATH) -> 'DifficultyScorer':
+        mobs = {m['template_id']: m for m in _load_records(data_path / 'mob_data.json') if m.get('template_id')}
+        return cls(mobs)
+
+    def moves(self, mob: Dict) -> List[Tuple[str, str, int]]:
+        """(key, value, ticks) for every effect of every move."""
+        moves = []
+        for field, text in mob.items():
+            match = MOVE_PATTERN.match(field)
+            if not match or not isinstance(text, str):
+                continue
+            ticks = int(_number(mob.get(f'{field}_ticks', 0)))
+            for part in text.split(','):
+                if '=' in part:
+                    key, value = part.split('=', 1)
+                    moves.append((key.strip(), value.strip(), ticks))
+        return moves
+
+    def breakdown(self, mob_id: str) -> Dict[str, float]:
+        """Score components for one mob, in difficulty points."""
+        mob = self.mobs[mob_id]
+        health = _number(mob.get('max_health')) * HEALTH_WEIGHT
+        if _number(mob.get('damage_cap')) > 0:
+            health *= DAMAGE_CAP_MULTIPLIER
+        parts = {
+            'health': health,
+            'armor': _number(mob.get('max_armor')) * ARMOR_WEIGHT,
+            'shields': _number(mob.get('max_shields')) * SHIELD_WEIGHT
+                       + _number(mob.get('shield_regen')) * SHIELD_REGEN_WEIGHT,
+            'barriers': _number(mob.get('barrier_count')) * BARRIER_WEIGHT,
+            'reflect': health * _number(mob.get('reflect_percent')) / 100 * REFLECT_WEIGHT,
+            'execute_immunity': _number(mob.get('execute_immunity_threshold')) * EXECUTE_IMMUNITY_WEIGHT,
+            'attack': 0.0, 'drain': 0.0, 'disruption': 0.0, 'caps': 0.0, 'summons': 0.0,
+        }
+
+        for key, value, ticks in self.moves(mob):
+            amount = _number(value)
+            per_tick = amount / ticks if ticks > 0 else 0.0
+            if key == 'attack':
+                parts['attack'] += per_tick * ATTACK_WEIGHT
+            elif key.startswith('drain_'):
+                parts['drain'] += per_tick * DRAIN_WEIGHT
+            elif key in ('force_discard', 'card_cost_penalty'):
+                parts['disruption'] += per_tick * DISRUPTION_WEIGHT
+            elif key.endswith('_soft_cap'):
+                parts['caps'] += SOFT_CAP_THREAT
+            elif key.endswith('_hard_cap'):
+                parts['caps'] += HARD_CAP_THREAT
+            elif key == 'summon' and ticks > 0:
+                count = SUMMON_HORIZON_TICKS // ticks
+                cap = int(_number(mob.get('summon_cap')))
+                if cap > 0:
+                    count = min(count, cap)
+                parts['summons'] += count * SUMMON_WEIGHT * self._summon_score(value)
+        return parts
+
+    def _summon_score(self, summon: str) -> float:
+        if summon.startswith('random_'):
+            # random_<size>: the average gremlin of that size category
+            size = summon[len('random_'):]
+            pool = [mob_id for mob_id, mob in self.mobs.items() if mob.get('size_category') == size]
+            return sum(self.mob_score(m) for m in pool) / len(pool) if pool else 0.0
+        return self.mob_score(summon) if summon in self.mobs else 0.0
+
+    def mob_score(self, mob_id: str) -> float:
+        """Memoised score of one gremlin; 0 for ids not in mob_data."""
+        if mob_id in self._scores:
+            return self._scores[mob_id]
+        if mob_id not in self.mobs or mob_id in self._scoring:
+            return 0.0
+        self._scoring.add(mob_id)
+        try:
+            score = sum(self.breakdown(mob_id).values())
+        finally:
+            self._scoring.discard(mob_id)
+        self._scores[mob_id] = score
+        return score
+
+    def unknown(self, gremlins: List[str]) -> List[str]:
+        return [g for g in gremlins if g not in self.mobs]
+
+    def wave_score(self, gremlins: List[str], wave_id: str = '') -> int:
+        score = sum(self.mob_score(g) for g in gremlins)
+        if str(wave_id).startswith(BOSS_WAVE_PREFIX):
+            score *= BOSS_WAVE_MULTIPLIER
+        return max(1, round(score))
+
+def apply_difficulties(sheet, scorer: DifficultyScorer) -> Tuple[List[Tuple], List[Tuple]]:
+    """
+    Queue a difficulty update for every wave row whose computed score differs.
+    Returns (changes, skipped) as (row_num, wave_id, old, new) and
+    (row_num, wave_id, unknown_ids).
+    """
+    wave_id_col = sheet.column('wave_id', 0)
+    difficulty_col = sheet.column('difficulty', 3)
+    gremlins_col = sheet.column('gremlins', 7)
+
+    changes = []
+    skipped = []
+    for row_num, row in enumerate(sheet.rows, start=2):
+        if len(row) <= max(wave_id_col, gremlins_col) or not row[wave_id_col]:
+            continue
+        wave_id = row[wave_id_col]
+        gremlins = parse_gremlins(row[gremlins_col])
+        unknown = scorer.unknown(gremlins)
+        if unknown or not gremlins:
+            skipped.append((row_num, wave_id, unknown))
+            continue
+        new = scorer.wave_score(gremlins, wave_id)
+        old = row[difficulty_col] if len(row) > difficulty_col else ''
+        if str(old).strip() != str(new):
+            sheet.set_value(row_num, difficulty_col, new)
+            changes.append((row_num, wave_id, old, new))
+    return changes, skipped
+
+def compare_with_export(scorer: DifficultyScorer, data_path: Path = DATA_PATH) -> List[Tuple]:
+    """(wave_id, exported, computed) for waves in wave_data.json whose difficulty would change."""
+    differences = []
+    for wave in _load_records(data_path / 'wave_data.json'):
+        gremlins = parse_gremlins(wave.get('gremlins'))
+        if not gremlins or scorer.unknown(gremlins):
+            continue
+        computed = scorer.wave_score(gremlins, wave.get('wave_id', ''))
+        if computed != int(_number(wave.get('difficulty'))):
+            differences.append((wave.get('wave_id'), wave.get('difficulty'), computed))
+    return differences
+
+def main():
+    """Recompute wave difficulties and write back the changed cells."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compute wave difficulty from mob stats")
+    parser.add_argument('--data', default=str(DATA_PATH), help='Directory with mob_data.json / wave_data.json')
+    parser.add_argument('--sheet', default=None, help='Sheet (tab) name (default: Sheet1)')
+    parser.add_argument('--local', metavar='DIR', help='Use CSV files in DIR instead of Google Sheets')
+    parser.add_argument('--dry-run', action='store_true', help='Show changes without writing')
+    parser.add_argument('--json', action='store_true', help='Compare against wave_data.json instead of the sheet')
+    parser.add_argument('--explain', metavar='MOB_ID', help='Print the score breakdown for one gremlin')
+    args = parser.parse_args()
+
+    scorer = DifficultyScorer.from_data(Path(args.data))
+
+    if args.explain:
+        if args.explain not in scorer.mobs:
+            print(f"❌ Unknown gremlin: {args.explain}")
+            return 1
+        for name, value in scorer.breakdown(args.explain).items():
+            if value:
+                print(f"  {name:<18} {value:8.1f}")
+        print(f"  {'total':<18} {scorer.mob_score(args.explain):8.1f}")
+        return 0
+
+    if args.json:
+        differences = compare_with_export(scorer, Path(args.data))
+        for wave_id, exported, computed in differences:
+            print(f"  {wave_id:<12} {exported!s:>5} -> {computed}")
+        print(f"📊 {len(differences)} wave difficulties differ from wave_data.json")
+        return 0
+
+    from wave_sheets import DEFAULT_SHEET, WaveSheet, use_local_backend
+
+    if args.local:
+        use_local_backend(args.local)
+    sheet = WaveSheet(args.sheet or DEFAULT_SHEET)
+    if not sheet.values:
+        print("No data found")
+        return 1
+
+    changes, skipped = apply_difficulties(sheet, scorer)
+    for row_num, wave_id, old, new in changes:
+        print(f"  row {row_num}: {wave_id:<12} {old!s:>5} -> {new}")
+    for row_num, wave_id, unknown in skipped:
+        print(f"  ⚠️  row {row_num}: {wave_id} skipped (unknown gremlins: {', '.join(unknown) or 'none listed'})")
+
+    if not changes:
+        print("✅ All wave difficulties are up to date")
+        return 0
+    if args.dry_run:
+        print(f"🔍 Dry run: {len(changes)} difficulty cell(s) would change")
+        return 0
+    sheet.flush()
+    print(f"✅ Updated {len(changes)} difficulty cell(s) in {sheet.api_calls} API call(s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Run several wave maintenance steps against one shared sheet snapshot.
+Every step queues its edits, and the whole pass is written with a single
+batchUpdate, so "add waves, clean, re-sort" costs one read and one write.
+
+Usage:
+    python3 wave_maintenance.py add1 add2 add3 add4 clean sort
+    python3 wave_maintenance.py fix sort --export   # Then regenerate wave_data.json
+
+The add steps upsert the wave definitions in wave_batches/ (see import_waves.py).
+"""
+
+import functools
+import sys
+from pathlib import Path
+
+from check_data_references import print_problems
+from clean_wave_gremlins import clean_wave_gremlins
+from sort_waves_by_difficulty import sort_waves_by_difficulty
+from import_waves import import_waves
+from sheet_export import export_and_check
+from update_waves_batch1 import update_existing_difficulties
+from wave_sheets import DEFAULT_SHEET, WaveSheet, use_local_backend
+
+BATCH_DIR = Path(__file__).resolve().parent / 'wave_batches'
+
+def _import_batch(filename: str):
+    return functools.partial(lambda sheet, path: import_waves([path], sheet), path=BATCH_DIR / filename)
+
+STEPS = {
+    'add1': _import_batch('batch1_easy.csv'),
+    'add2': _import_batch('batch2_medium.csv'),
+    'add3': _import_batch('batch3_hard.csv'),
+    'add4': _import_batch('batch4_nightmare.csv'),
+    'fix': update_existing_difficulties,
+    'clean': clean_wave_gremlins,
+    'sort': sort_waves_by_difficulty,
+}
+
+def main():
+    """Run the requested steps in order and flush once."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run wave maintenance steps with one batched write")
+    parser.add_argument('steps', nargs='+', choices=list(STEPS), help='Steps to run, in order')
+    parser.add_argument('--sheet', default=DEFAULT_SHEET, help='Sheet (tab) name')
+    parser.add_argument('--dry-run', action='store_true', help='Run the steps without writing')
+    parser.add_argument('--local', metavar='DIR', help='Use CSV files in DIR instead of Google Sheets')
+    parser.add_argument('--export', action='store_true',
+                        help="Regenerate this spreadsheet's data JSON and cross-check it after writing")
+    parser.add_argument('--refetch', action='store_true',
+                        help='With --export, download the sheet again instead of converting the snapshot')
+    args = parser.parse_args()
+
+    if args.local:
+        use_local_backend(args.local)
+
+    sheet = WaveSheet(args.sheet)
+    for step in args.steps:
+        print(f"▶️  {step}")
+        STEPS[step](sheet)
+
+    if args.dry_run:
+        print(f"🔍 Dry run: {sheet.pending} row(s) would be written")
+        print(sheet.format_diff())
+        return 0
+
+    pending = sheet.pending
+    sheet.flush()
+    print(f"✅ Wrote {pending} row(s) in {sheet.api_calls} API call(s)")
+
+    if args.export:
+        print("📦 Exporting...")
+        output, problems = export_and_check(sheet, refetch=args.refetch)
+        print(f"✅ Regenerated {output}")
+        print_problems(problems)
+        return 1 if problems else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Shared Google Sheets client for the wave maintenance scripts.
+Builds the Sheets service once per process (static discovery document, one
+set of credentials, one HTTP connection), reads a sheet into a local snapshot
+and queues every edit against it, so a whole run costs one read and one
+values().batchUpdate.
+
+Usage:
+    with WaveSheet() as sheet:
+        sheet.append_rows(new_waves)
+        sheet.set_value(row_num, 'difficulty', 42)
+    # Queued edits are flushed on exit
+
+Set WAVE_SHEETS_LOCAL=<dir> to use the CSV-backed stand-in in fake_sheets.py
+instead of Google Sheets. Every request goes through api_retry.execute(), which
+budgets the Sheets quota and retries throttled or transient failures.
+"""
+
+import functools
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from api_retry import execute
+
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+SERVICE_ACCOUNT_FILE = '/home/rosswolf/Code/google-sheets-mcp/service-account-key.json'
+SPREADSHEET_ID = '1Bv6R-AZtzmG_ycwudZ5Om6dKrJgl6Ut9INw7GTJFUlw'
+DEFAULT_SHEET = 'Sheet1'
+LOCAL_BACKEND_ENV = 'WAVE_SHEETS_LOCAL'
+
+def use_local_backend(directory) -> None:
+    """Route every sheet in this process to CSV files in directory."""
+    os.environ[LOCAL_BACKEND_ENV] = str(directory)
+    get_sheets_service.cache_clear()
+
+@functools.lru_cache(maxsize=None)
+def get_sheets_service():
+    """Create the Sheets API service once and reuse it for the whole process."""
+    local_dir = os.environ.get(LOCAL_BACKEND_ENV)
+    if local_dir:
+        from fake_sheets import LocalSheetsService
+        return LocalSheetsService(local_dir)
+
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+
+    creds = service_account.Credentials.from_service_account_file(
+        SERVICE_ACCOUNT_FILE, scopes=SCOPES)
+    # The bundled discovery document avoids a network fetch per build()
+    return build('sheets', 'v4', credentials=creds, cache_discovery=False, static_discovery=True)
+
+def column_letter(index: int) -> str:
+    """A1 column letters for a zero-based column index: 0 -> A, 25 -> Z, 26 -> AA."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def a1_range(sheet_name: str, cells: str = '') -> str:
+    """A1 range on a tab, quoting the tab name; no cells means every column of the tab."""
+    tab = "'" + sheet_name.replace("'", "''") + "'"
+    return f'{tab}!{cells}' if cells else tab
+
+def _runs(indexes: Set[int]) -> List[Tuple[int, int]]:
+    """Collapse indexes into (first, last) runs of consecutive values."""
+    runs: List[Tuple[int, int]] = []
+    for index in sorted(indexes):
+        if runs and index == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], index)
+        else:
+            runs.append((index, index))
+    return runs
+
+@dataclass
+class RowRule:
+    """
+    A declarative cleanup: for every data row (as {header: value}) where
+    when(row) is true, transform(row) returns {header: new_value} to set.
+    """
+    name: str
+    when: Callable[[Dict[str, Any]], bool]
+    transform: Callable[[Dict[str, Any]], Dict[str, Any]]
+
+@dataclass
+class CellChange:
+    row_num: int    # 1-based sheet row
+    column: str     # Header name, or column letter for unnamed columns
+    old: Any
+    new: Any
+    rule: str = ''
+
+class WaveSheet:
+    """
+    A local snapshot of one sheet with queued writes.
+
+    The sheet is read once on first access. Edits update the snapshot right
+    away, so later steps in the same run see them without re-reading, and mark
+    rows (or single cells) dirty. flush() sends every dirty row and cell in a
+    single batchUpdate, merging adjacent rows and cells into one range.
+    """
+
+    def __init__(self, sheet_name: str = DEFAULT_SHEET, spreadsheet_id: str = SPREADSHEET_ID,
+                 service=None):
+        self.sheet_name = sheet_name
+        self.spreadsheet_id = spreadsheet_id
+        self._service = service
+        self._values: Optional[List[List[Any]]] = None
+        self._written: List[List[Any]] = []    # Rows as last read/written
+        self._dirty: Set[int] = set()          # Zero-based indexes of rows to rewrite whole
+        self._dirty_cells: Dict[int, Set[int]] = {}  # Row index -> changed column indexes
+        self.api_calls = 0
+
+    def __enter__(self) -> 'WaveSheet':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+
+    @property
+    def service(self):
+        if self._service is None:
+            self._service = get_sheets_service()
+        return self._service
+
+    def _api(self):
+        self.api_calls += 1
+        return self.service.spreadsheets().values()
+
+    # Reading
+
+    @property
+    def values(self) -> List[List[Any]]:
+        """All rows, header first; read from the API on first use."""
+        if self._values is None:
+            result = execute(self._api().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=a1_range(self.sheet_name)
+            ))
+            self._values = result.get('values', [])
+            self._mark_written()
+        return self._values
+
+    @property
+    def headers(self) -> List[str]:
+        return self.values[0] if self.values else []
+
+    @property
+    def rows(self) -> List[List[Any]]:
+        """Data rows, without the header."""
+        return self.values[1:]
+
+    def column(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """Zero-based index of a header, or default if the sheet has no such column."""
+        return self.headers.index(name) if name in self.headers else default
+
+    def _column_name(self, column: int) -> str:
+        headers = self.headers
+        return headers[column] if column < len(headers) and headers[column] else column_letter(column)
+
+    def record(self, row_num: int) -> Dict[str, Any]:
+        """One row as {header: value}; missing trailing cells are ''."""
+        row = self.values[row_num - 1] if row_num - 1 < len(self.values) else []
+        return {name: (row[i] if i < len(row) else '') for i, name in enumerate(self.headers) if name}
+
+    def find_row(self, column: int, value: Any) -> Optional[int]:
+        """Sheet row number (1-based, header is row 1) of the first match in a column."""
+        for index, row in enumerate(self.values):
+            if len(row) > column and row[column] == value:
+                return index + 1
+        return None
+
+    # Queued edits
+
+    def set_value(self, row_num: int, column, value: Any) -> None:
+        """Set one cell; column is a header name or zero-based index, row_num is 1-based."""
+        if isinstance(column, str):
+            name = column
+            column = self.column(name)
+            if column is None:
+                raise KeyError(f"No column '{name}' in {self.sheet_name}")
+        index = row_num - 1
+        while len(self.values) <= index:
+            self.values.append([])
+        row = self.values[index]
+        while len(row) <= column:
+            row.append('')
+        # The snapshot holds values as read back, so 8 and "8" are the same cell
+        if str(row[column]) != str(value):
+            row[column] = value
+            self._dirty_cells.setdefault(index, set()).add(column)
+
+    def append_rows(self, rows: List[List[Any]]) -> None:
+        """Add rows after the last row of the snapshot."""
+        for row in rows:
+            self.values.append(list(row))
+            self._dirty.add(len(self.values) - 1)
+
+    def replace_rows(self, rows: List[List[Any]]) -> None:
+        """Replace every data row (the header is kept), blanking any rows left over."""
+        old_rows = self.values[1:]
+        self.values[1:] = [list(row) for row in rows]
+        for offset, row in enumerate(self.values[1:]):
+            if offset >= len(old_rows) or old_rows[offset] != row:
+                self._dirty.add(offset + 1)
+        for offset in range(len(rows), len(old_rows)):
+            # Shrinking: the trailing rows must be blanked on flush
+            self.values.append([])
+            self._dirty.add(offset + 1)
+
+    def apply_rules(self, rules: List[RowRule]) -> List[CellChange]:
+        """
+        Run rules over every data row in order and queue the cells they change.
+        Later rules see earlier rules' edits. Returns the cells actually changed.
+        """
+        changes = []
+        for row_num in range(2, len(self.values) + 1):
+            for rule in rules:
+                record = self.record(row_num)
+                if not any(record.values()) or not rule.when(record):
+                    continue
+                for name, value in rule.transform(record).items():
+                    if str(record.get(name, '')) != str(value):
+                        self.set_value(row_num, name, value)
+                        changes.append(CellChange(row_num, name, record.get(name, ''), value, rule.name))
+        return changes
+
+    def diff(self) -> List[CellChange]:
+        """Every queued cell edit against the sheet as last read or written."""
+        rows = self._dirty | set(self._dirty_cells)
+        changes = []
+        for index in sorted(rows):
+            new_row = self.values[index] if index < len(self.values) else []
+            old_row = self._written[index] if index < len(self._written) else []
+            for column in range(max(len(new_row), len(old_row))):
+                old = old_row[column] if column < len(old_row) else ''
+                new = new_row[column] if column < len(new_row) else ''
+                if str(old) != str(new):
+                    changes.append(CellChange(index + 1, self._column_name(column), old, new))
+        return changes
+
+    def format_diff(self) -> str:
+        """diff() as one "row N column: old -> new" line per cell."""
+        return '\n'.join(f"  row {c.row_num} {c.column}: {c.old!r} -> {c.new!r}" for c in self.diff())
+
+    @property
+    def pending(self) -> int:
+        """Number of rows with queued edits."""
+        return len(self._dirty | set(self._dirty_cells))
+
+    def pending_updates(self) -> List[Dict]:
+        """
+        The batchUpdate data entries flush() would send: one per run of adjacent
+        rewritten rows, and one rectangular block per run of changed cells in
+        other rows, merged down consecutive rows that change the same columns.
+        """
+        data = [self._range_data(first, last) for first, last in _runs(self._dirty)]
+        blocks: List[Tuple[int, int, int, int]] = []     # (first row, last row, first column, last column)
+        open_blocks: Dict[Tuple[int, int], int] = {}     # Column run -> index in blocks, while it can grow
+        for index in sorted(self._dirty_cells):
+            if index in self._dirty:
+                continue
+            spans = _runs(self._dirty_cells[index])
+            for span in spans:
+                block = open_blocks.get(span)
+                if block is not None and blocks[block][1] == index - 1:
+                    blocks[block] = (blocks[block][0], index) + span
+                else:
+                    open_blocks[span] = len(blocks)
+                    blocks.append((index, index) + span)
+        for first_row, last_row, first, last in sorted(blocks):
+            data.append({
+                'range': a1_range(self.sheet_name, f'{column_letter(first)}{first_row + 1}:'
+                                                   f'{column_letter(last)}{last_row + 1}'),
+                'values': [self.values[index][first:last + 1] for index in range(first_row, last_row + 1)],
+            })
+        return data
+
+    def flush(self) -> Dict:
+        """Send all queued edits as one batchUpdate; returns the API response."""
+        data = self.pending_updates()
+        if not data:
+            return {}
+
+        # Explicit ranges make the batch safe to re-send if its response is lost
+        result = execute(self._api().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={'valueInputOption': 'RAW', 'data': data}
+        ))
+
+        # Trailing blanked rows no longer exist once written
+        while self._values and not self._values[-1]:
+            self._values.pop()
+        self._mark_written()
+        self._dirty.clear()
+        self._dirty_cells.clear()
+        return result
+
+    def _mark_written(self) -> None:
+        self._written = [list(row) for row in self._values]
+
+    def _range_data(self, first: int, last: int) -> Dict:
+        """One batchUpdate entry covering rows first..last, padded to clear old cells."""
+        def written_width(i: int) -> int:
+            return len(self._written[i]) if i < len(self._written) else 0
+
+        width = max(max(len(self.values[i]), written_width(i)) for i in range(first, last + 1))
+        width = max(width, 1)
+        block = []
+        for i in range(first, last + 1):
+            row = list(self.values[i])
+            block.append(row + [''] * (width - len(row)))
+        return {
+            'range': a1_range(self.sheet_name, f'A{first + 1}:{column_letter(width - 1)}{last + 1}'),
+            'values': block,
+        }